@@ -0,0 +1,176 @@
+"""
+Отладочные таблицы алгоритмов построения в столбцовом виде.
+
+Строки таблицы хранятся не списком кортежей, а структурированным массивом NumPy
+(по столбцу на поле). Таблицу можно срезать, суммировать по столбцам и перебирать
+построчно; кортежи в прежнем формате создаются только при обращении к строке.
+
+Форматы строк (пары координат хранятся двумя столбцами):
+  DDA_COLUMNS   – Итерация, x, y, Отобр. координаты                (4 поля)
+  LINE_COLUMNS  – Итерация, x, y, e, e′, Отобр. координаты         (6 полей)
+  CURVE_COLUMNS – Шаг, di, δ, δ*, Пиксель, x, y, di+1, Plot (x, y) (9 полей)
+"""
+import numpy as np
+
+DDA_COLUMNS = ("step", "x", "y", ("plot_x", "plot_y"))
+LINE_COLUMNS = ("step", "x", "y", "e", "e_prime", ("plot_x", "plot_y"))
+CURVE_COLUMNS = ("step", "di", "delta", "delta_star", ("pixel_x", "pixel_y"),
+                 "x", "y", "di_next", ("plot_x", "plot_y"))
+
+# Целочисленные поля; остальные хранятся как float64
+INTEGER_FIELDS = {"step", "plot_x", "plot_y", "pixel_x", "pixel_y"}
+
+
+def field_names(columns):
+    """Плоский список имён полей: пары координат раскрываются в два поля."""
+    names = []
+    for column in columns:
+        names.extend(column if isinstance(column, tuple) else (column,))
+    return names
+
+
+def make_dtype(columns):
+    return np.dtype([(name, np.int64 if name in INTEGER_FIELDS else np.float64)
+                     for name in field_names(columns)])
+
+
+class DebugTable:
+    """
+    Отладочная таблица алгоритма.
+
+    Строки добавляются методом add(...) (значения полей подряд, пары координат – двумя числами)
+    или append(row) (кортеж в прежнем формате). len(table), table[i] (кортеж строки),
+    table[a:b] (таблица-срез без копирования) и перебор строк работают как у списка кортежей;
+    table.array – структурированный массив, table["x"] – столбец.
+    """
+
+    def __init__(self, columns, data=None):
+        self.columns = columns
+        self.dtype = make_dtype(columns)
+        if data is None:
+            self._data = np.zeros(64, dtype=self.dtype)
+            self._size = 0
+        else:
+            self._data = data
+            self._size = len(data)
+
+    @classmethod
+    def from_arrays(cls, columns, **arrays):
+        """Создаёт таблицу из готовых столбцов (например, из векторизованного алгоритма)."""
+        dtype = make_dtype(columns)
+        size = len(next(iter(arrays.values()))) if arrays else 0
+        data = np.zeros(size, dtype=dtype)
+        for name, values in arrays.items():
+            data[name] = values
+        return cls(columns, data)
+
+    # --- Заполнение ---
+
+    def add(self, *values):
+        if self._size == len(self._data):
+            # Ёмкость удваивается, поэтому добавление строки в среднем занимает O(1)
+            grown = np.zeros(2 * len(self._data), dtype=self.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size] = values
+        self._size += 1
+
+    def append(self, row):
+        flat = []
+        for value in row:
+            flat.extend(value if isinstance(value, tuple) else (value,))
+        self.add(*flat)
+
+    # --- Чтение ---
+
+    @property
+    def array(self):
+        """Структурированный массив строк (без копирования)."""
+        return self._data[:self._size]
+
+    @property
+    def width(self):
+        """Число полей строки в прежнем формате (4, 6 или 9)."""
+        return len(self.columns)
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def _row(self, record):
+        values = record.tolist()
+        row = []
+        k = 0
+        for column in self.columns:
+            if isinstance(column, tuple):
+                row.append(tuple(values[k:k + len(column)]))
+                k += len(column)
+            else:
+                row.append(values[k])
+                k += 1
+        return tuple(row)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.array[key]
+        if isinstance(key, slice):
+            return DebugTable(self.columns, self.array[key])
+        if key < 0:
+            key += self._size
+        if not 0 <= key < self._size:
+            raise IndexError("Номер строки вне таблицы")
+        return self._row(self._data[key])
+
+    def rows(self, start=0, stop=None):
+        """Лениво перебирает строки [start, stop) в прежнем формате (кортежи)."""
+        for record in self.array[start:stop]:
+            yield self._row(record)
+
+    def __iter__(self):
+        return self.rows()
+
+    def find_pixel(self, x, y, start=0):
+        """
+        Номер первой (не раньше start) строки, в которой отображаемые координаты равны (x, y),
+        или None, если такой строки нет.
+        """
+        data = self.array[start:]
+        found = np.flatnonzero((data["plot_x"] == x) & (data["plot_y"] == y))
+        return int(found[0]) + start if len(found) else None
+
+    def find_step(self, step):
+        """Номер строки с заданным номером шага или None."""
+        found = np.flatnonzero(self.array["step"] == step)
+        return int(found[0]) if len(found) else None
+
+
+E_PRIME = "e'"
+
+# Заголовки таблиц в окне отладки: число полей строки -> (заголовок, длина разделителя)
+HEADERS = {
+    4: (f"{'Итерация':>9} | {'x':>10} | {'y':>10} | {'Отобр. координаты':>20}", 60),
+    6: (f"{'Итерация':>9} | {'x':>10} | {'y':>10} | {'e':>10} | {E_PRIME:>10} | {'Отобр. координаты':>20}", 90),
+    9: (f"{'Шаг':>5} | {'di':>8} | {'δ':>8} | {'δ*':>8} | {'Пиксель':>10} | {'x':>10} | {'y':>10} | "
+        f"{'di+1':>8} | {'Plot (x,y)':>15}", 110),
+}
+
+
+def format_header(width):
+    """Заголовок и разделитель таблицы с width полями в строке."""
+    header, separator = HEADERS[width]
+    return header + "\n" + "-" * separator + "\n"
+
+
+def format_row(row):
+    """Строка таблицы (кортеж из 4, 6 или 9 полей) в текстовом виде."""
+    if len(row) == 4:
+        i, x, y, disp = row
+        return f"{i:9d} | {x:10.2f} | {y:10.2f} | ({disp[0]:3d}, {disp[1]:3d})\n"
+    if len(row) == 6:
+        i, x, y, e, e_prime, disp = row
+        return f"{i:9d} | {x:10.2f} | {y:10.2f} | {e:10.2f} | {e_prime:10.2f} | ({disp[0]:3d}, {disp[1]:3d})\n"
+    step, di, delta, delta_star, pixel, x_val, y_val, di_next, plot = row
+    return (f"{step:5d} | {di:8.2f} | {delta:8.2f} | {delta_star:8.2f} | ({pixel[0]:3d}, {pixel[1]:3d}) | "
+            f"{x_val:10.2f} | {y_val:10.2f} | {di_next:8.2f} | ({plot[0]:3d}, {plot[1]:3d})\n")
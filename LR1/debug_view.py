@@ -0,0 +1,184 @@
+"""
+Виртуализированное окно отладочной таблицы.
+
+DebugTableView выводит в текстовое поле только строки, которые помещаются на экране:
+при прокрутке содержимое поля заменяется, поэтому время открытия окна и расход памяти
+не зависят от числа шагов алгоритма. Поддерживаются переход к шагу и поиск по пикселю.
+"""
+import re
+import tkinter as tk
+from tkinter import font as tkfont
+
+
+class DebugTableView(tk.Frame):
+    """
+    Таблица с прокруткой, создающая текст только для видимых строк.
+
+    Параметры:
+      rows        - источник строк: поддерживает len(rows) и срезы rows[a:b]
+                    (DebugTable, список кортежей или список строк).
+      header      - заголовок таблицы (не прокручивается).
+      format_row  - функция (номер, строка) -> текст строки без перевода строки.
+      find_step   - функция (номер шага) -> номер строки или None;
+                    по умолчанию rows.find_step, если он есть, иначе номер шага равен номеру строки.
+      find_pixel  - функция (x, y, начиная_с) -> номер строки или None;
+                    по умолчанию rows.find_pixel, если он есть, иначе поиск "(x, y)" в тексте строк.
+    """
+
+    def __init__(self, master, rows, header="", format_row=None, find_step=None, find_pixel=None,
+                 font=("Courier", 10)):
+        super().__init__(master)
+        self.rows = rows
+        self.format_row = format_row or (lambda index, row: str(row))
+        self.find_step = find_step or getattr(rows, "find_step", None) or self._find_index
+        self.find_pixel = find_pixel or getattr(rows, "find_pixel", None) or self._find_pixel_text
+        self.first = 0          # Номер первой видимой строки
+        self.visible = 20       # Число строк, помещающихся в поле
+        self.selected = None    # Выделенная строка (результат перехода или поиска)
+        self.font = tkfont.Font(self, font=font)
+
+        # Панель перехода и поиска
+        tools = tk.Frame(self)
+        tools.pack(side=tk.TOP, fill=tk.X)
+        tk.Label(tools, text="Шаг:").pack(side=tk.LEFT)
+        self.step_entry = tk.Entry(tools, width=8)
+        self.step_entry.pack(side=tk.LEFT)
+        self.step_entry.bind("<Return>", lambda event: self.go_to_step())
+        tk.Button(tools, text="Перейти", command=self.go_to_step).pack(side=tk.LEFT, padx=(2, 10))
+        tk.Label(tools, text="Пиксель (x, y):").pack(side=tk.LEFT)
+        self.pixel_entry = tk.Entry(tools, width=12)
+        self.pixel_entry.pack(side=tk.LEFT)
+        self.pixel_entry.bind("<Return>", lambda event: self.search_pixel())
+        tk.Button(tools, text="Найти далее", command=self.search_pixel).pack(side=tk.LEFT, padx=2)
+        self.status_var = tk.StringVar()
+        tk.Label(tools, textvariable=self.status_var).pack(side=tk.RIGHT, padx=5)
+
+        header_lines = header.rstrip("\n").count("\n") + 1 if header else 0
+        self.header = tk.Text(self, font=self.font, height=header_lines, wrap="none")
+        if header:
+            self.header.insert(tk.END, header.rstrip("\n"))
+            self.header.pack(side=tk.TOP, fill=tk.X)
+        self.header.config(state=tk.DISABLED)
+
+        body = tk.Frame(self)
+        body.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        self.scrollbar = tk.Scrollbar(body, orient=tk.VERTICAL, command=self.on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.text = tk.Text(body, font=self.font, wrap="none")
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.text.tag_configure("selected", background="lightblue")
+        xscroll = tk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.on_xview)
+        xscroll.pack(side=tk.BOTTOM, fill=tk.X)
+        self.text.config(xscrollcommand=xscroll.set)
+
+        self.text.bind("<Configure>", self.on_resize)
+        self.text.bind("<MouseWheel>", lambda event: self.scroll(-1 if event.delta > 0 else 1, "units"))
+        self.text.bind("<Button-4>", lambda event: self.scroll(-1, "units"))
+        self.text.bind("<Button-5>", lambda event: self.scroll(1, "units"))
+        for key, amount, what in (("<Up>", -1, "units"), ("<Down>", 1, "units"),
+                                  ("<Prior>", -1, "pages"), ("<Next>", 1, "pages")):
+            self.text.bind(key, lambda event, a=amount, w=what: self.scroll(a, w) or "break")
+        self.text.bind("<Home>", lambda event: self.show(0) or "break")
+        self.text.bind("<End>", lambda event: self.show(len(self.rows)) or "break")
+        self.render()
+
+    # --- Вывод видимых строк ---
+
+    def render(self):
+        total = len(self.rows)
+        self.first = max(0, min(self.first, total - self.visible))
+        last = min(self.first + self.visible, total)
+        lines = [self.format_row(index, row)
+                 for index, row in enumerate(self.rows[self.first:last], start=self.first)]
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, "\n".join(lines) if lines else "Нет данных для отображения")
+        if self.selected is not None and self.first <= self.selected < last:
+            line = self.selected - self.first + 1
+            self.text.tag_add("selected", f"{line}.0", f"{line}.end")
+        self.text.config(state=tk.DISABLED)
+        if total:
+            self.scrollbar.set(self.first / total, last / total)
+            self.status_var.set(f"Строки {self.first + 1}–{last} из {total}")
+        else:
+            self.scrollbar.set(0, 1)
+            self.status_var.set("")
+
+    def show(self, first):
+        self.first = first
+        self.render()
+
+    def refresh(self, rows=None):
+        """Перерисовывает таблицу (например, после пополнения источника строк)."""
+        if rows is not None:
+            self.rows = rows
+        self.render()
+
+    def scroll(self, amount, what):
+        step = self.visible if what == "pages" else 1
+        self.show(self.first + int(amount) * step)
+
+    # --- Обработчики событий ---
+
+    def on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.show(int(float(args[0]) * len(self.rows)))
+        elif action == "scroll":
+            self.scroll(args[0], args[1])
+
+    def on_xview(self, *args):
+        self.text.xview(*args)
+        self.header.xview(*args)
+
+    def on_resize(self, event):
+        visible = max(1, event.height // self.font.metrics("linespace"))
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    # --- Переход и поиск ---
+
+    def select(self, index):
+        """Выделяет строку index и прокручивает таблицу так, чтобы она была в середине поля."""
+        self.selected = index
+        self.show(index - self.visible // 2)
+
+    def go_to_step(self):
+        try:
+            step = int(self.step_entry.get())
+        except ValueError:
+            self.status_var.set("Введите номер шага")
+            return
+        index = self.find_step(step)
+        if index is None:
+            self.status_var.set(f"Шаг {step} не найден")
+            return
+        self.select(index)
+
+    def search_pixel(self):
+        numbers = re.findall(r"-?\d+", self.pixel_entry.get())
+        if len(numbers) != 2:
+            self.status_var.set("Введите пиксель в виде x, y")
+            return
+        x, y = int(numbers[0]), int(numbers[1])
+        start = 0 if self.selected is None else self.selected + 1
+        index = self.find_pixel(x, y, start)
+        if index is None and start > 0:
+            index = self.find_pixel(x, y, 0)  # Поиск с начала таблицы
+        if index is None:
+            self.status_var.set(f"Пиксель ({x}, {y}) не найден")
+            return
+        self.select(index)
+
+    def _find_index(self, step):
+        return step if 0 <= step < len(self.rows) else None
+
+    def _find_pixel_text(self, x, y, start=0):
+        """Поиск строки, в тексте которой встречается пара координат (x, y), в том числе (x.00, y.00)."""
+        pattern = re.compile(rf"\(\s*{x}(\.0+)?,\s*{y}(\.0+)?\s*\)")
+        chunk = 1000
+        for begin in range(start, len(self.rows), chunk):
+            for index, row in enumerate(self.rows[begin:begin + chunk], start=begin):
+                if pattern.search(self.format_row(index, row)):
+                    return index
+        return None
@@ -1,5 +1,9 @@
 import tkinter as tk
 import math
+import time
+import raster
+from debug_table import HEADERS, format_header, format_row
+from debug_view import DebugTableView
 from intervals import draw_line_dda, draw_line_bresenham, draw_line_wu
 
 class GraphicEditorApp:
@@ -30,6 +34,15 @@ class GraphicEditorApp:
         file_menu.add_command(label="Выход", command=self.root.quit)
         menubar.add_cascade(label="Файл", menu=file_menu)
 
+        # Меню "Вывод" – способ вывода пикселей на канву
+        self.raster_backend = tk.StringVar(value=raster.get_backend())
+        output_menu = tk.Menu(menubar, tearoff=0)
+        output_menu.add_radiobutton(label="Элементы канвы Tk", variable=self.raster_backend,
+                                    value=raster.BACKEND_TK, command=self.select_raster_backend)
+        output_menu.add_radiobutton(label="Буфер кадра NumPy", variable=self.raster_backend,
+                                    value=raster.BACKEND_FRAMEBUFFER, command=self.select_raster_backend)
+        menubar.add_cascade(label="Вывод", menu=output_menu)
+
         # Меню "Помощь"
         help_menu = tk.Menu(menubar, tearoff=0)
         help_menu.add_command(label="Документация", command=self.show_help)
@@ -120,6 +133,11 @@ class GraphicEditorApp:
         self.status_var.set("История: Пуста")
         self.status_bar = tk.Label(self.root, textvariable=self.status_var, bd=1, relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        # Строка статистики: число элементов канвы и время последней отрисовки
+        self.stats_var = tk.StringVar()
+        self.stats_bar = tk.Label(self.root, textvariable=self.stats_var,
+                                  bd=1, relief=tk.SUNKEN, anchor=tk.W)
+        self.stats_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
     def update_status(self, mode, is_error=False):
         self.current_mode = mode
@@ -130,6 +148,27 @@ class GraphicEditorApp:
             self.status_bar.config(fg="black")
             self.status_var.set(f"История: {self.current_mode}")
 
+    def select_raster_backend(self):
+        """Переключает способ вывода пикселей: отдельные элементы канвы или буфер кадра NumPy."""
+        raster.set_backend(self.raster_backend.get())
+        if raster.get_backend() == raster.BACKEND_FRAMEBUFFER:
+            self.update_status("Вывод: буфер кадра NumPy (одно изображение на кадр).")
+        else:
+            self.update_status("Вывод: элементы канвы Tk (элемент на каждый пиксель).")
+
+    def timed_draw(self, draw, *args, **kwargs):
+        """
+        Вызывает функцию построения и выводит число элементов канвы и время отрисовки
+        (вместе с выводом буфера кадра), чтобы сравнивать способы вывода.
+        """
+        start = time.perf_counter()
+        result = draw(*args, **kwargs)
+        raster.present(self.canvas)
+        self.canvas.update_idletasks()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats_var.set(f"Элементов на канве: {len(self.canvas.find_all())} | Отрисовка: {elapsed:.1f} мс")
+        return result
+
     def run(self):
         self.root.mainloop()
 
@@ -200,7 +239,7 @@ class GraphicEditorApp:
                 x0, y0 = self.start_point
                 x1, y1 = event.x, event.y
                 # Вызываем выбранный алгоритм с debug=True (однократно)
-                table = self.selected_algorithm(self.canvas, x0, y0, x1, y1, debug=True)
+                table = self.timed_draw(self.selected_algorithm, self.canvas, x0, y0, x1, y1, debug=True)
                 self.show_debug_table(table)
                 self.update_status(
                     f"Отладка ({self.selected_algorithm_title}): линия от ({x0}, {y0}) до ({x1}, {y1}) построена, таблица выведена.")
@@ -216,7 +255,7 @@ class GraphicEditorApp:
                 self.canvas.delete("preview_line")
                 x0, y0 = self.start_point
                 x1, y1 = event.x, event.y
-                self.selected_algorithm(self.canvas, x0, y0, x1, y1)
+                self.timed_draw(self.selected_algorithm, self.canvas, x0, y0, x1, y1)
                 self.update_status(f"Линия: построен отрезок: ({x0}, {y0}) -> ({x1}, {y1}).")
                 self.start_point = None
 
@@ -227,41 +266,22 @@ class GraphicEditorApp:
              Итерация, x, y, Отобр. координаты.
         Если запись содержит 6 элементов, выводятся:
              Итерация, x, y, e, e′, Отобр. координаты.
+        Таблица выводится виртуализированно (DebugTableView): создаётся текст только видимых строк;
+        можно перейти к шагу по номеру и найти строку по координатам пикселя.
         """
         window = tk.Toplevel(self.root)
         window.title(f"Отладочная таблица ({self.selected_algorithm_title})")
         window.geometry("800x400")
 
-        text = tk.Text(window, font=("Courier", 10))
-        text.pack(fill=tk.BOTH, expand=True)
-
-        if not table:
-            text.insert(tk.END, "Нет данных для отображения")
+        if not table or len(table[0]) not in HEADERS:
+            text = tk.Text(window, font=("Courier", 10))
+            text.pack(fill=tk.BOTH, expand=True)
+            text.insert(tk.END, "Нет данных для отображения" if not table else "Неподдерживаемый формат таблицы\n")
             return
 
-        cols = len(table[0])
-        if cols == 4:
-            header = f"{'Итерация':>9} | {'x':>10} | {'y':>10} | {'Отобр. координаты':>20}\n"
-            separator = "-" * 60 + "\n"
-            text.insert(tk.END, header)
-            text.insert(tk.END, separator)
-            for row in table:
-                i, x, y, disp = row
-                # disp предполагается как кортеж (rx, ry)
-                text.insert(tk.END, f"{i:9d} | {x:10.2f} | {y:10.2f} | ({disp[0]:3d}, {disp[1]:3d})\n")
-        elif cols == 6:
-            header = f"{'Итерация':>9} | {'x':>10} | {'y':>10} | {'e':>10} | {'e\'':>10} | {'Отобр. координаты':>20}\n"
-            separator = "-" * 90 + "\n"
-            text.insert(tk.END, header)
-            text.insert(tk.END, separator)
-            for row in table:
-                i, x, y, e, e_prime, disp = row
-                text.insert(tk.END,
-                            f"{i:9d} | {x:10.2f} | {y:10.2f} | {e:10.2f} | {e_prime:10.2f} | ({disp[0]:3d}, {disp[1]:3d})\n")
-        else:
-            text.insert(tk.END, "Неподдерживаемый формат таблицы\n")
-
-        text.config(state=tk.DISABLED)
+        view = DebugTableView(window, table, header=format_header(len(table[0])),
+                              format_row=lambda index, row: format_row(row).rstrip("\n"))
+        view.pack(fill=tk.BOTH, expand=True)
 
     def on_line_motion(self, event):
         """
@@ -278,6 +298,7 @@ class GraphicEditorApp:
 
     def clear_canvas(self):
         self.canvas.delete("all")
+        raster.clear(self.canvas)
         self.update_status("Экран очищен")
 
     def show_help(self):
@@ -0,0 +1,432 @@
+"""
+Канва без графического окружения (headless).
+
+HeadlessCanvas повторяет ту часть интерфейса tk.Canvas, которой пользуются алгоритмы
+лабораторных работ (create_rectangle, create_line, create_polygon, create_oval, canvas["width"],
+winfo_width и т.д.), но вместо вывода на экран хранит элементы в памяти и растеризует их
+в массив NumPy. Результат можно сохранить в формате PNG или PPM, поэтому построения можно
+выполнять на серверах без дисплея – например, для регрессионного тестирования и замеров скорости.
+
+Пример:
+    canvas = HeadlessCanvas(800, 600)
+    draw_line_bresenham(canvas, 10, 10, 200, 120)
+    canvas.save("line.png")
+"""
+import struct
+import zlib
+
+import numpy as np
+
+# Цвета Tk, которые встречаются в лабораторных работах
+COLORS = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "gray": (190, 190, 190),
+    "grey": (190, 190, 190),
+    "lightgray": (211, 211, 211),
+    "lightgrey": (211, 211, 211),
+    "darkgray": (169, 169, 169),
+    "red": (255, 0, 0),
+    "green": (0, 255, 0),
+    "blue": (0, 0, 255),
+    "yellow": (255, 255, 0),
+    "orange": (255, 165, 0),
+    "purple": (160, 32, 240),
+    "cyan": (0, 255, 255),
+    "magenta": (255, 0, 255),
+}
+
+# Параметры элементов по умолчанию (как в Tk)
+DEFAULTS = {
+    "rectangle": {"fill": "", "outline": "black", "width": 1},
+    "oval": {"fill": "", "outline": "black", "width": 1},
+    "polygon": {"fill": "black", "outline": "", "width": 1},
+    "line": {"fill": "black", "width": 1},
+    "text": {"fill": "black", "text": ""},
+    "image": {"image": None, "anchor": "center"},
+}
+
+
+def parse_color(color):
+    """Переводит цвет Tk ("black", "#rgb", "#rrggbb") в кортеж (r, g, b); пустая строка – None."""
+    if color is None or color == "":
+        return None
+    if isinstance(color, tuple):
+        return color
+    color = color.strip().lower()
+    if color.startswith("#"):
+        digits = color[1:]
+        n = len(digits) // 3
+        if n == 0 or len(digits) != 3 * n:
+            raise ValueError(f"Некорректный цвет: {color}")
+        # Каждая компонента – n шестнадцатеричных цифр, приводим её к диапазону 0..255
+        return tuple(int(digits[i * n:(i + 1) * n], 16) * 255 // (16 ** n - 1) for i in range(3))
+    if color not in COLORS:
+        raise ValueError(f"Неизвестный цвет: {color}")
+    return COLORS[color]
+
+
+def _flatten_coords(args):
+    """Координаты элемента: (x0, y0, x1, y1, ...) или список пар/чисел – в плоский список."""
+    coords = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            coords.extend(_flatten_coords(arg))
+        else:
+            coords.append(float(arg))
+    return coords
+
+
+def _line_pixels(x0, y0, x1, y1):
+    """
+    Пиксели отрезка от (x0, y0) до (x1, y1) без конечной точки (так отрезки рисует Tk).
+    Возвращает массивы xs, ys.
+    """
+    x0, y0, x1, y1 = (int(np.floor(v)) for v in (x0, y0, x1, y1))
+    n = max(abs(x1 - x0), abs(y1 - y0))
+    if n == 0:
+        return np.array([x0]), np.array([y0])
+    t = np.arange(n)
+    xs = x0 + np.floor(t * (x1 - x0) / n + 0.5).astype(np.intp)
+    ys = y0 + np.floor(t * (y1 - y0) / n + 0.5).astype(np.intp)
+    return xs, ys
+
+
+def _inside_polygon(px, py, coords):
+    """Маска точек (px, py), лежащих внутри многоугольника (правило чётности пересечений)."""
+    xs = coords[0::2]
+    ys = coords[1::2]
+    inside = np.zeros(np.broadcast(px, py).shape, dtype=bool)
+    j = len(xs) - 1
+    for i in range(len(xs)):
+        xi, yi, xj, yj = xs[i], ys[i], xs[j], ys[j]
+        if yi != yj:
+            crosses = (yi > py) != (yj > py)
+            x_cross = xi + (py - yi) * (xj - xi) / (yj - yi)
+            inside ^= crosses & (px < x_cross)
+        j = i
+    return inside
+
+
+def encode_png(image):
+    """
+    Кодирует массив (h, w, 3) или (h, w, 4) типа uint8 в формат PNG (RGB или RGBA).
+    """
+    height, width, channels = image.shape
+    color_type = 6 if channels == 4 else 2
+    # Каждая строка PNG начинается с байта фильтра (0 – без фильтра)
+    raw = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    raw[:, 1:] = image.reshape(height, width * channels)
+
+    def chunk(tag, data):
+        crc = zlib.crc32(tag + data) & 0xFFFFFFFF
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", crc)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) +
+            chunk(b"IDAT", zlib.compress(raw.tobytes(), 1)) + chunk(b"IEND", b""))
+
+
+def encode_ppm(image):
+    """Кодирует массив (h, w, 3) типа uint8 в двоичный формат PPM (P6)."""
+    height, width, _ = image.shape
+    return f"P6\n{width} {height}\n255\n".encode("ascii") + np.ascontiguousarray(image).tobytes()
+
+
+class HeadlessCanvas:
+    """
+    Канва в памяти с интерфейсом tk.Canvas.
+
+    Элементы хранятся в порядке создания и растеризуются методом render():
+      - rectangle (x0, y0, x1, y1) занимает пиксели [x0, x1) x [y0, y1);
+      - line рисуется без конечной точки каждого звена, параметр width – толщина в пикселях;
+      - polygon и oval заливаются по центрам пикселей, контур имеет толщину width;
+      - image – массив RGBA (h, w, 4), например изображение буфера кадра из raster.py;
+      - text хранится, но не растеризуется. Параметр dash игнорируется.
+    """
+
+    headless = True
+
+    def __init__(self, width=800, height=600, bg="white"):
+        self.options = {"width": int(width), "height": int(height), "bg": bg}
+        self.items = {}          # id -> [тип, координаты, параметры, теги]
+        self.next_id = 1
+        self.idle_callbacks = []
+
+    # --- Параметры канвы ---
+
+    def __getitem__(self, key):
+        return self.cget(key)
+
+    def __setitem__(self, key, value):
+        self.configure(**{key: value})
+
+    def cget(self, key):
+        if key == "background":
+            key = "bg"
+        return self.options[key]
+
+    def configure(self, **kwargs):
+        for key, value in kwargs.items():
+            if key == "background":
+                key = "bg"
+            self.options[key] = int(value) if key in ("width", "height") else value
+
+    config = configure
+
+    def winfo_width(self):
+        return self.options["width"]
+
+    def winfo_height(self):
+        return self.options["height"]
+
+    winfo_reqwidth = winfo_width
+    winfo_reqheight = winfo_height
+
+    # --- Создание элементов ---
+
+    def _create(self, kind, args, kwargs):
+        options = dict(DEFAULTS[kind])
+        tags = kwargs.pop("tags", ())
+        if isinstance(tags, str):
+            tags = tuple(tags.split())
+        options.update(kwargs)
+        item_id = self.next_id
+        self.next_id += 1
+        self.items[item_id] = [kind, _flatten_coords(args), options, tuple(tags)]
+        return item_id
+
+    def create_rectangle(self, *args, **kwargs):
+        return self._create("rectangle", args, kwargs)
+
+    def create_line(self, *args, **kwargs):
+        return self._create("line", args, kwargs)
+
+    def create_polygon(self, *args, **kwargs):
+        return self._create("polygon", args, kwargs)
+
+    def create_oval(self, *args, **kwargs):
+        return self._create("oval", args, kwargs)
+
+    def create_text(self, *args, **kwargs):
+        return self._create("text", args, kwargs)
+
+    def create_image(self, *args, **kwargs):
+        return self._create("image", args, kwargs)
+
+    # --- Работа с элементами ---
+
+    def _find(self, tag_or_id):
+        if tag_or_id == "all":
+            return list(self.items)
+        if isinstance(tag_or_id, int) or str(tag_or_id).isdigit():
+            return [int(tag_or_id)] if int(tag_or_id) in self.items else []
+        return [i for i, item in self.items.items() if tag_or_id in item[3]]
+
+    def find_all(self):
+        return tuple(self.items)
+
+    def find_withtag(self, tag_or_id):
+        return tuple(self._find(tag_or_id))
+
+    def type(self, tag_or_id):
+        found = self._find(tag_or_id)
+        return self.items[found[0]][0] if found else None
+
+    def gettags(self, tag_or_id):
+        found = self._find(tag_or_id)
+        return self.items[found[0]][3] if found else ()
+
+    def coords(self, tag_or_id, *args):
+        found = self._find(tag_or_id)
+        if not found:
+            return []
+        if args:
+            for i in found:
+                self.items[i][1] = _flatten_coords(args)
+        return list(self.items[found[0]][1])
+
+    def itemconfigure(self, tag_or_id, **kwargs):
+        for i in self._find(tag_or_id):
+            self.items[i][2].update(kwargs)
+
+    itemconfig = itemconfigure
+
+    def itemcget(self, tag_or_id, option):
+        found = self._find(tag_or_id)
+        return self.items[found[0]][2].get(option) if found else None
+
+    def move(self, tag_or_id, dx, dy):
+        for i in self._find(tag_or_id):
+            coords = self.items[i][1]
+            self.items[i][1] = [v + (dx if k % 2 == 0 else dy) for k, v in enumerate(coords)]
+
+    def delete(self, *tags_or_ids):
+        for tag_or_id in tags_or_ids:
+            for i in self._find(tag_or_id):
+                del self.items[i]
+
+    # --- Цикл событий (без окна события не возникают) ---
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def unbind(self, *args, **kwargs):
+        pass
+
+    tag_bind = bind
+
+    def after_idle(self, func, *args):
+        self.idle_callbacks.append((func, args))
+
+    def after(self, ms, func=None, *args):
+        if func is not None:
+            self.after_idle(func, *args)
+
+    def update_idletasks(self):
+        """Выполняет отложенные вызовы (например, вывод буфера кадра raster.py)."""
+        while self.idle_callbacks:
+            func, args = self.idle_callbacks.pop(0)
+            func(*args)
+
+    update = update_idletasks
+
+    # --- Растеризация ---
+
+    def render(self):
+        """Растеризует все элементы и возвращает изображение (h, w, 3) типа uint8."""
+        self.update_idletasks()
+        width, height = self.options["width"], self.options["height"]
+        image = np.empty((height, width, 3), dtype=np.uint8)
+        image[:] = parse_color(self.options["bg"])
+        for kind, coords, options, _ in self.items.values():
+            render_item = getattr(self, f"_render_{kind}", None)
+            if render_item is not None:
+                render_item(image, coords, options)
+        return image
+
+    @staticmethod
+    def _put(image, xs, ys, color, width=1):
+        """Закрашивает пиксели (xs, ys) квадратной кистью толщиной width."""
+        if color is None or len(xs) == 0:
+            return
+        height, image_width, _ = image.shape
+        width = max(int(round(float(width))), 1)
+        if width > 1:
+            ox, oy = np.meshgrid(np.arange(width) - width // 2, np.arange(width) - width // 2)
+            xs = (xs[:, None] + ox.ravel()).ravel()
+            ys = (ys[:, None] + oy.ravel()).ravel()
+        inside = (xs >= 0) & (xs < image_width) & (ys >= 0) & (ys < height)
+        image[ys[inside], xs[inside]] = color
+
+    @staticmethod
+    def _fill_mask(image, x0, y0, x1, y1, mask_func, color):
+        """Закрашивает пиксели прямоугольника [x0, x1) x [y0, y1), центры которых удовлетворяют mask_func."""
+        height, width, _ = image.shape
+        x0, y0 = max(int(np.floor(x0)), 0), max(int(np.floor(y0)), 0)
+        x1, y1 = min(int(np.ceil(x1)), width), min(int(np.ceil(y1)), height)
+        if color is None or x0 >= x1 or y0 >= y1:
+            return
+        py, px = np.mgrid[y0:y1, x0:x1] + 0.5
+        image[y0:y1, x0:x1][mask_func(px, py)] = color
+
+    def _render_rectangle(self, image, coords, options):
+        x0, y0, x1, y1 = coords[:4]
+        x0, x1 = sorted((int(np.floor(x0)), int(np.floor(x1))))
+        y0, y1 = sorted((int(np.floor(y0)), int(np.floor(y1))))
+        x1, y1 = max(x1, x0 + 1), max(y1, y0 + 1)
+        height, width, _ = image.shape
+        fill = parse_color(options.get("fill"))
+        outline = parse_color(options.get("outline"))
+        cx0, cy0, cx1, cy1 = max(x0, 0), max(y0, 0), min(x1, width), min(y1, height)
+        if cx0 >= cx1 or cy0 >= cy1:
+            return
+        if fill is not None:
+            image[cy0:cy1, cx0:cx1] = fill
+        if outline is not None:
+            w = max(int(round(float(options.get("width", 1)))), 1)
+            if x1 - x0 <= 2 * w or y1 - y0 <= 2 * w:
+                image[cy0:cy1, cx0:cx1] = outline
+                return
+            image[cy0:min(y0 + w, height), cx0:cx1] = outline
+            image[max(y1 - w, 0):cy1, cx0:cx1] = outline
+            image[cy0:cy1, cx0:min(x0 + w, width)] = outline
+            image[cy0:cy1, max(x1 - w, 0):cx1] = outline
+
+    def _render_line(self, image, coords, options):
+        color = parse_color(options.get("fill"))
+        if color is None or len(coords) < 4:
+            return
+        xs, ys = [], []
+        for k in range(0, len(coords) - 2, 2):
+            seg_x, seg_y = _line_pixels(*coords[k:k + 4])
+            xs.append(seg_x)
+            ys.append(seg_y)
+        self._put(image, np.concatenate(xs), np.concatenate(ys), color, options.get("width", 1))
+
+    def _render_polygon(self, image, coords, options):
+        if len(coords) < 6:
+            return
+        xs, ys = coords[0::2], coords[1::2]
+        self._fill_mask(image, min(xs), min(ys), max(xs) + 1, max(ys) + 1,
+                        lambda px, py: _inside_polygon(px, py, coords), parse_color(options.get("fill")))
+        outline = parse_color(options.get("outline"))
+        if outline is not None:
+            closed = list(coords) + list(coords[:2])
+            self._render_line(image, closed, {"fill": outline, "width": options.get("width", 1)})
+
+    def _render_oval(self, image, coords, options):
+        x0, y0, x1, y1 = coords[:4]
+        x0, x1 = sorted((x0, x1))
+        y0, y1 = sorted((y0, y1))
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        rx, ry = max((x1 - x0) / 2, 0.5), max((y1 - y0) / 2, 0.5)
+
+        def inside(px, py, shrink=0.0):
+            a, b = rx - shrink, ry - shrink
+            if a <= 0 or b <= 0:
+                return np.zeros(px.shape, dtype=bool)
+            return ((px - cx) / a) ** 2 + ((py - cy) / b) ** 2 <= 1
+
+        self._fill_mask(image, x0, y0, x1 + 1, y1 + 1, inside, parse_color(options.get("fill")))
+        w = max(float(options.get("width", 1)), 1)
+        self._fill_mask(image, x0, y0, x1 + 1, y1 + 1,
+                        lambda px, py: inside(px, py) & ~inside(px, py, w),
+                        parse_color(options.get("outline")))
+
+    def _render_image(self, image, coords, options):
+        rgba = options.get("image")
+        if not isinstance(rgba, np.ndarray):
+            return
+        h, w = rgba.shape[:2]
+        x, y = int(coords[0]), int(coords[1])
+        if options.get("anchor") == "center":
+            x, y = x - w // 2, y - h // 2
+        height, width, _ = image.shape
+        sx0, sy0 = max(-x, 0), max(-y, 0)
+        sx1, sy1 = min(w, width - x), min(h, height - y)
+        if sx0 >= sx1 or sy0 >= sy1:
+            return
+        src = rgba[sy0:sy1, sx0:sx1].astype(np.float32)
+        dst = image[y + sy0:y + sy1, x + sx0:x + sx1]
+        if src.shape[2] == 4:
+            alpha = src[..., 3:4] / 255.0
+            src = src[..., :3] * alpha + dst * (1 - alpha)
+        dst[:] = np.rint(src[..., :3]).astype(np.uint8)
+
+    # --- Сохранение ---
+
+    def save_png(self, path):
+        with open(path, "wb") as f:
+            f.write(encode_png(self.render()))
+
+    def save_ppm(self, path):
+        with open(path, "wb") as f:
+            f.write(encode_ppm(self.render()))
+
+    def save(self, path):
+        """Сохраняет изображение; формат выбирается по расширению файла (.png или .ppm)."""
+        if str(path).lower().endswith(".ppm"):
+            self.save_ppm(path)
+        else:
+            self.save_png(path)
@@ -2,272 +2,1020 @@ import math
 from intervals import draw_pixel
 
 import math
-from intervals import draw_pixel
+import numpy as np
+import raster
+from intervals import draw_pixel, draw_span, polyline_pixels, SpanWriter
+from debug_table import DebugTable, CURVE_COLUMNS, LINE_COLUMNS
+
+
+def _visible_param_range(center_a, sign_a, bounds_a, center_c, sign_c, bounds_c, inverse, p_max):
+    """
+    Диапазон [first, last] целочисленного параметра p ∈ [0, p_max] дуги, точки которой имеют вид
+    (center_a + sign_a * p) вдоль одной оси и (center_c + sign_c * c(p)) вдоль другой,
+    где c(p) ≥ 0 убывает, а inverse(c) – обратная к ней функция.
+    bounds_a, bounds_c – границы области вывода по соответствующим осям.
+    Возвращает None, если ни одна точка дуги не видна.
+    """
+    lo_a, hi_a = sorted(((bounds_a[0] - center_a) * sign_a, (bounds_a[1] - center_a) * sign_a))
+    lo_c, hi_c = sorted(((bounds_c[0] - center_c) * sign_c, (bounds_c[1] - center_c) * sign_c))
+    if hi_a < 0 or hi_c < 0:
+        return None
+    first = max(0, math.floor(lo_a), math.floor(inverse(hi_c)))
+    last = min(p_max, math.ceil(hi_a), math.ceil(inverse(max(lo_c, 0))))
+    if first > last:
+        return None
+    return first, last
+
+
+def _merge_ranges(ranges):
+    """Объединяет пересекающиеся и соседние диапазоны [first, last] в упорядоченный список."""
+    merged = []
+    for first, last in sorted(r for r in ranges if r is not None):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return merged
+
+
+def _viewport_bounds(canvas):
+    """Границы области вывода канвы по x и по y, расширенные на пиксель."""
+    xmin, ymin, xmax, ymax = raster.get_viewport(canvas)
+    return (xmin - 1, xmax + 1), (ymin - 1, ymax + 1)
+
+
+# Отражения точки (u, v) четверти (октанта) кривой: (знак x, знак y, перестановка u и v)
+QUADRANT_MIRRORS = ((1, 1, False), (-1, 1, False), (1, -1, False), (-1, -1, False))
+
+# Счётчики выходной стадии (_emit_pixels): выведено пикселей и отброшено повторов
+_pixel_stats = {"pixels": 0, "duplicates": 0}
+
+
+def reset_pixel_stats():
+    """Обнуляет счётчики выведенных пикселей и отброшенных повторов."""
+    _pixel_stats["pixels"] = 0
+    _pixel_stats["duplicates"] = 0
+
+
+def get_pixel_stats():
+    """
+    Счётчики с момента reset_pixel_stats(): pixels – число пикселей, выведенных функциями модуля,
+    duplicates – число повторных записей в уже выведенные пиксели (симметричные точки на осях
+    и границах октантов, повторы в вершинах), которые выходная стадия отбросила.
+    """
+    return dict(_pixel_stats)
+
+
+def _emit_pixels(canvas, xs, ys, viewport, alpha=None):
+    """
+    Общая выходная стадия функций модуля: отбрасывает невидимые точки и повторы
+    (по упакованным ключам (y - ymin) * ширина + (x - xmin) области вывода, с сохранением
+    порядка первых появлений) и выводит остальные одной записью: в буфер кадра – одним
+    put_pixels, элементами канвы – рядами пикселей (SpanWriter).
+    Если задано покрытие alpha (по значению на точку), повторам достаётся наибольшее покрытие,
+    а вывод идёт через raster.composite (элементами канвы – по пикселю).
+    Число отброшенных повторов учитывается в счётчиках (get_pixel_stats).
+    """
+    xs = np.asarray(xs, dtype=np.int64)
+    ys = np.asarray(ys, dtype=np.int64)
+    xmin, ymin, xmax, ymax = viewport
+    visible = (xs >= xmin) & (xs <= xmax) & (ys >= ymin) & (ys <= ymax)
+    if alpha is not None:
+        alpha = np.broadcast_to(np.asarray(alpha, dtype=float), xs.shape)
+        visible &= alpha > 0
+        alpha = alpha[visible]
+    xs, ys = xs[visible], ys[visible]
+    keys = (ys - ymin) * (xmax - xmin + 1) + (xs - xmin)
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    _pixel_stats["pixels"] += len(first)
+    _pixel_stats["duplicates"] += len(keys) - len(first)
+    if alpha is not None:
+        best = np.zeros(len(first))
+        np.maximum.at(best, inverse.ravel(), alpha)
+        order = np.argsort(first)
+        xs, ys, alpha = xs[first[order]], ys[first[order]], best[order]
+        if raster.get_backend() == raster.BACKEND_FRAMEBUFFER:
+            raster.composite(canvas, xs, ys, alpha, "max")
+            return
+        for x, y, e in zip(xs.tolist(), ys.tolist(), alpha.tolist()):
+            draw_pixel(canvas, x, y, intensity=e)
+        return
+    first.sort()
+    xs, ys = xs[first], ys[first]
+    if raster.get_backend() == raster.BACKEND_FRAMEBUFFER:
+        raster.put_pixels(canvas, xs, ys)
+        return
+    writer = SpanWriter(canvas)
+    for x, y in zip(xs.tolist(), ys.tolist()):
+        writer.add(x, y)
+    writer.flush()
+
+
+def _plot_mirrored(canvas, cx, cy, us, vs, mirrors, viewport, alpha=None):
+    """
+    Выводит точки (us, vs) четверти кривой вместе с отражениями mirrors одной записью
+    (см. _emit_pixels), по цепочке на каждое отражение. Совпавшие отражения
+    (точки на осях симметрии и границах октантов) выводятся один раз.
+    alpha – покрытие точек четверти (для сглаженных кривых).
+    """
+    us = np.asarray(us, dtype=np.int64)
+    vs = np.asarray(vs, dtype=np.int64)
+    xs = np.concatenate([cx + sx * (vs if swap else us) for sx, sy, swap in mirrors])
+    ys = np.concatenate([cy + sy * (us if swap else vs) for sx, sy, swap in mirrors])
+    if alpha is not None:
+        alpha = np.tile(np.asarray(alpha, dtype=float), len(mirrors))
+    _emit_pixels(canvas, xs, ys, viewport, alpha)
+
+
+def _fill_rows(canvas, cx, cy, us, vs, viewport):
+    """
+    Заливает фигуру, симметричную относительно осей, горизонтальными рядами:
+    строки cy ± v закрашиваются от cx - u до cx + u, где u – наибольшее смещение
+    точки четверти (us, vs) в этой строке. Выводятся только видимые части строк.
+    """
+    us = np.asarray(us, dtype=np.int64)
+    vs = np.asarray(vs, dtype=np.int64)
+    if len(us) == 0:
+        return
+    widths = np.full(int(vs.max()) + 1, -1, dtype=np.int64)
+    np.maximum.at(widths, vs, us)
+    xmin, ymin, xmax, ymax = viewport
+    for v in np.flatnonzero(widths >= 0).tolist():
+        u = int(widths[v])
+        x0, x1 = max(cx - u, xmin), min(cx + u, xmax)
+        if x0 > x1:
+            continue
+        for y in ((cy + v, cy - v) if v else (cy,)):
+            if ymin <= y <= ymax:
+                draw_span(canvas, x0, y, x1, y)
+                _pixel_stats["pixels"] += x1 - x0 + 1
+
+
+def _circle_visible_ranges(canvas, cx, cy, R):
+    """
+    Диапазоны шага x октанта окружности, на которых видна хотя бы одна из восьми симметричных точек.
+    """
+    bounds_x, bounds_y = _viewport_bounds(canvas)
+
+    def inverse(c):
+        return math.sqrt(max(R * R - c * c, 0))
+
+    ranges = []
+    for sa in (1, -1):
+        for sc in (1, -1):
+            # Точки (cx ± x, cy ± y): шаг x идёт вдоль оси X
+            ranges.append(_visible_param_range(cx, sa, bounds_x, cy, sc, bounds_y, inverse, R))
+            # Точки (cx ± y, cy ± x): шаг x идёт вдоль оси Y
+            ranges.append(_visible_param_range(cy, sa, bounds_y, cx, sc, bounds_x, inverse, R))
+    return _merge_ranges(ranges)
+
+
+def _circle_octant(R, first, last):
+    """
+    Шаги first..last октанта окружности (x ≤ y) сразу для всех x: массивы x и y,
+    которые выбирает алгоритм Брезенхэма. На шаге x это наибольшее y,
+    для которого y² + (y - 1)² < 2 * (R² - x²), т. е. y = (isqrt(4(R² - x²) - 2) + 1) // 2.
+    """
+    x = np.arange(first, last + 1, dtype=np.int64)
+    q = 4 * (R * R - x * x) - 2
+    s = np.floor(np.sqrt(np.maximum(q, 0))).astype(np.int64)
+    # Поправка округления квадратного корня: s = isqrt(q)
+    s -= s * s > q
+    s += (s + 1) * (s + 1) <= q
+    y = np.where(x == 0, R, np.where(q < 0, -1, (s + 1) // 2))
+    keep = x <= y
+    return x[keep], y[keep]
+
+
+# Восемь отражений точки октанта окружности
+OCTANT_MIRRORS = QUADRANT_MIRRORS + ((1, 1, True), (-1, 1, True), (1, -1, True), (-1, -1, True))
 
 
-def draw_circle(canvas, cx, cy, R, debug=False):
+def draw_circle(canvas, cx, cy, R, debug=False, filled=False, antialiased=False):
     """
     Строит окружность по алгоритму Брезенхэма.
     В отладочном режиме возвращает таблицу итераций с полями:
       Шаг | di | δ | δ* | Пиксель | x | y | di+1 | Отобр. координаты
     Для "δ" берем разность между ошибкой следующего шага и текущей,
     для "δ*" оставляем 0 (если нет иной информации).
-    """
-    x = 0
-    y = R
-    d = 3 - 2 * R
-    table = [] if debug else None
-    iteration = 0
-    prev_d = d  # для расчета δ, на первом шаге не рассчитываем, можем принять δ = 0
-    # Пока x <= y (отрезаем восьмую часть) – стандартное условие алгоритма Брезенхэма
-    while x <= y:
-        # Записываем точки (отражения)
-        pts = [
-            (cx + x, cy + y), (cx - x, cy + y),
-            (cx + x, cy - y), (cx - x, cy - y),
-            (cx + y, cy + x), (cx - y, cy + x),
-            (cx + y, cy - x), (cx - y, cy - x)
-        ]
-        for pt in pts:
-            draw_pixel(canvas, pt[0], pt[1])
-
-        # Предполагаем, что в качестве пикселя возьмем первую точку отражения
-        pixel = (cx + x, cy + y)
-        # Пока не рассчитываем di+1, задаем его равным текущей ошибке d, а δ и δ* как разность 0
-        delta = 0.0
-        di_next = d  # если не вычисляем следующее значение отдельно
-        delta_star = 0.0
-
-        if debug:
-            # Записываем текущую строку отладочной информации.
-            # Шаг (iteration), d_i, δ, δ*, пиксель, x, y, di+1, Plot(x,y)
-            table.append((iteration, d, delta, delta_star, pixel, x, y, di_next, pixel))
 
-        # Выполняем обновление ошибки по алгоритму Брезенхэма:
-        if d < 0:
-            d = d + 4 * x + 6
-        else:
-            d = d + 4 * (x - y) + 10
-            y -= 1
-
-        # Можно вычислить δ как разность нового d и предыдущего (если iteration > 0)
-        if iteration > 0:
-            delta = d - prev_d
-        prev_d = d
+    Шаги октанта, на которых ни одна из восьми симметричных точек не попадает на канву,
+    пропускаются. Значения y на всех шагах вычисляются сразу (см. _circle_octant),
+    а точки выводятся вместе с семью отражениями одной записью (см. _plot_mirrored).
 
-        x += 1
-        iteration += 1
+    Режимы:
+      filled=True      – круг: каждая строка выводится одним горизонтальным рядом
+                         между симметричными точками октантов;
+      antialiased=True – сглаженная окружность (см. draw_circle_wu).
+    """
+    if antialiased:
+        return draw_circle_wu(canvas, cx, cy, R, debug)
+    viewport = raster.get_viewport(canvas)
+    ranges = [(0, R)] if filled else _circle_visible_ranges(canvas, cx, cy, R)
+    octant = [_circle_octant(R, first, last) for first, last in ranges]
+    xs = np.concatenate([x for x, _ in octant]) if octant else np.zeros(0, dtype=np.int64)
+    ys = np.concatenate([y for _, y in octant]) if octant else np.zeros(0, dtype=np.int64)
+    if filled:
+        # Строки cy ± y дают точки первого октанта, строки cy ± x – отражённого относительно диагонали
+        _fill_rows(canvas, cx, cy, np.concatenate([xs, ys]), np.concatenate([ys, xs]), viewport)
+    else:
+        _plot_mirrored(canvas, cx, cy, xs, ys, OCTANT_MIRRORS, viewport)
+    if not debug:
+        return None
+    # Ошибка на шаге x: d = 2(x + 1)² + y² + (y - 1)² - 2R² (при x = 0 это 3 - 2R)
+    d = 2 * (xs + 1) ** 2 + ys * ys + (ys - 1) ** 2 - 2 * R * R
+    return DebugTable.from_arrays(
+        CURVE_COLUMNS, step=xs, di=d, delta=0.0, delta_star=0.0, pixel_x=cx + xs, pixel_y=cy + ys,
+        x=xs, y=ys, di_next=d, plot_x=cx + xs, plot_y=cy + ys)
+
+
+def draw_circle_wu(canvas, cx, cy, R, debug=False):
+    """
+    Сглаженная окружность по алгоритму Ву: на шаге x октанта (x ≤ R/√2) точное значение
+    y = sqrt(R² - x²) делит покрытие между пикселями floor(y) и floor(y) + 1
+    (интенсивности 1 - {y} и {y}). Все шаги вычисляются сразу, пиксели выводятся вместе
+    с отражениями одной записью: в буфер кадра – накоплением покрытия (raster.composite),
+    элементами канвы – по пикселю с наибольшей интенсивностью.
+    Если debug=True, возвращается таблица в формате алгоритма Ву для отрезков:
+      Итерация, x, y, e (интенсивность нижнего пикселя), e′ (интенсивность верхнего), Отобр. координаты.
+    """
+    viewport = raster.get_viewport(canvas)
+    x = np.arange(0, math.isqrt(R * R // 2) + 1, dtype=np.int64)
+    y = np.sqrt(R * R - x * x)
+    y_floor = np.floor(y).astype(np.int64)
+    coverage = y - y_floor
+    us = np.concatenate([x, x])
+    vs = np.concatenate([y_floor, y_floor + 1])
+    alpha = np.concatenate([1 - coverage, coverage])
+    _plot_mirrored(canvas, cx, cy, us, vs, OCTANT_MIRRORS, viewport, alpha)
+    if not debug:
+        return None
+    return DebugTable.from_arrays(
+        LINE_COLUMNS, step=x, x=x, y=y, e=1 - coverage, e_prime=coverage, plot_x=cx + x, plot_y=cy + y_floor)
+
+
+def _ellipse_inner_y(rx2, ry2, ry, x):
+    """Наибольшее y, для которого средняя точка (x, y - 0.5) лежит строго внутри эллипса."""
+    if x == 0 or rx2 == 0:
+        return ry
+    t = 4 * ry2 * (rx2 - x * x)
+    if t <= 0:
+        return 0
+    # Наибольшее m = 2y - 1, для которого rx2 * m² < t
+    m = math.isqrt(t // rx2)
+    while rx2 * (m + 1) ** 2 < t:
+        m += 1
+    while m > 0 and rx2 * m * m >= t:
+        m -= 1
+    return (m + 1) // 2
+
+def _ellipse_outer_x(rx2, ry2, y):
+    """Наименьшее x ≥ 0, для которого средняя точка (x + 0.5, y) лежит строго вне эллипса."""
+    v = 4 * rx2 * (ry2 - y * y)
+    if ry2 == 0 or v < ry2:
+        return 0
+    # Наименьшее m = 2x + 1, для которого ry2 * m² > v
+    m = math.isqrt(v // ry2)
+    while ry2 * m * m > v:
+        m -= 1
+    while ry2 * m * m <= v:
+        m += 1
+    return m // 2
+
+def _ellipse_region1_y(rx, ry, x):
+    """
+    Значение y, которое алгоритм средней точки выбирает в области 1 на шаге x.
+    За шаг y уменьшается не больше чем на единицу: y(x) = max(inner(x), y(x - 1) - 1),
+    поэтому y(x) – максимум inner(x') - (x - x'). Отставать от inner кривая может только
+    за точкой наклона 45° (x* = rx² / sqrt(rx² + ry²)), так что перебираются шаги рядом с ней.
+    """
+    rx2, ry2 = rx * rx, ry * ry
+    if rx2 == 0:
+        return ry
+    start = max(0, min(x, math.floor(rx2 / math.sqrt(rx2 + ry2)) - 2))
+    return max(_ellipse_inner_y(rx2, ry2, ry, xi) - (x - xi) for xi in range(start, x + 1))
 
-    return table if debug else None
+def _ellipse_region2_x(rx, ry, x_end, y_start, y):
+    """
+    Значение x, которое алгоритм средней точки выбирает в области 2 в строке y
+    (область начинается в точке (x_end, y_start)). За строку x растёт не больше чем на единицу,
+    поэтому x(y) – минимум outer(y') + (y' - y) по строкам выше; отставание возможно
+    только рядом с точкой наклона 45° (y* = ry² / sqrt(rx² + ry²)).
+    """
+    rx2, ry2 = rx * rx, ry * ry
+    best = min(max(_ellipse_outer_x(rx2, ry2, y), x_end), x_end + (y_start - y))
+    if rx2 + ry2 == 0:
+        return best
+    start = max(y + 1, math.floor(ry2 / math.sqrt(rx2 + ry2)) - 2)
+    for yi in range(start, y_start):
+        best = min(best, max(_ellipse_outer_x(rx2, ry2, yi), x_end) + (yi - y))
+    return best
+
+def _ellipse_visible_ranges(canvas, cx, cy, rx, ry, p_max, region):
+    """
+    Диапазоны параметра области эллипса (x для области 1, y для области 2),
+    на которых видна хотя бы одна из четырёх симметричных точек.
+    """
+    bounds_x, bounds_y = _viewport_bounds(canvas)
+
+    # Обратные функции дуги; у вырожденного эллипса (полуось 0) дуга – отрезок на оси
+    def x_of(c):
+        if ry == 0:
+            return rx if c <= 0 else 0
+        return rx * math.sqrt(max(1 - c * c / (ry * ry), 0))
+
+    def y_of(c):
+        if rx == 0:
+            return ry if c <= 0 else 0
+        return ry * math.sqrt(max(1 - c * c / (rx * rx), 0))
+
+    ranges = []
+    for sa in (1, -1):
+        for sc in (1, -1):
+            if region == 1:
+                ranges.append(_visible_param_range(cx, sa, bounds_x, cy, sc, bounds_y, x_of, p_max))
+            else:
+                ranges.append(_visible_param_range(cy, sa, bounds_y, cx, sc, bounds_x, y_of, p_max))
+    return _merge_ranges(ranges)
 
-def draw_ellipse(canvas, cx, cy, rx, ry, debug=False):
+def draw_ellipse(canvas, cx, cy, rx, ry, debug=False, filled=False):
     """
     Строит эллипс (центр (cx,cy), полуоси rx и ry) по алгоритму средней точки.
+    Решения хранятся умноженными на 4, поэтому все вычисления целочисленные
+    и не накапливают погрешность при любых радиусах.
     Если debug=True, возвращает таблицу записей в следующем формате (9 элементов):
          Шаг | di | δ | δ* | Пиксель | x | y | di+1 | Plot (x, y)
     где:
-      - di – текущая ошибка (или параметр, определяющий решение),
+      - di – текущая ошибка (или параметр, определяющий решение; в таблицу выводится
+        значение в средней точке, т. е. решение, делённое на 4),
       - δ – разность нового и старого значения,
       - δ* – дополнительная корректировка (здесь берется 0.0),
       - Пиксель и Plot (x, y) – выбранные координаты точки (отражённой) для отрисовки.
+
+    Точки четверти эллипса накапливаются и выводятся вместе с тремя отражениями
+    одной записью (см. _plot_mirrored). В каждой области перебираются только шаги,
+    на которых видна хотя бы одна из четырёх симметричных точек; состояние алгоритма
+    на первом видимом шаге вычисляется сразу.
+
+    Если filled=True, эллипс заливается: каждая строка выводится одним горизонтальным рядом
+    между симметричными точками (для этого перебирается вся четверть, т. е. время
+    пропорционально периметру, а не площади).
+    """
+    table = DebugTable(CURVE_COLUMNS) if debug else None
+    viewport = raster.get_viewport(canvas)
+    x_end, y_start = _ellipse_regions(rx, ry)
+    if filled:
+        ranges1 = [(0, x_end - 1)] if x_end > 0 else []
+        ranges2 = [(0, y_start)]
+    else:
+        ranges1 = _ellipse_visible_ranges(canvas, cx, cy, rx, ry, x_end - 1, region=1)
+        ranges2 = _ellipse_visible_ranges(canvas, cx, cy, rx, ry, y_start, region=2)
+    us, vs = _ellipse_quadrant_steps(cx, cy, rx, ry, x_end, y_start, ranges1, ranges2, table)
+    if filled:
+        _fill_rows(canvas, cx, cy, us, vs, viewport)
+    else:
+        _plot_mirrored(canvas, cx, cy, us, vs, QUADRANT_MIRRORS, viewport)
+    return table if debug else None
+
+
+def _ellipse_regions(rx, ry):
+    """
+    Граница областей алгоритма средней точки: первый шаг x_end, на котором 2*ry2*x >= 2*rx2*y,
+    и значение y_start на этом шаге (начало области 2).
     """
-    x = 0
-    y = ry
     rx2 = rx * rx
     ry2 = ry * ry
-    # Начальное значение решения для области 1
-    p1 = ry2 - rx2 * ry + 0.25 * rx2
-    table = [] if debug else None
-    iteration = 0
+    # Двоичный поиск: область 1 заканчивается не дальше чем через два шага после точки наклона 45°
+    lo, hi = 0, math.floor(rx2 / math.sqrt(rx2 + ry2)) + 3 if rx2 else 0
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if ry2 * mid >= rx2 * _ellipse_region1_y(rx, ry, mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo, _ellipse_region1_y(rx, ry, lo)
 
-    # Область 1: пока 2*ry2*x < 2*rx2*y
-    while (2 * ry2 * x) < (2 * rx2 * y):
-        # Отрисовка симметричных точек эллипса
-        pts = [
-            (cx + x, cy + y), (cx - x, cy + y),
-            (cx + x, cy - y), (cx - x, cy - y)
-        ]
-        for pt in pts:
-            draw_pixel(canvas, pt[0], pt[1])
 
-        if debug:
+def _ellipse_quadrant_steps(cx, cy, rx, ry, x_end, y_start, ranges1, ranges2, table=None, mirror=(1, 1)):
+    """
+    Шаги алгоритма средней точки в диапазонах ranges1 (шаги x области 1) и ranges2
+    (строки y области 2) четверти эллипса. Возвращает списки смещений точек (us, vs)
+    от центра; table, если задана, пополняется строками шагов (Пиксель – точка
+    четверти mirror = (знак x, знак y)).
+    """
+    rx2 = rx * rx
+    ry2 = ry * ry
+    sx, sy = mirror
+    us, vs = [], []
+    # Область 1: пока 2*ry2*x < 2*rx2*y
+    for first, last in ranges1:
+        x = first
+        y = _ellipse_region1_y(rx, ry, x)
+        # Решение 4F в средней точке (x + 1, y - 0.5); при x = 0 это 4*ry2 - 4*rx2*ry + rx2
+        p1 = 4 * ry2 * (x + 1) ** 2 + rx2 * (2 * y - 1) ** 2 - 4 * rx2 * ry2
+        iteration = x
+        while ry2 * x < rx2 * y and x <= last:
+            us.append(x)
+            vs.append(y)
             old_p = p1
 
-        # Обновление решения для области 1
-        if p1 < 0:
-            # Изменяется только x, y остаётся
-            new_p = p1 + 2 * ry2 * (x + 1) + ry2
-            x = x + 1
-        else:
-            new_p = p1 + 2 * ry2 * (x + 1) - 2 * rx2 * (y - 1) + ry2
+            # Обновление решения для области 1
+            if p1 < 0:
+                # Изменяется только x, y остаётся
+                p1 += 8 * ry2 * (x + 1) + 4 * ry2
+            else:
+                p1 += 8 * ry2 * (x + 1) - 8 * rx2 * (y - 1) + 4 * ry2
+                y = y - 1
             x = x + 1
+
+            if table is not None:
+                pixel = (cx + sx * x, cy + sy * y)  # выбираем первую отражённую точку
+                table.add(iteration, old_p / 4, (p1 - old_p) / 4, 0.0, *pixel, x, y, p1 / 4, *pixel)
+            iteration += 1
+
+    # Область 2 (параметр – строка y, перебираются сверху вниз)
+    for first, last in reversed(ranges2):
+        y = last
+        x = _ellipse_region2_x(rx, ry, x_end, y_start, y)
+        # Решение 4F в средней точке (x + 0.5, y - 1)
+        p2 = ry2 * (2 * x + 1) ** 2 + 4 * rx2 * (y - 1) ** 2 - 4 * rx2 * ry2
+        iteration = x_end + (y_start - y)
+        while y >= first:
+            us.append(x)
+            vs.append(y)
+            old_p = p2
+
+            if p2 > 0:
+                p2 += -8 * rx2 * (y - 1) + 4 * rx2
+            else:
+                p2 += 8 * ry2 * (x + 1) - 8 * rx2 * (y - 1) + 4 * rx2
+                x = x + 1
             y = y - 1
 
-        if debug:
-            delta = new_p - old_p
-            delta_star = 0.0  # Дополнительную корректировку можем задать нулём
-            pixel = (cx + x, cy + y)  # выбираем первую отражённую точку
-            plot_coords = pixel  # отображаемые координаты совпадают
-            table.append((iteration, old_p, delta, delta_star, pixel, x, y, new_p, plot_coords))
+            if table is not None:
+                pixel = (cx + sx * x, cy + sy * y)
+                table.add(iteration, old_p / 4, (p2 - old_p) / 4, 0.0, *pixel, x, y, p2 / 4, *pixel)
+            iteration += 1
 
-        p1 = new_p
-        iteration += 1
+    return us, vs
 
-    # Область 2
-    p2 = ry2 * (x + 0.5) ** 2 + rx2 * (y - 1) ** 2 - rx2 * ry2
-    while y >= 0:
-        pts = [
-            (cx + x, cy + y), (cx - x, cy + y),
-            (cx + x, cy - y), (cx - x, cy - y)
-        ]
-        for pt in pts:
-            draw_pixel(canvas, pt[0], pt[1])
 
-        if debug:
-            old_p = p2
+def _arc_extent(start, end):
+    """
+    Начало дуги в [0, 360) и её угловая длина в градусах (обход против часовой стрелки
+    от start до end; при end = start + 360·k, k ≠ 0, дуга – вся кривая).
+    """
+    extent = (end - start) % 360
+    if extent == 0 and end != start:
+        extent = 360
+    return start % 360, extent
 
-        if p2 > 0:
-            new_p = p2 - 2 * rx2 * (y - 1) + rx2
-            y = y - 1
-        else:
-            new_p = p2 + 2 * ry2 * (x + 1) - 2 * rx2 * (y - 1) + rx2
-            x = x + 1
-            y = y - 1
 
+def _in_arc(dx, dy, start, extent):
+    """Маска точек со смещениями (dx, dy) от центра, лежащих в угле [start, start + extent]."""
+    # Ось y канвы направлена вниз, углы отсчитываются против часовой стрелки на экране
+    angle = np.degrees(np.arctan2(-np.asarray(dy, dtype=float), np.asarray(dx, dtype=float))) % 360
+    return (angle - start) % 360 <= extent
+
+
+def _arc_pieces(start, extent, sector):
+    """
+    Делит дугу на части, не выходящие за границы секторов шириной sector градусов
+    (октантов или четвертей). Возвращает (номер сектора, начальный угол, конечный угол).
+    """
+    pieces = []
+    a, stop = start, start + extent
+    while a < stop:
+        k = math.floor(a / sector)
+        b = min(stop, (k + 1) * sector)
+        pieces.append((k % round(360 / sector), a, b))
+        a = b
+    return pieces
+
+
+def _mirror_sectors(mirrors, sector, u, v):
+    """Номер сектора (шириной sector градусов), в котором лежит отражение точки (u, v)."""
+    sectors = {}
+    for sx, sy, swap in mirrors:
+        dx, dy = (sx * v, sy * u) if swap else (sx * u, sy * v)
+        sectors[math.floor((math.degrees(math.atan2(-dy, dx)) % 360) / sector)] = (sx, sy, swap)
+    return sectors
+
+
+def _clip_range(ranges, lo, hi):
+    """Пересечение диапазонов ranges с отрезком [lo, hi]."""
+    clipped = []
+    for first, last in ranges:
+        first, last = max(first, lo), min(last, hi)
+        if first <= last:
+            clipped.append((first, last))
+    return clipped
+
+
+def _circle_arc_points(canvas, cx, cy, R, start, extent, debug):
+    """
+    Смещения от центра пикселей дуги окружности: в каждом октанте, через который проходит
+    дуга, перебираются только шаги между её граничными углами (с запасом в шаг)
+    и видимые в области вывода; затем остаются точки, лежащие в угле дуги.
+    Возвращает списки массивов dx, dy и (если debug=True) строк отладочной таблицы.
+    """
+    visible = _circle_visible_ranges(canvas, cx, cy, R)
+    mirrors = _mirror_sectors(OCTANT_MIRRORS, 45, math.sin(math.pi / 8), math.cos(math.pi / 8))
+    dxs, dys, rows = [], [], []
+    for k, a, b in _arc_pieces(start, extent, 45):
+        sx, sy, swap = mirrors[k]
+        # Шаг октанта – смещение вдоль оси x (для отражений с перестановкой – вдоль оси y)
+        bounds = [R * abs(math.sin(math.radians(t)) if swap else math.cos(math.radians(t))) for t in (a, b)]
+        for first, last in _clip_range(visible, math.floor(min(bounds)) - 1, math.ceil(max(bounds)) + 1):
+            x, y = _circle_octant(R, first, last)
+            dx, dy = (sx * y, sy * x) if swap else (sx * x, sy * y)
+            keep = _in_arc(dx, dy, start, extent)
+            x, y, dx, dy = x[keep], y[keep], dx[keep], dy[keep]
+            dxs.append(dx)
+            dys.append(dy)
+            if debug:
+                # Строки в формате draw_circle: ошибка d на шаге x
+                d = 2 * (x + 1) ** 2 + y * y + (y - 1) ** 2 - 2 * R * R
+                rows.append(DebugTable.from_arrays(
+                    CURVE_COLUMNS, step=x, di=d, pixel_x=cx + dx, pixel_y=cy + dy,
+                    x=x, y=y, di_next=d, plot_x=cx + dx, plot_y=cy + dy).array)
+    return dxs, dys, rows
+
+
+def _ellipse_arc_points(canvas, cx, cy, rx, ry, start, extent, debug):
+    """
+    Смещения от центра пикселей дуги эллипса: в каждой четверти, через которую проходит дуга,
+    алгоритм средней точки перебирает только шаги областей 1 и 2 между граничными углами дуги
+    (с запасом в шаг), видимые в области вывода; затем остаются точки, лежащие в угле дуги.
+    Возвращает списки массивов dx, dy и (если debug=True) строк отладочной таблицы.
+    """
+    x_end, y_start = _ellipse_regions(rx, ry)
+    visible1 = _ellipse_visible_ranges(canvas, cx, cy, rx, ry, x_end - 1, region=1)
+    visible2 = _ellipse_visible_ranges(canvas, cx, cy, rx, ry, y_start, region=2)
+    mirrors = _mirror_sectors(QUADRANT_MIRRORS, 90, 1, 1)
+    dxs, dys, rows = [], [], []
+    for k, a, b in _arc_pieces(start, extent, 90):
+        sx, sy, _ = mirrors[k]
+        if rx and ry:
+            # Точки эллипса на лучах, ограничивающих часть дуги
+            ends = []
+            for t in (a, b):
+                c, s = math.cos(math.radians(t)), math.sin(math.radians(t))
+                r = 1 / math.sqrt((c / rx) ** 2 + (s / ry) ** 2)
+                ends.append((abs(r * c), abs(r * s)))
+            xs, ys = zip(*ends)
+            ranges1 = _clip_range(visible1, math.floor(min(xs)) - 1, math.ceil(max(xs)) + 1)
+            ranges2 = _clip_range(visible2, math.floor(min(ys)) - 1, math.ceil(max(ys)) + 1)
+        else:
+            # Вырожденный эллипс – отрезок, перебирается целиком
+            ranges1, ranges2 = visible1, visible2
+        table = DebugTable(CURVE_COLUMNS) if debug else None
+        us, vs = _ellipse_quadrant_steps(cx, cy, rx, ry, x_end, y_start, ranges1, ranges2, table, (sx, sy))
+        dx, dy = sx * np.asarray(us, dtype=np.int64), sy * np.asarray(vs, dtype=np.int64)
+        keep = _in_arc(dx, dy, start, extent)
+        dxs.append(dx[keep])
+        dys.append(dy[keep])
         if debug:
-            delta = new_p - old_p
-            delta_star = 0.0
-            pixel = (cx + x, cy + y)
-            plot_coords = pixel
-            table.append((iteration, old_p, delta, delta_star, pixel, x, y, new_p, plot_coords))
+            # В таблице остаются только шаги, точки которых лежат в угле дуги
+            steps = table.array
+            rows.append(steps[_in_arc(steps["pixel_x"] - cx, steps["pixel_y"] - cy, start, extent)])
+    return dxs, dys, rows
 
-        p2 = new_p
-        iteration += 1
 
-    return table if debug else None
+def _arc_end(cx, cy, rx, ry, angle):
+    """Ближайший пиксель точки эллипса (окружности) на луче из центра под углом angle."""
+    c, s = math.cos(math.radians(angle)), -math.sin(math.radians(angle))
+    r = 1 / math.sqrt((c / rx) ** 2 + (s / ry) ** 2) if rx and ry else 0
+    return cx + round(r * c), cy + round(r * s)
+
+
+def draw_arc(canvas, cx, cy, rx, ry, start, end, debug=False, sector=False):
+    """
+    Строит дугу эллипса (центр (cx, cy), полуоси rx и ry) от угла start до угла end (в градусах,
+    против часовой стрелки на экране, 0° – направление оси x). Пиксели дуги совпадают
+    с пикселями draw_circle (при rx == ry) или draw_ellipse.
+
+    Дуга делится на части по октантам окружности (четвертям эллипса); в каждой части
+    алгоритм перебирает только шаги между граничными углами, которые к тому же видны
+    в области вывода, поэтому время построения пропорционально длине видимой части дуги.
+    Если sector=True, строится сектор: дуга и радиусы к её концам (отрезки Брезенхэма).
 
-def draw_parabola(canvas, xc, yc, ex, ey, debug=False):
+    Если debug=True, возвращается таблица шагов в формате draw_circle (draw_ellipse);
+    Пиксель – точка дуги в своём октанте (четверти).
+    """
+    start, extent = _arc_extent(start, end)
+    viewport = raster.get_viewport(canvas)
+    if rx == ry:
+        dxs, dys, rows = _circle_arc_points(canvas, cx, cy, rx, start, extent, debug)
+    else:
+        dxs, dys, rows = _ellipse_arc_points(canvas, cx, cy, rx, ry, start, extent, debug)
+    if sector and extent < 360:
+        xs, ys = polyline_pixels([_arc_end(cx, cy, rx, ry, start), (cx, cy),
+                                  _arc_end(cx, cy, rx, ry, start + extent)], viewport)
+        dxs.append(xs - cx)
+        dys.append(ys - cy)
+    if dxs:
+        # Точки уже отражены в свои октанты: выводятся без дополнительных отражений
+        _emit_pixels(canvas, cx + np.concatenate(dxs), cy + np.concatenate(dys), viewport)
+    if not debug:
+        return None
+    return DebugTable(CURVE_COLUMNS, np.concatenate(rows)) if rows else DebugTable(CURVE_COLUMNS)
+
+
+def draw_sector(canvas, cx, cy, rx, ry, start, end, debug=False):
+    """Строит сектор эллипса (окружности): дугу от start до end и радиусы к её концам (см. draw_arc)."""
+    return draw_arc(canvas, cx, cy, rx, ry, start, end, debug, sector=True)
+
+def draw_parabola(canvas, xc, yc, ex, ey, debug=False, axis="vertical"):
     """
-    Строит вертикальную параболу через вершину (xc, yc) и вторую точку (ex, ey)
-    по формуле:
-         y = a * (x - xc)^2 + yc,
-    где коэффициент a = (ey - yc)/((ex - xc)^2).
+    Строит параболу с вершиной (xc, yc), проходящую через вторую точку (ex, ey),
+    по алгоритму средней точки (только целочисленная арифметика):
+         axis="vertical":   y = a * (x - xc)^2 + yc,  a = (ey - yc)/((ex - xc)^2),
+         axis="horizontal": x = a * (y - yc)^2 + xc,  a = (ex - xc)/((ey - yc)^2).
+
+    Коэффициент хранится дробью a = p/q, и строится правая (для "horizontal" – нижняя)
+    половина параболы q·v = |p|·u² в осях (u – поперёк оси, v – вдоль оси в сторону раскрытия),
+    вторая половина получается отражением u -> −u. Решение F = |p|u² − qv вычисляется
+    в средней точке и обновляется приращениями:
+      - область 1 (касательная в точке u + 1 не круче 45°, 2|p|(u + 1) ≤ q): на каждом шаге u += 1,
+        v += 1, если средняя точка (u + 1, v + ½) лежит под кривой (2F > 0);
+      - область 2 (касательная круче 45°): на каждом шаге v += 1,
+        u += 1, если средняя точка (u + ½, v + 1) лежит внутри параболы (4F < 0).
+    Построение начинается в вершине и заканчивается на границе области вывода.
 
     Если debug=True, возвращается таблица отладки в формате:
          (Шаг, di, δ, δ*, Пиксель, x, y, di+1, Plot (x, y))
-    где:
-      - di = (y - yc)  (смещение по y относительно вершины),
-      - δ = di_next - di,
-      - δ* = 0.0.
+    где di и di+1 – решение до и после шага, δ – их разность, x, y – смещение точки
+    от вершины, Пиксель – точка правой (нижней) половины.
     """
-    if ex == xc:
-        raise ValueError("Вторая точка не должна совпадать по x с вершиной, чтобы избежать деления на ноль.")
-
-    a = (ey - yc) / ((ex - xc) ** 2)
-    table = [] if debug else None
+    if axis == "vertical":
+        if ex == xc:
+            raise ValueError("Вторая точка не должна совпадать по x с вершиной, чтобы избежать деления на ноль.")
+        p, q = ey - yc, (ex - xc) ** 2
+    elif axis == "horizontal":
+        if ey == yc:
+            raise ValueError("Вторая точка не должна совпадать по y с вершиной, чтобы избежать деления на ноль.")
+        p, q = ex - xc, (ey - yc) ** 2
+    else:
+        raise ValueError("Invalid axis. Use 'vertical' or 'horizontal'.")
+    sign = -1 if p < 0 else 1
+    p = abs(p)
+    table = DebugTable(CURVE_COLUMNS) if debug else None
+    viewport = raster.get_viewport(canvas)
+    xmin, ymin, xmax, ymax = viewport
+
+    def to_canvas(u, v):
+        """Смещение (x, y) от вершины для точки (u, v) в осях параболы."""
+        return (u, sign * v) if axis == "vertical" else (sign * v, u)
+
+    us, vs = [], []
+    # Вторая половина – отражение относительно оси параболы (точка в вершине выводится один раз)
+    mirrors = QUADRANT_MIRRORS[:2] if axis == "vertical" else QUADRANT_MIRRORS[::2]
+
+    def plot(u, v):
+        x, y = to_canvas(u, v)
+        us.append(x)
+        vs.append(y)
+
+    def record(iteration, old_d, new_d, u, v):
+        x, y = to_canvas(u, v)
+        pixel = (xc + x, yc + y)
+        table.add(iteration, old_d, new_d - old_d, 0.0, *pixel, x, y, new_d, *pixel)
+
+    # Наибольшие смещения от вершины, при которых точка ещё может быть видна
+    if axis == "vertical":
+        u_limit = max(xmax - xc, xc - xmin)
+        v_limit = ymax - yc if sign > 0 else yc - ymin
+    else:
+        u_limit = max(ymax - yc, yc - ymin)
+        v_limit = xmax - xc if sign > 0 else xc - xmin
+    if u_limit < 0 or v_limit < 0:
+        return table if debug else None
+
+    u, v = 0, 0
     iteration = 0
 
-    canvas_width = int(canvas["width"])
-    canvas_height = int(canvas["height"])
-
-    for x in range(0, canvas_width, 1):
-        dx = x - xc
-        y = a * (dx ** 2) + yc
-        if y < 0 or y > canvas_height:
-            continue
-
-        # Рисуем две симметричные точки
-        draw_pixel(canvas, x, y)
-        draw_pixel(canvas, xc - dx, y)
-
+    # Область 1: решение 2F в средней точке (u + 1, v + ½)
+    d = 2 * p * (u + 1) ** 2 - q * (2 * v + 1)
+    while 2 * p * (u + 1) <= q and u <= u_limit and v <= v_limit:
+        plot(u, v)
+        old_d = d
+        if d > 0:
+            d -= 2 * q
+            v += 1
+        d += 2 * p * (2 * u + 3)
+        u += 1
         if debug:
-            # Определяем текущую параметрическую величину: di = y - yc
-            di = y - yc
-            # Попытаемся вычислить значение для следующего шага (при x+1)
-            if x + 1 < canvas_width:
-                next_dx = (x + 1) - xc
-                next_y = a * (next_dx ** 2) + yc
-                di_next = next_y - yc
-            else:
-                di_next = di
-            delta = di_next - di
-            delta_star = 0.0
-            pixel = (x, int(round(y)))  # выбираем правую точку
-            plot_coords = pixel
-            table.append((iteration, di, delta, delta_star, pixel, x, y, di_next, plot_coords))
+            record(iteration, old_d, d, u, v)
+        iteration += 1
 
+    # Область 2: решение 4F в средней точке (u + ½, v + 1)
+    d = p * (2 * u + 1) ** 2 - 4 * q * (v + 1)
+    while u <= u_limit and v <= v_limit:
+        plot(u, v)
+        old_d = d
+        if d < 0:
+            d += 8 * p * (u + 1)
+            u += 1
+        d -= 4 * q
+        v += 1
+        if debug:
+            record(iteration, old_d, d, u, v)
         iteration += 1
 
+    _plot_mirrored(canvas, xc, yc, us, vs, mirrors, viewport)
     return table if debug else None
 
 def draw_hyperbola(canvas, xc, yc, x2, y2, direction, debug=False):
     """
-    Рисует гиперболу с центром (xc, yc). Полуоси определяются как:
-         - a = |x2 - xc| (горизонтальная полуось),
-         - b = |y2 - yc| (вертикальная полуось).
+    Рисует гиперболу с центром (xc, yc) по алгоритму средней точки (только целочисленная арифметика).
+    Полуоси определяются как:
+         - a = |x2 - xc|,
+         - b = |y2 - yc|.
 
     Выбор уравнения зависит от направления:
-         - "horizontal": (x - xc)^2/a^2 - (y - yc)^2/b^2 = 1,
-         - "vertical":   (y - yc)^2/b^2 - (x - xc)^2/a^2 = 1.
+         - "horizontal": (x - xc)^2/a^2 - (y - yc)^2/b^2 = 1 (ветви слева и справа),
+         - "vertical":   (y - yc)^2/a^2 - (x - xc)^2/b^2 = 1 (ветви сверху и снизу).
+
+    Строится четверть ветви в осях (u, v) гиперболы u²/a² − v²/b² = 1 от вершины (a, 0),
+    остальные точки получаются отражением. Решение F = b²u² − a²v² − a²b² вычисляется
+    в средней точке между двумя кандидатами и обновляется приращениями:
+      - область 1 (касательная круче 45°, b²u > a²v): на каждом шаге v += 1,
+        u += 1, если средняя точка (u + ½, v + 1) лежит внутри (F < 0);
+      - область 2 (касательная положе 45°): на каждом шаге u += 1,
+        v += 1, если средняя точка (u + 1, v + ½) лежит снаружи (F > 0).
+    В решении хранится 4F, поэтому дроби не возникают. Построение заканчивается, когда
+    все четыре отражённые точки выходят за границу области вывода.
 
     При debug=True формируется таблица отладки в формате:
          (Шаг, di, δ, δ*, Пиксель, x, y, di+1, Plot (x, y))
-    Для "horizontal" направления в качестве di возьмём вычисленное x-координату правой верхней точки.
-    Для "vertical" – аналогично, будем использовать y-координату правой верхней точки.
+    где di и di+1 – решение (4F) до и после шага, δ – их разность, x, y – смещения точки
+    от центра, Пиксель – точка правой (для "vertical" – нижней) ветви.
     """
-    a_val = abs(x2 - xc)  # Горизонтальная полуось
-    b_val = abs(y2 - yc)  # Вертикальная полуось
-
-    T = 2.0  # Максимальное значение параметра t
-    dt = 0.01  # Шаг изменения параметра t
-
-    table = [] if debug else None
+    if direction not in ("horizontal", "vertical"):
+        raise ValueError("Invalid direction. Use 'horizontal' or 'vertical'.")
+    a = abs(x2 - xc)
+    b = abs(y2 - yc)
+    table = DebugTable(CURVE_COLUMNS) if debug else None
+    viewport = raster.get_viewport(canvas)
+    xmin, ymin, xmax, ymax = viewport
+    horizontal = direction == "horizontal"
+
+    def to_canvas(u, v):
+        """Смещение (x, y) от центра для точки (u, v) в осях гиперболы."""
+        return (u, v) if horizontal else (v, u)
+
+    us, vs = [], []
+
+    def plot(u, v):
+        # Точка четверти; отражения добавляются при выводе (на осях они совпадают и выводятся один раз)
+        x, y = to_canvas(u, v)
+        us.append(x)
+        vs.append(y)
+
+    def record(iteration, old_d, new_d, u, v):
+        x, y = to_canvas(u, v)
+        pixel = (xc + x, yc + y)
+        table.add(iteration, old_d, new_d - old_d, 0.0, *pixel, x, y, new_d, *pixel)
+
+    # Наибольшие смещения от центра, при которых точка ещё может быть видна
+    x_limit = max(xmax - xc, xc - xmin)
+    y_limit = max(ymax - yc, yc - ymin)
+    u_limit, v_limit = (x_limit, y_limit) if horizontal else (y_limit, x_limit)
+    if u_limit < 0 or v_limit < 0:
+        return table if debug else None
+
+    if a == 0:
+        # Вырожденная гипербола: прямая u = 0 (или точка при b = 0)
+        for iteration, v in enumerate(range(0, v_limit + 1 if b else 1)):
+            plot(0, v)
+            if debug:
+                record(iteration, 0, 0, 0, v)
+        _plot_mirrored(canvas, xc, yc, us, vs, QUADRANT_MIRRORS, viewport)
+        return table if debug else None
+
+    a2, b2 = a * a, b * b
+    u, v = a, 0
     iteration = 0
-    t = -T
-
-    while t <= T:
-        if direction == "horizontal":
-            # Гипербола вдоль оси X:
-            x_right = xc + a_val * math.cosh(t)
-            y_top = yc + b_val * math.sinh(t)
-            x_left = xc - a_val * math.cosh(t)
-            y_bottom = yc - b_val * math.sinh(t)
-            # Для отладки возьмем di = x_right (как параметрическая координата)
-            di = x_right
-            # Вычисляем следующую точку (при t+dt)
-            next_t = t + dt
-            next_x_right = xc + a_val * math.cosh(next_t)
-            di_next = next_x_right
-        elif direction == "vertical":
-            # Гипербола вдоль оси Y:
-            x_right = xc + b_val * math.sinh(t)
-            y_top = yc + a_val * math.cosh(t)
-            x_left = xc - b_val * math.sinh(t)
-            y_bottom = yc - a_val * math.cosh(t)
-            # Для вертикальной гиперболы возьмём di = y_top
-            di = y_top
-            next_t = t + dt
-            next_y_top = yc + a_val * math.cosh(next_t)
-            di_next = next_y_top
-        else:
-            raise ValueError("Invalid direction. Use 'horizontal' or 'vertical'.")
-
-        delta = di_next - di
-        delta_star = 0.0
-        # В качестве пикселя для отладки берем правую верхнюю точку
-        pixel = (int(round(x_right)), int(round(y_top)))
-        plot_coords = pixel
-
-        # Отрисовываем точки четырьмя вызовами
-        draw_pixel(canvas, x_right, y_top)  # Правая верхняя
-        draw_pixel(canvas, x_left, y_top)  # Левая верхняя
-        draw_pixel(canvas, x_right, y_bottom)  # Правая нижняя
-        draw_pixel(canvas, x_left, y_bottom)  # Левая нижняя
 
+    # Область 1: решение в средней точке (u + ½, v + 1)
+    d = b2 * (2 * u + 1) ** 2 - 4 * a2 * (v + 1) ** 2 - 4 * a2 * b2
+    while b2 * u > a2 * v and u <= u_limit and v <= v_limit:
+        plot(u, v)
+        old_d = d
+        if d < 0:
+            d += 8 * b2 * (u + 1)
+            u += 1
+        d -= 4 * a2 * (2 * v + 3)
+        v += 1
         if debug:
-            table.append((iteration, di, delta, delta_star, pixel, x_right, y_top, di_next, plot_coords))
+            record(iteration, old_d, d, u, v)
+        iteration += 1
 
-        t += dt
+    # Область 2: решение в средней точке (u + 1, v + ½)
+    d = 4 * b2 * (u + 1) ** 2 - a2 * (2 * v + 1) ** 2 - 4 * a2 * b2
+    while u <= u_limit and v <= v_limit:
+        plot(u, v)
+        old_d = d
+        if d > 0:
+            d -= 8 * a2 * (v + 1)
+            v += 1
+        d += 4 * b2 * (2 * u + 3)
+        u += 1
+        if debug:
+            record(iteration, old_d, d, u, v)
         iteration += 1
 
+    _plot_mirrored(canvas, xc, yc, us, vs, QUADRANT_MIRRORS, viewport)
     return table if debug else None
+
+
+def _rotated_conic(cx, cy, a, b, angle, sign):
+    """
+    Коэффициенты (A, B, C, D, E, F) кривой b²u² + sign·a²v² - a²b² = 0, где (u, v) – координаты
+    в осях, повёрнутых на угол angle (градусы, против часовой стрелки на экране) вокруг (cx, cy).
+    При angle = 0 коэффициенты целые, если целые cx, cy, a, b.
+    """
+    if angle % 360 == 0:
+        c, s = 1, 0
+    else:
+        c, s = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    # u = X·c - Y·s, v = X·s + Y·c, где X = x - cx, Y = y - cy (ось y канвы направлена вниз)
+    a2, b2 = a * a, b * b
+    A = b2 * c * c + sign * a2 * s * s
+    B = 2 * c * s * (sign * a2 - b2)
+    C = b2 * s * s + sign * a2 * c * c
+    D = -2 * A * cx - B * cy
+    E = -2 * C * cy - B * cx
+    F = A * cx * cx + B * cx * cy + C * cy * cy - a2 * b2
+    return A, B, C, D, E, F
+
+
+def conic_ellipse(cx, cy, rx, ry, angle=0):
+    """Коэффициенты общего уравнения эллипса с центром (cx, cy) и полуосями rx, ry, повёрнутого на angle градусов."""
+    return _rotated_conic(cx, cy, rx, ry, angle, 1)
+
+
+def conic_hyperbola(cx, cy, a, b, angle=0):
+    """
+    Коэффициенты общего уравнения гиперболы u²/a² - v²/b² = 1 с центром (cx, cy),
+    действительная ось которой повёрнута на angle градусов.
+    """
+    return _rotated_conic(cx, cy, a, b, angle, -1)
+
+
+def _check_conic(A, B, C, D, E, F):
+    """Возбуждает ValueError для вырожденных кривых (точка, пара прямых, прямая)."""
+    scale = max(abs(A), abs(B), abs(C))
+    if scale == 0:
+        raise ValueError("Уравнение первой степени: прямая, а не кривая второго порядка.")
+    det = 4 * A * C - B * B
+    if abs(det) > 1e-12 * scale * scale:
+        # Центральная кривая: в центре значение функции не должно быть нулевым
+        x0 = (B * E - 2 * C * D) / det
+        y0 = (B * D - 2 * A * E) / det
+        if A * x0 * x0 + B * x0 * y0 + C * y0 * y0 + D * x0 + E * y0 + F == 0:
+            raise ValueError("Вырожденная кривая второго порядка (точка или пара прямых).")
+        return
+    # Парабола: линейная часть не должна быть перпендикулярна оси
+    eigenvalues, eigenvectors = np.linalg.eigh(np.array([[A, B / 2], [B / 2, C]], dtype=float))
+    axis = eigenvectors[:, int(np.argmin(np.abs(eigenvalues)))]
+    if abs(D * axis[0] + E * axis[1]) <= 1e-12 * max(abs(D), abs(E), 1):
+        raise ValueError("Вырожденная кривая второго порядка (пара параллельных прямых).")
+
+
+def _conic_value(coefficients, x, y):
+    """Значение F(x, y) = Ax² + Bxy + Cy² + Dx + Ey + F."""
+    A, B, C, D, E, F = coefficients
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    return A * x * x + B * x * y + C * y * y + D * x + E * y + F
+
+
+def _scan_roots(a, b, c):
+    """
+    Вещественные корни t уравнений a·t² + b·t + c = 0 (a – число, b и c – массивы):
+    возвращает номера уравнений и корни (у уравнения их может быть два).
+    """
+    if a == 0:
+        idx = np.flatnonzero(b != 0)
+        return idx, -c[idx] / b[idx]
+    disc = b * b - 4 * a * c
+    idx = np.flatnonzero(disc >= 0)
+    b, c = b[idx], c[idx]
+    # Устойчивая форма: второй корень – через произведение корней c / a
+    q = -0.5 * (b + np.copysign(np.sqrt(disc[idx]), b))
+    t1 = q / a
+    t2 = np.divide(c, q, out=t1.copy(), where=q != 0)
+    return np.concatenate([idx, idx]), np.concatenate([t1, t2])
+
+
+def _line_crossings(A, B, C, D, E, F, p, q, r):
+    """Точки пересечения кривой второго порядка с прямой p·x + q·y + r = 0."""
+    if p == q == 0:
+        return np.empty(0), np.empty(0)
+    if abs(q) >= abs(p):
+        # y = k·x + m
+        k, m = -p / q, -r / q
+        _, x = _scan_roots(A + B * k + C * k * k, np.array([B * m + 2 * C * k * m + D + E * k]),
+                           np.array([C * m * m + E * m + F]))
+        return x, k * x + m
+    # x = k·y + m
+    k, m = -q / p, -r / p
+    _, y = _scan_roots(C + B * k + A * k * k, np.array([B * m + 2 * A * k * m + E + D * k]),
+                       np.array([A * m * m + D * m + F]))
+    return k * y + m, y
+
+
+def _column_crossings(A, B, C, D, E, F, columns):
+    """Пересечения со столбцами x: C·y² + (Bx + E)·y + (Ax² + Dx + F) = 0."""
+    k, y = _scan_roots(C, B * columns + E, A * columns * columns + D * columns + F)
+    return columns[k], y
+
+
+def _row_crossings(A, B, C, D, E, F, rows):
+    """Пересечения со строками y: A·x² + (By + D)·x + (Cy² + Ey + F) = 0."""
+    k, x = _scan_roots(A, B * rows + D, C * rows * rows + E * rows + F)
+    return x, rows[k]
+
+
+def draw_conic(canvas, A, B, C, D, E, F, debug=False):
+    """
+    Строит кривую второго порядка общего вида Ax² + Bxy + Cy² + Dx + Ey + F = 0
+    (в координатах канвы): эллипс, гиперболу или параболу с любым поворотом осей.
+    Коэффициенты для повёрнутых эллипса и гиперболы дают conic_ellipse и conic_hyperbola.
+
+    На каждом столбце x области вывода кривая – квадратное уравнение относительно y,
+    на каждой строке y – относительно x; их корни – точные точки пересечения кривой
+    с прямыми развёртки. Октант в точке пересечения выбирается по градиенту
+    ∇F = (2Ax + By + D, Bx + 2Cy + E): если касательная ближе к оси x (|F_y| ≥ |F_x|),
+    выводится ближайший к пересечению пиксель столбца, иначе – пиксель строки.
+    Как и в алгоритме средней точки, в каждом октанте выбирается пиксель, ближайший
+    по второстепенной оси (для осевого эллипса результат практически совпадает с draw_ellipse),
+    но октант определяется в точке кривой, а не в центре пикселя, поэтому тонкие
+    эллипсы строятся без разрывов и лишних пикселей. Через точки смены октанта
+    (F_x = 0, F_y = 0, F_x = ±F_y) проводятся дополнительные прямые развёртки – иначе
+    у острых вершин кривая разворачивается между соседними столбцами и строками.
+    Все столбцы и строки обрабатываются векторизованно, вне области вывода ничего не вычисляется.
+    Для вырожденных кривых (точка, пара прямых) возбуждается ValueError.
+
+    Если debug=True, возвращается таблица отладки в формате:
+         (Шаг, di, δ, δ*, Пиксель, x, y, di+1, Plot (x, y))
+    по одной строке на пиксель (сначала пиксели столбцов, затем строк): di – значение F
+    в пикселе, δ – смещение точки пересечения от центра пикселя вдоль прямой развёртки,
+    x, y – точка пересечения, di+1 – значение F в соседнем пикселе по другую сторону от неё.
+    """
+    _check_conic(A, B, C, D, E, F)
+    viewport = raster.get_viewport(canvas)
+    xmin, ymin, xmax, ymax = viewport
+    coefficients = (A, B, C, D, E, F)
+
+    def gradient(x, y):
+        return np.abs(2 * A * x + B * y + D), np.abs(B * x + 2 * C * y + E)
+
+    col_x, col_y = _column_crossings(*coefficients, np.arange(xmin, xmax + 1, dtype=float))
+    gx, gy = gradient(col_x, col_y)
+    col_x, col_y = col_x[gy >= gx], col_y[gy >= gx]
+    row_x, row_y = _row_crossings(*coefficients, np.arange(ymin, ymax + 1, dtype=float))
+    gx, gy = gradient(row_x, row_y)
+    row_x, row_y = row_x[gx >= gy], row_y[gx >= gy]
+
+    # Вершины: столбец через точку F_x = 0 и строка через точку F_y = 0
+    x, y = _line_crossings(*coefficients, 2 * A, B, D)
+    col_x, col_y = np.append(col_x, x), np.append(col_y, y)
+    x, y = _line_crossings(*coefficients, B, 2 * C, E)
+    row_x, row_y = np.append(row_x, x), np.append(row_y, y)
+    # Смена октанта по диагонали (F_x = ±F_y): ближайшее пересечение с ближайшим столбцом или строкой
+    for sign in (1, -1):
+        for x, y in zip(*_line_crossings(*coefficients, 2 * A - sign * B, B - 2 * sign * C, D - sign * E)):
+            near_col = _column_crossings(*coefficients, np.array([np.floor(x + 0.5)]))
+            near_row = _row_crossings(*coefficients, np.array([np.floor(y + 0.5)]))
+            candidates = [(abs(cx - x) + abs(cy - y), True, cx, cy) for cx, cy in zip(*near_col)]
+            candidates += [(abs(cx - x) + abs(cy - y), False, cx, cy) for cx, cy in zip(*near_row)]
+            if not candidates:
+                continue
+            _, along_y, cx, cy = min(candidates)
+            if along_y:
+                col_x, col_y = np.append(col_x, cx), np.append(col_y, cy)
+            else:
+                row_x, row_y = np.append(row_x, cx), np.append(row_y, cy)
+
+    # Ближайший к пересечению пиксель (в таблицу отладки попадают только видимые)
+    cross_x = np.concatenate([col_x, row_x])
+    cross_y = np.concatenate([col_y, row_y])
+    xs = np.floor(cross_x + 0.5).astype(np.int64)
+    ys = np.floor(cross_y + 0.5).astype(np.int64)
+    _emit_pixels(canvas, xs, ys, viewport)
+    if not debug:
+        return None
+
+    along_y = np.arange(len(xs)) < len(col_x)
+    inside = (xs >= xmin) & (xs <= xmax) & (ys >= ymin) & (ys <= ymax)
+    cross_x, cross_y, xs, ys, along_y = (a[inside] for a in (cross_x, cross_y, xs, ys, along_y))
+    offset = np.where(along_y, cross_y - ys, cross_x - xs)
+    side = np.where(offset < 0, -1, 1)
+    di = _conic_value(coefficients, xs, ys)
+    di_next = _conic_value(coefficients, xs + np.where(along_y, 0, side), ys + np.where(along_y, side, 0))
+    return DebugTable.from_arrays(
+        CURVE_COLUMNS, step=np.arange(len(xs)), di=di, delta=offset, delta_star=np.zeros(len(xs)),
+        pixel_x=xs, pixel_y=ys, x=cross_x, y=cross_y, di_next=di_next, plot_x=xs, plot_y=ys)
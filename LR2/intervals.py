@@ -1,8 +1,13 @@
 import math
+import numpy as np
+import raster
+from debug_table import DebugTable, DDA_COLUMNS, LINE_COLUMNS, field_names
 
 def draw_pixel(canvas, x, y, intensity=1, size=1):
     """
     Рисует пиксель (точку) на канве.
+    В зависимости от выбранного способа вывода (raster.set_backend) пиксель
+    либо становится отдельным элементом канвы, либо записывается в буфер кадра.
 
     Параметры:
       canvas      - объект Canvas.
@@ -13,9 +18,127 @@ def draw_pixel(canvas, x, y, intensity=1, size=1):
     x = int(round(x))
     y = int(round(y))
     intensity = max(0, min(1, intensity))
+    if raster.get_backend() == raster.BACKEND_FRAMEBUFFER:
+        raster.put_pixel(canvas, x, y, intensity, size)
+        return
     shade = int(255 * (1 - intensity))
     color = f"#{shade:02x}{shade:02x}{shade:02x}"
-    canvas.create_rectangle(x, y, x + size, y + size, outline=color, fill=color)
+    canvas.create_rectangle(x, y, x + size, y + size, outline=color, fill=color, tags=raster.get_group_tags())
+
+
+def draw_span(canvas, x0, y0, x1, y1, intensity=1):
+    """
+    Рисует горизонтальный (y0 == y1) или вертикальный (x0 == x1) ряд пикселей
+    от (x0, y0) до (x1, y1) включительно одним элементом канвы (или одной записью в буфер кадра).
+    """
+    if x0 == x1 and y0 == y1:
+        draw_pixel(canvas, x0, y0, intensity)
+        return
+    x0, x1 = min(x0, x1), max(x0, x1)
+    y0, y1 = min(y0, y1), max(y0, y1)
+    intensity = max(0, min(1, intensity))
+    if raster.get_backend() == raster.BACKEND_FRAMEBUFFER:
+        raster.put_span(canvas, x0, y0, x1, y1, intensity)
+        return
+    shade = int(255 * (1 - intensity))
+    color = f"#{shade:02x}{shade:02x}{shade:02x}"
+    if y0 == y1:
+        canvas.create_line(x0, y0, x1 + 1, y0, fill=color, tags=raster.get_group_tags())
+    else:
+        canvas.create_line(x0, y0, x0, y1 + 1, fill=color, tags=raster.get_group_tags())
+
+
+class SpanWriter:
+    """
+    Выходная стадия растеризаторов отрезков.
+    Пиксели, идущие подряд в одной строке (или в одном столбце), объединяются в ряд
+    и выводятся одним вызовом draw_span вместо отдельного draw_pixel на каждый пиксель.
+    Для почти горизонтальных и почти вертикальных отрезков это сокращает число
+    элементов канвы с сотен до единиц.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.start = None  # Первый пиксель текущего ряда
+        self.end = None    # Последний пиксель текущего ряда
+
+    def add(self, x, y):
+        x = int(round(x))
+        y = int(round(y))
+        if self.start is None:
+            self.start = self.end = (x, y)
+            return
+        (sx, sy), (ex, ey) = self.start, self.end
+        if (x, y) == (ex, ey):
+            return
+        if y == ey == sy and abs(x - ex) == 1 and (sx == ex or (x - ex) == (ex - sx) // abs(ex - sx)):
+            # Продолжение горизонтального ряда в том же направлении
+            self.end = (x, y)
+            return
+        if x == ex == sx and abs(y - ey) == 1 and (sy == ey or (y - ey) == (ey - sy) // abs(ey - sy)):
+            # Продолжение вертикального ряда в том же направлении
+            self.end = (x, y)
+            return
+        self.flush()
+        self.start = self.end = (x, y)
+
+    def flush(self):
+        """Выводит накопленный ряд пикселей."""
+        if self.start is not None:
+            draw_span(self.canvas, *self.start, *self.end)
+            self.start = self.end = None
+
+
+def clip_line(x0, y0, x1, y1, xmin, ymin, xmax, ymax):
+    """
+    Отсекает отрезок прямоугольником [xmin, xmax] x [ymin, ymax] по алгоритму Лианга–Барски.
+    Возвращает интервал параметра (t0, t1) видимой части отрезка
+    (точка отрезка: (x0 + t * (x1 - x0), y0 + t * (y1 - y0))) или None, если отрезок невидим.
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    t0, t1 = 0.0, 1.0
+    for p, q in ((-dx, x0 - xmin), (dx, xmax - x0), (-dy, y0 - ymin), (dy, ymax - y0)):
+        if p == 0:
+            # Отрезок параллелен границе и лежит снаружи
+            if q < 0:
+                return None
+        elif p < 0:
+            t0 = max(t0, q / p)
+        else:
+            t1 = min(t1, q / p)
+    if t0 > t1:
+        return None
+    return t0, t1
+
+
+def _visible_steps(x0, y0, x1, y1, steps, viewport):
+    """
+    Диапазон шагов [first, last] растеризатора (шаг i соответствует t = i / steps),
+    на которых пиксель может оказаться внутри области вывода, или None.
+    Область расширяется на пиксель, чтобы округление координат не теряло крайние пиксели.
+    """
+    xmin, ymin, xmax, ymax = viewport
+    visible = clip_line(x0, y0, x1, y1, xmin - 1, ymin - 1, xmax + 1, ymax + 1)
+    if visible is None:
+        return None
+    t0, t1 = visible
+    first = max(0, math.ceil(t0 * steps))
+    last = min(steps, math.floor(t1 * steps))
+    if first > last:
+        return None
+    return first, last
+
+
+def _bresenham_offsets(i, dx, dy):
+    """
+    Сколько шагов по x и по y (dx, dy ≥ 0) сделал алгоритм Брезенхэма к итерации i.
+    По второстепенной оси это k_i = ceil((2 * i * minor - major) / (2 * major)) –
+    ровно то, что даёт пошаговое накопление ошибки.
+    """
+    if dx >= dy:
+        return i, -((dx - 2 * i * dy) // (2 * max(dx, 1)))
+    return -((dy - 2 * i * dx) // (2 * dy)), i
 
 
 def draw_line_dda(canvas, x0, y0, x1, y1, debug=False):
@@ -30,23 +153,35 @@ def draw_line_dda(canvas, x0, y0, x1, y1, debug=False):
 
     if steps == 0:
         draw_pixel(canvas, x0, y0)
-        return [] if debug else None
+        return DebugTable(DDA_COLUMNS) if debug else None
+
+    # Перебираем только шаги, попадающие в видимую область канвы
+    visible = _visible_steps(x0, y0, x1, y1, steps, raster.get_viewport(canvas))
+    if visible is None:
+        return DebugTable(DDA_COLUMNS) if debug else None
+    first, last = visible
 
     x_inc = dx / steps
     y_inc = dy / steps
-    x, y = x0, y0
+    if first == 0:
+        x, y = x0, y0
+    else:
+        # Начало отсечено: сразу переходим к первому видимому шагу
+        x, y = x0 + first * x_inc, y0 + first * y_inc
 
-    table = [] if debug else None
+    table = DebugTable(DDA_COLUMNS) if debug else None
+    writer = SpanWriter(canvas)
 
-    for i in range(steps + 1):
+    for i in range(first, last + 1):
         displayed = (int(round(x)), int(round(y)))
         if debug:
             # Формат: Итерация, x, y, Отобр. координаты
-            table.append((i, x, y, displayed))
-        draw_pixel(canvas, x, y)
+            table.add(i, x, y, *displayed)
+        writer.add(*displayed)
         x += x_inc
         y += y_inc
 
+    writer.flush()
     return table if debug else None
 
 
@@ -65,20 +200,31 @@ def draw_line_bresenham(canvas, x0, y0, x1, y1, debug=False):
     dy = abs(y1 - y0)
     sx = 1 if x0 < x1 else -1
     sy = 1 if y0 < y1 else -1
-    err = dx - dy
 
-    table = [] if debug else None
-    iteration = 0
+    # Перебираем только шаги, попадающие в видимую область канвы:
+    # состояние алгоритма на первом видимом шаге вычисляется сразу, без прохода по невидимым
+    visible = _visible_steps(x0, y0, x1, y1, max(dx, dy), raster.get_viewport(canvas))
+    if visible is None:
+        return DebugTable(LINE_COLUMNS) if debug else None
+    first, last = visible
+    moved_x, moved_y = _bresenham_offsets(first, dx, dy)
+    err = dx - dy - moved_x * dy + moved_y * dx
+    x0, y0 = x0 + sx * moved_x, y0 + sy * moved_y
+
+    table = DebugTable(LINE_COLUMNS) if debug else None
+    writer = SpanWriter(canvas)
+    iteration = first
 
     while True:
         cur_x, cur_y = x0, y0
         cur_err = err  # значение ошибки до изменения
 
-        # Если достигли конечной точки, записываем итерацию и завершаем цикл.
-        if cur_x == x1 and cur_y == y1:
+        # Если достигли последнего видимого шага (без отсечения – конечной точки),
+        # записываем итерацию и завершаем цикл.
+        if iteration == last:
             if debug:
-                table.append((iteration, cur_x, cur_y, cur_err, cur_err, (cur_x, cur_y)))
-            draw_pixel(canvas, cur_x, cur_y)
+                table.add(iteration, cur_x, cur_y, cur_err, cur_err, cur_x, cur_y)
+            writer.add(cur_x, cur_y)
             break
 
         e2 = 2 * err
@@ -97,17 +243,18 @@ def draw_line_bresenham(canvas, x0, y0, x1, y1, debug=False):
 
         if debug:
             # Формируем строку: итерация, cur_x, cur_y, cur_err, corrected_err, отображаемые координаты
-            table.append((iteration, cur_x, cur_y, cur_err, corrected_err, (cur_x, cur_y)))
-        draw_pixel(canvas, cur_x, cur_y)
+            table.add(iteration, cur_x, cur_y, cur_err, corrected_err, cur_x, cur_y)
+        writer.add(cur_x, cur_y)
 
         # Переходим к следующему пикселю
         x0, y0 = new_x, new_y
         iteration += 1
 
+    writer.flush()
     return table if debug else None
 
 
-def draw_line_wu(canvas, x0, y0, x1, y1, debug=False):
+def draw_line_wu(canvas, x0, y0, x1, y1, debug=False, composite=None):
     """
     Строит линию по алгоритму Ву (антиалиасинг).
     Если debug=True, возвращает таблицу итераций, содержащую:
@@ -117,7 +264,23 @@ def draw_line_wu(canvas, x0, y0, x1, y1, debug=False):
          y – ipart(intery) (определяет верхний пиксель);
          e – значение, равное rfpart(intery) (интенсивность для пикселя с координатами y);
          e′ – значение fpart(intery) (интенсивность для пикселя с координатами y+1).
+    Проходятся столбцы от round(x0) до round(x1) включительно; интенсивность концевых
+    столбцов умножается на долю пикселя, покрытую отрезком (xgap).
+
+    composite – режим накопления покрытия в буфере кадра: "max" или "over".
+    Если он задан (а при выводе в буфер кадра по умолчанию используется "max"), линия
+    строится векторизованно (те же шаги, что и в таблице итераций) и не затирает уже
+    нарисованные пиксели, а складывается с ними; итоговое изображение собирается один раз при выводе кадра.
     """
+    if composite is None and raster.get_backend() == raster.BACKEND_FRAMEBUFFER:
+        composite = "max"
+    if composite is not None:
+        result = rasterize_lines([(x0, y0, x1, y1)], "wu", debug=debug,
+                                 viewport=raster.get_viewport(canvas))
+        xs, ys, intensity = result[:3]
+        raster.composite(canvas, xs, ys, intensity, composite)
+        return result[4][0] if debug else None
+
     def ipart(x): return int(math.floor(x))
     def round_val(x): return int(math.floor(x + 0.5))
     def fpart(x): return x - math.floor(x)
@@ -132,26 +295,331 @@ def draw_line_wu(canvas, x0, y0, x1, y1, debug=False):
 
     dx = x1 - x0
     dy = y1 - y0
-    gradient = dy / dx if dx != 0 else 0
+    gradient = dy / dx if dx != 0 else 1
+
+    table = DebugTable(LINE_COLUMNS) if debug else None
 
-    table = [] if debug else None
-    iteration = 0
+    # Концевые точки: ближайший столбец и доля пикселя, покрытая отрезком (xgap)
+    xend1 = round_val(x0)
+    yend1 = y0 + gradient * (xend1 - x0)
+    xgap1 = rfpart(x0 + 0.5)
+    xend2 = round_val(x1)
+    yend2 = y1 + gradient * (xend2 - x1)
+    xgap2 = fpart(x1 + 0.5)
+    # Шаг i – столбец xend1 + i, последний шаг (inner + 1) – конечный столбец xend2
+    inner = max(xend2 - xend1 - 1, 0)
 
-    intery = y0 + gradient * (round_val(x0) - x0)
-    # Проходим по x от округленного начального значения до округленного конечного
-    for x in range(round_val(x0), round_val(x1)):
+    # Ограничиваем проход видимой частью отрезка (в координатах после перестановки осей)
+    xmin, ymin, xmax, ymax = raster.get_viewport(canvas)
+    if steep:
+        xmin, ymin, xmax, ymax = ymin, xmin, ymax, xmax
+    visible = clip_line(x0, y0, x1, y1, xmin - 1, ymin - 1, xmax + 1, ymax + 1)
+    if visible is None:
+        return table if debug else None
+    # Начало и конец сдвигаются только у отсечённых концов отрезка
+    first, last = 0, inner + 1
+    if visible[0] > 0:
+        first = max(math.ceil(x0 + visible[0] * dx) - xend1, 0)
+    if visible[1] < 1:
+        last = min(math.floor(x0 + visible[1] * dx) - xend1, inner + 1)
+
+    # Проходим по x от округленного начального значения до округленного конечного включительно
+    for iteration in range(first, last + 1):
+        if iteration == inner + 1:
+            x, intery, weight = xend2, yend2, xgap2
+        else:
+            x = xend1 + iteration
+            intery = yend1 + gradient * iteration
+            weight = xgap1 if iteration == 0 else 1.0
         y = ipart(intery)
-        # В данном алгоритме:
+        # В данном алгоритме (у концевых столбцов – с множителем xgap):
         # e   = rfpart(intery) – интенсивность для пикселя (x, y)
         # e′  = fpart(intery) – интенсивность для пикселя (x, y+1)
-        e = rfpart(intery)
-        e_prime = fpart(intery)
+        e = rfpart(intery) * weight
+        e_prime = fpart(intery) * weight
         displayed = (x, y)
         if debug:
-            table.append((iteration, x, y, e, e_prime, displayed))
-        draw_pixel(canvas, x, y, intensity=e)
-        draw_pixel(canvas, x, y + 1, intensity=e_prime)
-        intery += gradient
-        iteration += 1
+            table.add(iteration, x, y, e, e_prime, *displayed)
+        if steep:
+            # Возвращаем оси на место
+            draw_pixel(canvas, y, x, intensity=e)
+            draw_pixel(canvas, y + 1, x, intensity=e_prime)
+        else:
+            draw_pixel(canvas, x, y, intensity=e)
+            draw_pixel(canvas, x, y + 1, intensity=e_prime)
 
     return table if debug else None
+
+
+def _clip_parameters(x0, y0, x1, y1, viewport):
+    """
+    Векторизованный вариант clip_line для массивов отрезков (область расширена на пиксель).
+    Возвращает массивы (t0, t1); у невидимых отрезков t0 > t1.
+    """
+    xmin, ymin, xmax, ymax = viewport
+    xmin, ymin, xmax, ymax = xmin - 1, ymin - 1, xmax + 1, ymax + 1
+    dx, dy = x1 - x0, y1 - y0
+    t0 = np.zeros(len(x0))
+    t1 = np.ones(len(x0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for p, q in ((-dx, x0 - xmin), (dx, xmax - x0), (-dy, y0 - ymin), (dy, ymax - y0)):
+            t = q / p
+            t0 = np.where(p < 0, np.maximum(t0, t), t0)
+            t1 = np.where(p > 0, np.minimum(t1, t), t1)
+            t1 = np.where((p == 0) & (q < 0), -1.0, t1)
+    return t0, t1
+
+
+def _step_range(endpoints, steps, viewport):
+    """
+    Первый и последний шаг каждого отрезка внутри области вывода (или весь отрезок).
+    У невидимых отрезков (в том числе вырожденных в точку) last < first.
+    """
+    if viewport is None:
+        return np.zeros_like(steps), steps
+    t0, t1 = _clip_parameters(*endpoints.T, viewport)
+    first = np.maximum(np.ceil(t0 * steps), 0).astype(np.intp)
+    last = np.minimum(np.floor(t1 * steps), steps).astype(np.intp)
+    last = np.where(t0 > t1, first - 1, last)
+    return first, last
+
+
+def _line_pixel_index(counts, first=None):
+    """
+    Для набора отрезков с counts[k] пикселями возвращает массивы (номер отрезка, номер шага)
+    для каждого пикселя и смещения offsets: пиксели отрезка k лежат в [offsets[k], offsets[k+1]).
+    first – номер первого шага каждого отрезка (если перебор начинается не с нуля).
+    """
+    counts = np.maximum(counts, 0)
+    offsets = np.zeros(len(counts) + 1, dtype=np.intp)
+    np.cumsum(counts, out=offsets[1:])
+    line = np.repeat(np.arange(len(counts)), counts)
+    step = np.arange(offsets[-1]) - offsets[line]
+    if first is not None:
+        step += first[line]
+    return line, step, offsets
+
+
+def _accumulate(start, increment, counts, offsets):
+    """
+    Последовательные суммы start, start + inc, (start + inc) + inc, ... для каждого отрезка –
+    те же сложения в том же порядке, что и в цикле draw_line_dda, поэтому результат совпадает
+    с ним до бита. Отрезки группируются по длине (с точностью до степени двойки), и каждая
+    группа накапливается одним np.add.accumulate по строкам матрицы.
+    """
+    counts = np.maximum(counts, 0)
+    result = np.empty(offsets[-1])
+    group = np.frexp(counts)[1]
+    for g in np.unique(group[counts > 0]):
+        lines = np.flatnonzero(group == g)
+        width = counts[lines].max()
+        block = np.empty((len(lines), width))
+        block[:] = increment[lines, None]
+        block[:, 0] = start[lines]
+        np.add.accumulate(block, axis=1, out=block)
+        valid = np.arange(width) < counts[lines, None]
+        result[(offsets[lines, None] + np.arange(width))[valid]] = block[valid]
+    return result
+
+
+def _rasterize_dda(endpoints, viewport=None):
+    x0, y0, x1, y1 = endpoints.T
+    dx, dy = x1 - x0, y1 - y0
+    steps = np.maximum(np.abs(dx), np.abs(dy)).astype(np.intp)
+    first, last = _step_range(endpoints, steps, viewport)
+    line, step, offsets = _line_pixel_index(last - first + 1, first)
+    safe = np.maximum(steps, 1)
+    x_inc, y_inc = dx / safe, dy / safe
+    # Координаты накапливаются сложением приращений, начиная с первого видимого шага,
+    # как в draw_line_dda (x0 + i * приращение округлялось бы иначе на серединах пикселей)
+    x = _accumulate(x0 + first * x_inc, x_inc, last - first + 1, offsets)
+    y = _accumulate(y0 + first * y_inc, y_inc, last - first + 1, offsets)
+    xs = np.round(x).astype(np.intp)
+    ys = np.round(y).astype(np.intp)
+    return xs, ys, np.ones(len(xs)), offsets, (step, x, y, xs, ys), offsets
+
+
+def _rasterize_bresenham(endpoints, viewport=None):
+    endpoints = np.round(endpoints)
+    x0, y0, x1, y1 = endpoints.astype(np.intp).T
+    dx, dy = np.abs(x1 - x0), np.abs(y1 - y0)
+    sx = np.where(x0 < x1, 1, -1)
+    sy = np.where(y0 < y1, 1, -1)
+    major = np.maximum(dx, dy)
+    minor = np.minimum(dx, dy)
+    first, last = _step_range(endpoints, major, viewport)
+    line, step, offsets = _line_pixel_index(last - first + 1, first)
+    # Число шагов по второстепенной оси к шагу i (см. _bresenham_offsets)
+    two_major = 2 * np.maximum(major, 1)[line]
+    k = -((major[line] - 2 * step * minor[line]) // two_major)
+    x_major = dx[line] >= dy[line]
+    a = np.where(x_major, step, k)  # Сколько раз сдвинулись по x
+    b = np.where(x_major, k, step)  # Сколько раз сдвинулись по y
+    xs = x0[line] + sx[line] * a
+    ys = y0[line] + sy[line] * b
+    # Ошибка до (e) и после (e′) шага; на последнем шаге ошибка не меняется
+    err = dx[line] - dy[line] - a * dy[line] + b * dx[line]
+    err_next = np.empty_like(err)
+    if len(err):
+        err_next[:-1] = err[1:]
+        # Последние шаги только тех отрезков, у которых после отсечения остались пиксели
+        ends = offsets[1:][np.diff(offsets) > 0] - 1
+        err_next[ends] = err[ends]
+    return xs, ys, np.ones(len(xs)), offsets, (step, xs, ys, err, err_next, xs, ys), offsets
+
+
+def _rasterize_wu(endpoints, viewport=None):
+    """
+    Алгоритм Ву с обработкой концевых точек: интенсивность крайних столбцов
+    умножается на долю пикселя, покрытую отрезком (xgap), а последний столбец не теряется.
+    """
+    x0, y0, x1, y1 = endpoints.T.copy()
+    steep = np.abs(y1 - y0) > np.abs(x1 - x0)
+    x0[steep], y0[steep] = y0[steep], x0[steep].copy()
+    x1[steep], y1[steep] = y1[steep], x1[steep].copy()
+    back = x0 > x1
+    x0[back], x1[back] = x1[back], x0[back].copy()
+    y0[back], y1[back] = y1[back], y0[back].copy()
+    dx = x1 - x0
+    gradient = np.divide(y1 - y0, dx, out=np.ones_like(dx), where=dx != 0)
+
+    # Концевые точки: ближайший столбец и доля пикселя, покрытая отрезком
+    xend1 = np.floor(x0 + 0.5)
+    yend1 = y0 + gradient * (xend1 - x0)
+    xgap1 = 1 - (x0 + 0.5 - np.floor(x0 + 0.5))
+    xend2 = np.floor(x1 + 0.5)
+    yend2 = y1 + gradient * (xend2 - x1)
+    xgap2 = x1 + 0.5 - np.floor(x1 + 0.5)
+
+    inner = np.maximum(xend2 - xend1 - 1, 0).astype(np.intp)
+    first, last = np.zeros_like(inner), inner + 1
+    if viewport is not None:
+        # Отсечение в координатах после перестановки осей: шаг i – столбец xend1 + i
+        xmin, ymin, xmax, ymax = viewport
+        swapped = np.where(steep[:, None], (ymin, xmin, ymax, xmax), (xmin, ymin, xmax, ymax))
+        t0, t1 = _clip_parameters(x0, y0, x1, y1, swapped.T)
+        # Начало и конец сдвигаются только у отсечённых концов отрезка
+        first = np.where(t0 > 0, np.maximum(np.ceil(x0 + t0 * dx) - xend1, 0), 0).astype(np.intp)
+        last = np.where(t1 < 1, np.minimum(np.floor(x0 + t1 * dx) - xend1, inner + 1), inner + 1).astype(np.intp)
+        last = np.where(t0 > t1, -1, last)
+    line, step, offsets = _line_pixel_index(last - first + 1, first)
+    last = step == inner[line] + 1
+    x = np.where(last, xend2[line], xend1[line] + step).astype(np.intp)
+    intery = np.where(last, yend2[line], yend1[line] + gradient[line] * step)
+    weight = np.where(step == 0, xgap1[line], np.where(last, xgap2[line], 1.0))
+    y = np.floor(intery).astype(np.intp)
+    e_prime = (intery - y) * weight
+    e = (1 - (intery - y)) * weight
+    # Каждому шагу соответствуют два пикселя: (x, y) с интенсивностью e и (x, y + 1) с e′
+    major = np.stack((x, x), axis=1).ravel()
+    minor = np.stack((y, y + 1), axis=1).ravel()
+    intensity = np.stack((e, e_prime), axis=1).ravel()
+    is_steep = np.repeat(steep[line], 2)
+    xs = np.where(is_steep, minor, major)
+    ys = np.where(is_steep, major, minor)
+    return xs, ys, intensity, offsets * 2, (step, x, y, e, e_prime, x, y), offsets
+
+
+def rasterize_lines(endpoints, algorithm="bresenham", debug=False, viewport=None):
+    """
+    Растеризует сразу N отрезков векторизованно, без цикла интерпретатора по пикселям.
+
+    Параметры:
+      endpoints  - массив (N, 4) со строками (x0, y0, x1, y1).
+      algorithm  - "dda", "bresenham" или "wu".
+      debug      - если True, дополнительно возвращается список таблиц итераций
+                   (DebugTable, по одной на отрезок) в том же формате, что и у draw_line_*.
+      viewport   - область вывода (xmin, ymin, xmax, ymax); если задана, растеризуются
+                   только шаги, попадающие в неё (отсечение по Лиангу–Барски).
+
+    Возвращает (xs, ys, intensity, offsets) или (xs, ys, intensity, offsets, tables):
+      xs, ys     - целочисленные координаты пикселей всех отрезков подряд,
+      intensity  - интенсивность пикселей (для ЦДА и Брезенхэма – единицы),
+      offsets    - массив длины N + 1: пиксели отрезка k – срез [offsets[k]:offsets[k+1]].
+
+    Для алгоритма Ву каждому шагу соответствуют два пикселя, концевые столбцы учитывают
+    долю покрытия пикселя, а крутые отрезки возвращаются в исходных (не переставленных) координатах.
+    """
+    endpoints = np.asarray(endpoints, dtype=float).reshape(-1, 4)
+    rasterizers = {"dda": _rasterize_dda, "bresenham": _rasterize_bresenham, "wu": _rasterize_wu}
+    rasterize = rasterizers.get(algorithm.lower())
+    if rasterize is None:
+        raise ValueError(f"Неизвестный алгоритм: {algorithm}")
+    xs, ys, intensity, offsets, columns, row_offsets = rasterize(endpoints, viewport)
+    if not debug:
+        return xs, ys, intensity, offsets
+
+    # Таблицы итераций – столбцовые срезы одной общей таблицы (без создания кортежей строк)
+    layout = DDA_COLUMNS if len(columns) == 5 else LINE_COLUMNS
+    table = DebugTable.from_arrays(layout, **dict(zip(field_names(layout), columns)))
+    tables = [table[row_offsets[k]:row_offsets[k + 1]] for k in range(len(endpoints))]
+    return xs, ys, intensity, offsets, tables
+
+
+def draw_lines(canvas, endpoints, algorithm="bresenham"):
+    """
+    Рисует сразу N отрезков (например, рёбра каркасной модели или триангуляции),
+    растеризуя их функцией rasterize_lines.
+    """
+    xs, ys, intensity, offsets = rasterize_lines(endpoints, algorithm, viewport=raster.get_viewport(canvas))
+    if raster.get_backend() == raster.BACKEND_FRAMEBUFFER:
+        if algorithm.lower() == "wu":
+            raster.composite(canvas, xs, ys, intensity, "max")
+        else:
+            raster.put_pixels(canvas, xs, ys, intensity)
+        return
+    if algorithm.lower() == "wu":
+        for x, y, e in zip(xs.tolist(), ys.tolist(), intensity.tolist()):
+            draw_pixel(canvas, x, y, intensity=e)
+        return
+    xs, ys = xs.tolist(), ys.tolist()
+    for k in range(len(offsets) - 1):
+        writer = SpanWriter(canvas)
+        for i in range(offsets[k], offsets[k + 1]):
+            writer.add(xs[i], ys[i])
+        writer.flush()
+
+
+def polyline_pixels(vertices, viewport=None):
+    """
+    Пиксели ломаной с вершинами vertices (N, 2) в порядке обхода: вершины округляются,
+    звенья растеризуются алгоритмом Брезенхэма (rasterize_lines), повторяющиеся пиксели
+    (общие вершины соседних звеньев, совпавшие вершины, самопересечения) выбрасываются.
+    Получается 8-связная цепочка, длина которой близка к длине ломаной в пикселях.
+    """
+    vertices = np.rint(np.asarray(vertices, dtype=float)).reshape(-1, 2)
+    if len(vertices) == 1:
+        vertices = np.vstack([vertices, vertices])
+    if len(vertices) == 0:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    xs, ys, _, _ = rasterize_lines(np.hstack([vertices[:-1], vertices[1:]]), "bresenham", viewport=viewport)
+    _, first = np.unique(np.column_stack([xs, ys]), axis=0, return_index=True)
+    first.sort()
+    return xs[first], ys[first]
+
+
+def draw_polyline(canvas, vertices):
+    """
+    Рисует ломаную через точки кривой (см. polyline_pixels): в буфер кадра – одной записью,
+    элементами канвы – рядами пикселей (SpanWriter).
+    """
+    draw_polylines(canvas, [vertices])
+
+
+def draw_polylines(canvas, polylines):
+    """Рисует несколько ломаных; пиксели, общие для нескольких ломаных, рисуются один раз."""
+    viewport = raster.get_viewport(canvas)
+    chains = [polyline_pixels(vertices, viewport) for vertices in polylines]
+    xs = np.concatenate([chain[0] for chain in chains])
+    ys = np.concatenate([chain[1] for chain in chains])
+    if len(chains) > 1:
+        _, first = np.unique(np.column_stack([xs, ys]), axis=0, return_index=True)
+        first.sort()
+        xs, ys = xs[first], ys[first]
+    if raster.get_backend() == raster.BACKEND_FRAMEBUFFER:
+        raster.put_pixels(canvas, xs, ys)
+        return
+    writer = SpanWriter(canvas)
+    for x, y in zip(xs.tolist(), ys.tolist()):
+        writer.add(x, y)
+    writer.flush()
@@ -0,0 +1,300 @@
+"""
+Замеры скорости алгоритмов растеризации (intervals.py, lines_second_order.py, curves.py).
+
+Каждый алгоритм запускается на наборе параметров (длина и октант отрезка, радиусы окружности
+и эллипса, размеры параболы и гиперболы, число опорных точек и шаг dt кривых) на канве
+без окна (headless.HeadlessCanvas). Для каждого случая фиксируются:
+  - seconds            – лучшее время построения из repeat запусков,
+  - pixels             – число закрашенных пикселей итогового изображения,
+  - pixels_per_second  – pixels / seconds,
+  - items              – число элементов, созданных на канве,
+  - debug_rows         – число строк отладочной таблицы (debug=True),
+  - debug_peak_bytes   – прирост пикового объёма памяти при построении с отладочной таблицей,
+  - duplicates         – для функций lines_second_order.py: число повторных записей пикселей,
+                         отброшенных выходной стадией (lines_second_order.get_pixel_stats).
+Группа samples замеряет только вычисление точек кривых (без отрисовки) прямым способом
+и методом прямых разностей: seconds, samples (число точек) и samples_per_second.
+Результаты сохраняются в JSON, чтобы сравнивать запуски между собой.
+
+Запуск:
+    python benchmark.py -o results.json
+    python benchmark.py --quick --backend framebuffer --compare results.json
+"""
+import argparse
+import json
+import math
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+import curves
+import intervals
+import lines_second_order
+import raster
+from headless import HeadlessCanvas
+
+CANVAS_SIZE = 2048
+CENTER = CANVAS_SIZE // 2
+
+
+def line_cases(quick):
+    """Отрезки из центра канвы: по одному направлению в каждом октанте."""
+    lengths = [50, 400] if quick else [50, 200, 800]
+    for algorithm, draw in (("dda", intervals.draw_line_dda),
+                            ("bresenham", intervals.draw_line_bresenham),
+                            ("wu", intervals.draw_line_wu)):
+        for length in lengths:
+            for octant in range(8):
+                angle = math.radians(22.5 + 45 * octant)
+                x1 = CENTER + int(round(length * math.cos(angle)))
+                y1 = CENTER + int(round(length * math.sin(angle)))
+                yield ("line", algorithm, {"length": length, "octant": octant},
+                       draw, (CENTER, CENTER, x1, y1))
+
+
+def conic_cases(quick):
+    radii = [10, 100, 500] if quick else [10, 50, 200, 500, 1000]
+    for r in radii:
+        yield "conic", "circle", {"radius": r}, lines_second_order.draw_circle, (CENTER, CENTER, r)
+        yield ("conic", "circle", {"radius": r, "filled": True},
+               lines_second_order.draw_circle, (CENTER, CENTER, r), {"filled": True})
+        yield ("conic", "circle", {"radius": r, "antialiased": True},
+               lines_second_order.draw_circle, (CENTER, CENTER, r), {"antialiased": True})
+    for r in radii:
+        for ratio in (0.25, 4.0):
+            ry = min(max(1, int(r * ratio)), CENTER - 1)
+            yield ("conic", "ellipse", {"rx": r, "ry": ry},
+                   lines_second_order.draw_ellipse, (CENTER, CENTER, r, ry))
+        yield ("conic", "ellipse", {"rx": r, "ry": max(1, r // 2), "filled": True},
+               lines_second_order.draw_ellipse, (CENTER, CENTER, r, max(1, r // 2)), {"filled": True})
+    # Дуги в 45°: перебираются только шаги октантов (четвертей), через которые проходит дуга
+    for r in radii:
+        yield ("conic", "arc", {"radius": r, "extent": 45},
+               lines_second_order.draw_arc, (CENTER, CENTER, r, r, 30, 75))
+        ry = min(max(1, int(r * 0.25)), CENTER - 1)
+        yield ("conic", "arc", {"rx": r, "ry": ry, "extent": 45},
+               lines_second_order.draw_arc, (CENTER, CENTER, r, ry, 30, 75))
+    # Те же окружности и эллипсы как рациональные квадратичные NURBS (curves.draw_nurbs_ellipse)
+    for r in radii:
+        yield "conic", "nurbs_circle", {"radius": r}, curves.draw_nurbs_circle, (CENTER, CENTER, r)
+        ry = min(max(1, int(r * 0.25)), CENTER - 1)
+        yield ("conic", "nurbs_ellipse", {"rx": r, "ry": ry},
+               curves.draw_nurbs_ellipse, (CENTER, CENTER, r, ry))
+    # Повёрнутые эллипсы и гиперболы – кривая общего вида по прямым развёртки (draw_conic)
+    for r in radii:
+        ry = min(max(1, int(r * 0.25)), CENTER - 1)
+        yield ("conic", "conic_ellipse", {"rx": r, "ry": ry, "angle": 30},
+               lines_second_order.draw_conic, lines_second_order.conic_ellipse(CENTER, CENTER, r, ry, 30))
+    for semi_axis in ([20, 200] if quick else [10, 50, 200]):
+        yield ("conic", "conic_hyperbola", {"semi_axis": semi_axis, "angle": 30},
+               lines_second_order.draw_conic,
+               lines_second_order.conic_hyperbola(CENTER, CENTER, semi_axis, semi_axis // 2, 30))
+    for extent in ([20, 200] if quick else [10, 50, 200, 800]):
+        yield ("conic", "parabola", {"extent": extent},
+               lines_second_order.draw_parabola, (CENTER, CENTER, CENTER + extent, CENTER + extent))
+    for semi_axis in ([20, 200] if quick else [10, 50, 200]):
+        for direction in ("horizontal", "vertical"):
+            yield ("conic", "hyperbola", {"semi_axis": semi_axis, "direction": direction},
+                   lines_second_order.draw_hyperbola,
+                   (CENTER, CENTER, CENTER + semi_axis, CENTER + semi_axis // 2, direction))
+
+
+def curve_cases(quick):
+    steps = [0.01] if quick else [0.01, 0.001]
+    p1, p2, p3, p4 = (200, 1500), (600, 200), (1400, 1800), (1800, 400)
+    for dt in steps:
+        yield ("curve", "hermite", {"dt": dt}, curves.draw_hermite,
+               (p1, p4, (p2[0] - p1[0], p2[1] - p1[1]), (p4[0] - p3[0], p4[1] - p3[1])), {"dt": dt})
+        yield "curve", "bezier", {"dt": dt}, curves.draw_bezier, (p1, p2, p3, p4), {"dt": dt}
+    # Адаптивное разбиение: число вершин зависит от длины кривой, а не от dt
+    yield ("curve", "hermite", {"method": "adaptive"}, curves.draw_hermite,
+           (p1, p4, (p2[0] - p1[0], p2[1] - p1[1]), (p4[0] - p3[0], p4[1] - p3[1])), {"method": "adaptive"})
+    yield "curve", "bezier", {"method": "adaptive"}, curves.draw_bezier, (p1, p2, p3, p4), {"method": "adaptive"}
+    rng = np.random.default_rng(0)
+    for count in ([4, 32] if quick else [4, 16, 64]):
+        points = [tuple(int(v) for v in p) for p in rng.integers(100, CANVAS_SIZE - 100, size=(count, 2))]
+        for dt in steps:
+            yield ("curve", "bspline", {"control_points": count, "dt": dt},
+                   curves.draw_bspline, (points,), {"dt": dt})
+        yield ("curve", "bspline", {"control_points": count, "method": "adaptive"},
+               curves.draw_bspline, (points,), {"method": "adaptive"})
+
+
+def sample_cases(quick):
+    """Вычисление точек кривых без отрисовки: прямой способ и прямые разности."""
+    steps = [0.01, 0.001] if quick else [0.01, 0.001, 0.0001]
+    p1, p2, p3, p4 = (200, 1500), (600, 200), (1400, 1800), (1800, 400)
+    r1, r4 = (p2[0] - p1[0], p2[1] - p1[1]), (p4[0] - p3[0], p4[1] - p3[1])
+    for dt in steps:
+        for method in curves.SAMPLE_METHODS:
+            yield ("samples", "hermite", {"method": method, "dt": dt},
+                   curves.hermite_samples, (p1, p4, r1, r4, dt, method))
+            yield ("samples", "bezier", {"method": method, "dt": dt},
+                   curves.bezier_samples, (p1, p2, p3, p4, dt, method))
+            yield ("samples", "bspline", {"method": method, "dt": dt},
+                   curves.bspline_segment, (p1, p2, p3, p4, dt, method))
+
+
+def measure_samples(evaluate, args, repeat):
+    """Лучшее время вычисления точек кривой и их число."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = evaluate(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(result[0])
+
+
+def painted_pixels(canvas):
+    """Число пикселей изображения, отличающихся от фона."""
+    return int(np.count_nonzero((canvas.render() != 255).any(axis=2)))
+
+
+def measure(draw, args, kwargs, repeat):
+    """Лучшее время построения, число элементов и пикселей на канве."""
+    best = None
+    canvas = None
+    for _ in range(repeat):
+        canvas = HeadlessCanvas(CANVAS_SIZE, CANVAS_SIZE)
+        start = time.perf_counter()
+        draw(canvas, *args, **kwargs)
+        # Отложенный вывод буфера кадра – часть построения
+        canvas.update_idletasks()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(canvas.find_all()), painted_pixels(canvas)
+
+
+def traced_peak(draw, args, kwargs):
+    """Результат построения и пиковый объём выделенной при нём памяти (байт)."""
+    canvas = HeadlessCanvas(CANVAS_SIZE, CANVAS_SIZE)
+    tracemalloc.start()
+    result = draw(canvas, *args, **kwargs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak
+
+
+def measure_debug(draw, args, kwargs):
+    """
+    Число строк отладочной таблицы и пиковый объём памяти, который она добавляет
+    к построению без отладки (память элементов канвы и буфера кадра не учитывается).
+    """
+    _, plain_peak = traced_peak(draw, args, kwargs)
+    table, debug_peak = traced_peak(draw, args, dict(kwargs, debug=True))
+    return len(table) if table is not None else 0, max(debug_peak - plain_peak, 0)
+
+
+def measure_duplicates(draw, args, kwargs):
+    """Число повторов пикселей, отброшенных выходной стадией lines_second_order (иначе None)."""
+    if draw.__module__ != lines_second_order.__name__:
+        return None
+    lines_second_order.reset_pixel_stats()
+    draw(HeadlessCanvas(CANVAS_SIZE, CANVAS_SIZE), *args, **kwargs)
+    return lines_second_order.get_pixel_stats()["duplicates"]
+
+
+def run(quick=False, repeat=3, groups=("line", "conic", "curve")):
+    results = []
+    sources = {"line": line_cases, "conic": conic_cases, "curve": curve_cases, "samples": sample_cases}
+    for group in groups:
+        for case in sources[group](quick):
+            group_name, name, params, draw, args = case[:5]
+            kwargs = case[5] if len(case) > 5 else {}
+            if group_name == "samples":
+                seconds, samples = measure_samples(draw, args, repeat)
+                results.append({
+                    "group": group_name,
+                    "name": name,
+                    "params": params,
+                    "seconds": seconds,
+                    "samples": samples,
+                    "samples_per_second": samples / seconds if seconds > 0 else None,
+                })
+                print(f"{group_name:7} {name:10} {json.dumps(params, ensure_ascii=False):45} "
+                      f"{seconds * 1000:9.3f} мс {samples:8} точек {samples / seconds:14.0f} точек/с")
+                continue
+            seconds, items, pixels = measure(draw, args, kwargs, repeat)
+            debug_rows, debug_peak = measure_debug(draw, args, kwargs)
+            duplicates = measure_duplicates(draw, args, kwargs)
+            results.append({
+                "group": group_name,
+                "name": name,
+                "params": params,
+                "seconds": seconds,
+                "pixels": pixels,
+                "pixels_per_second": pixels / seconds if seconds > 0 else None,
+                "items": items,
+                "debug_rows": debug_rows,
+                "debug_peak_bytes": debug_peak,
+                "duplicates": duplicates,
+            })
+            line = (f"{group_name:6} {name:15} {json.dumps(params, ensure_ascii=False):45} "
+                    f"{seconds * 1000:9.2f} мс {pixels:8} пикс. {items:8} эл.")
+            if duplicates is not None:
+                line += f" {duplicates:6} повт."
+            print(line)
+    return results
+
+
+def case_key(result):
+    return result["group"], result["name"], json.dumps(result["params"], sort_keys=True)
+
+
+def compare(results, baseline_path):
+    """Выводит ускорение относительно ранее сохранённого запуска."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {case_key(r): r for r in json.load(f)["results"]}
+    print(f"\nСравнение с {baseline_path} (ускорение = старое время / новое время):")
+    for result in results:
+        old = baseline.get(case_key(result))
+        if old is None or not result["seconds"]:
+            continue
+        line = (f"{result['group']:6} {result['name']:10} {json.dumps(result['params'], ensure_ascii=False):45} "
+                f"x{old['seconds'] / result['seconds']:7.2f}")
+        if "debug_peak_bytes" in result:
+            line += f"  память отладки: {old['debug_peak_bytes']} -> {result['debug_peak_bytes']} байт"
+        if result.get("duplicates") is not None and old.get("duplicates") is not None:
+            line += f"  повторы: {old['duplicates']} -> {result['duplicates']}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замеры скорости алгоритмов растеризации")
+    parser.add_argument("-o", "--output", default="benchmark_results.json", help="файл для результатов (JSON)")
+    parser.add_argument("--repeat", type=int, default=3, help="число повторов каждого случая")
+    parser.add_argument("--quick", action="store_true", help="сокращённый набор параметров")
+    parser.add_argument("--backend", choices=[raster.BACKEND_TK, raster.BACKEND_FRAMEBUFFER],
+                        default=raster.BACKEND_TK, help="способ вывода пикселей")
+    parser.add_argument("--group", action="append", choices=["line", "conic", "curve", "samples"],
+                        help="замерять только указанные группы (можно указать несколько раз)")
+    parser.add_argument("--compare", help="JSON предыдущего запуска для сравнения")
+    options = parser.parse_args()
+
+    raster.set_backend(options.backend)
+    results = run(options.quick, options.repeat, options.group or ("line", "conic", "curve", "samples"))
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "backend": options.backend,
+            "repeat": options.repeat,
+            "quick": options.quick,
+            "canvas_size": CANVAS_SIZE,
+        },
+        "results": results,
+    }
+    with open(options.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Результаты сохранены в {options.output}")
+    if options.compare:
+        compare(results, options.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,20 @@
+import functools
 import math
-from intervals import draw_pixel
+import numpy as np
+import raster
+from intervals import SpanWriter, draw_pixel, draw_polyline, draw_polylines, polyline_pixels
+from debug_table import DebugTable, CURVE_COLUMNS
 
+# Матрица равномерного кубического B-сплайна (без множителя 1/6)
+BSPLINE_MATRIX = [
+    [-1, 3, -3, 1],
+    [3, -6, 3, 0],
+    [-3, 0, 3, 0],
+    [1, 4, 1, 0]
+]
 
-def draw_hermite(canvas, p1, p4, r1, r4, dt=0.01, debug=False):
+
+def draw_hermite(canvas, p1, p4, r1, r4, dt=0.01, debug=False, method="direct", tolerance=0.5):
     """
     Рисует кривую методом интерполяции Эрмита.
 
@@ -11,6 +23,8 @@ def draw_hermite(canvas, p1, p4, r1, r4, dt=0.01, debug=False):
       • r1, r4 – касательные (векторы) в точках p1 и p4
       • dt – шаг изменения параметра t (по умолчанию 0.01)
       • debug – если True, функция возвращает таблицу отладки
+      • method – способ вычисления точек: "direct", "forward" или "adaptive" (см. hermite_samples)
+      • tolerance – допустимое отклонение ломаной от кривой в пикселях (для method="adaptive")
 
     Эрмитовы базисные функции:
       h00(t) = 2t³ − 3t² + 1
@@ -18,9 +32,27 @@ def draw_hermite(canvas, p1, p4, r1, r4, dt=0.01, debug=False):
       h01(t) = −2t³ + 3t²
       h11(t) = t³ − t²
     """
-    table = [] if debug else None
+    ts, points = hermite_samples(p1, p4, r1, r4, dt, method, tolerance)
+    return _draw_samples(canvas, ts, points, debug)
+
+
+def hermite_samples(p1, p4, r1, r4, dt=0.01, method="direct", tolerance=0.5):
+    """
+    Точки кривой Эрмита для t = 0, dt, 2dt, ... ≤ 1 без отрисовки.
+    Возвращает массив значений t и массив точек формы (N, 2).
+
+      method="direct"   – каждая точка вычисляется по базисным функциям;
+      method="forward"  – прямые разности (forward_difference);
+      method="adaptive" – вершины ломаной, отклоняющейся от кривой не более чем на tolerance
+                          пикселей (кривая переводится в форму Безье, см. bezier_flatten); dt не используется.
+    """
+    if method == "forward":
+        return forward_difference(hermite_coefficients(p1, p4, r1, r4), dt)
+    if method == "adaptive":
+        return _adaptive_samples(hermite_to_bezier(p1, p4, r1, r4), tolerance)
+    _check_method(method)
+    ts, points = [], []
     t = 0.0
-    step = 0
     while t <= 1.0:
         h00 = 2 * t ** 3 - 3 * t ** 2 + 1
         h10 = t ** 3 - 2 * t ** 2 + t
@@ -29,21 +61,13 @@ def draw_hermite(canvas, p1, p4, r1, r4, dt=0.01, debug=False):
 
         x = h00 * p1[0] + h10 * r1[0] + h01 * p4[0] + h11 * r4[0]
         y = h00 * p1[1] + h10 * r1[1] + h01 * p4[1] + h11 * r4[1]
-
-        # Отрисовка вычисленной точки
-        draw_pixel(canvas, int(round(x)), int(round(y)))
-
-        if debug:
-            pixel = (int(round(x)), int(round(y)))
-            # Здесь поля di, δ и di+1 не вычисляются – заполняем нулями
-            table.append((step, t, 0.0, 0.0, pixel, x, y, 0.0, pixel))
-
-        step += 1
+        ts.append(t)
+        points.append((x, y))
         t += dt
-    return table if debug else None
+    return np.array(ts), np.array(points, dtype=float).reshape(-1, 2)
 
 
-def draw_bezier(canvas, p1, p2, p3, p4, dt=0.01, debug=False):
+def draw_bezier(canvas, p1, p2, p3, p4, dt=0.01, debug=False, method="direct", tolerance=0.5):
     """
     Рисует кубическую кривую Безье по имеющимся четырем контрольным точкам.
 
@@ -54,13 +78,28 @@ def draw_bezier(canvas, p1, p2, p3, p4, dt=0.01, debug=False):
       • p1, p2, p3, p4 – контрольные точки (каждая как кортеж (x, y))
       • dt – шаг изменения параметра t (по умолчанию 0.01)
       • debug – если True, возвращается таблица отладки
+      • method – способ вычисления точек: "direct", "forward" или "adaptive" (см. hermite_samples)
+      • tolerance – допустимое отклонение ломаной от кривой в пикселях (для method="adaptive")
 
     Если debug=True, для каждой итерации возвращается запись:
        (шаг, t, 0.0, 0.0, пиксель, x, y, 0.0, пиксель)
     """
-    table = [] if debug else None
+    ts, points = bezier_samples(p1, p2, p3, p4, dt, method, tolerance)
+    return _draw_samples(canvas, ts, points, debug)
+
+
+def bezier_samples(p1, p2, p3, p4, dt=0.01, method="direct", tolerance=0.5):
+    """
+    Точки кривой Безье для t = 0, dt, 2dt, ... ≤ 1 без отрисовки.
+    Возвращает массив значений t и массив точек формы (N, 2); method – как в hermite_samples.
+    """
+    if method == "forward":
+        return forward_difference(bezier_coefficients(p1, p2, p3, p4), dt)
+    if method == "adaptive":
+        return _adaptive_samples((p1, p2, p3, p4), tolerance)
+    _check_method(method)
+    ts, points = [], []
     t = 0.0
-    step = 0
     while t <= 1.0:
         one_minus_t = 1 - t
         x = (one_minus_t ** 3 * p1[0] +
@@ -71,19 +110,13 @@ def draw_bezier(canvas, p1, p2, p3, p4, dt=0.01, debug=False):
              3 * t * (one_minus_t ** 2) * p2[1] +
              3 * t ** 2 * one_minus_t * p3[1] +
              t ** 3 * p4[1])
-
-        draw_pixel(canvas, int(round(x)), int(round(y)))
-
-        if debug:
-            pixel = (int(round(x)), int(round(y)))
-            table.append((step, t, 0.0, 0.0, pixel, x, y, 0.0, pixel))
-
-        step += 1
+        ts.append(t)
+        points.append((x, y))
         t += dt
-    return table if debug else None
+    return np.array(ts), np.array(points, dtype=float).reshape(-1, 2)
 
 
-def draw_bspline(canvas, points, dt=0.01, debug=False):
+def draw_bspline(canvas, points, dt=0.01, debug=False, method="direct", tolerance=0.5):
     """
     Рисует равномерный кубический B-сплайн по заданному набору контрольных точек.
 
@@ -91,6 +124,8 @@ def draw_bspline(canvas, points, dt=0.01, debug=False):
       • points – список контрольных точек (каждая точка – кортеж (x, y)); должно быть не менее 4 точек.
       • dt – шаг изменения параметра t (по умолчанию 0.01)
       • debug – если True, возвращается таблица отладки
+      • method – способ вычисления точек сегментов: "direct", "forward" или "adaptive" (см. bspline_segment)
+      • tolerance – допустимое отклонение ломаной от кривой в пикселях (для method="adaptive")
 
     Для каждой группы из 4 подряд идущих точек (p0, p1, p2, p3) вычисляется сегмент по формуле:
 
@@ -109,37 +144,600 @@ def draw_bspline(canvas, points, dt=0.01, debug=False):
     if len(points) < 4:
         raise ValueError("Для построения B-сплайна требуется минимум 4 контрольные точки.")
 
-    # Определяем матрицу B-сплайна
-    M = [
-        [-1, 3, -3, 1],
-        [3, -6, 3, 0],
-        [-3, 0, 3, 0],
-        [1, 4, 1, 0]
-    ]
-    table = [] if debug else None
-    step = 0
-    # Для каждого сегмента (группы из 4 точек)
-    for i in range(len(points) - 3):
-        p0, p1, p2, p3 = points[i], points[i + 1], points[i + 2], points[i + 3]
-        Gx = [p0[0], p1[0], p2[0], p3[0]]
-        Gy = [p0[1], p1[1], p2[1], p3[1]]
-        t = 0.0
-        while t <= 1.0:
-            T_vec = [t ** 3, t ** 2, t, 1]
-            # Вычисляем промежуточный вектор A = T_vec * M
-            A = [0.0, 0.0, 0.0, 0.0]
-            for j in range(4):
-                for k in range(4):
-                    A[j] += T_vec[k] * M[k][j]
-            # Вычисляем координаты, затем делим на 6 согласно формуле
-            x = sum(A[j] * Gx[j] for j in range(4)) / 6.0
-            y = sum(A[j] * Gy[j] for j in range(4)) / 6.0
-
-            draw_pixel(canvas, int(round(x)), int(round(y)))
-
-            if debug:
-                pixel = (int(round(x)), int(round(y)))
-                table.append((step, t, 0.0, 0.0, pixel, x, y, 0.0, pixel))
-            step += 1
-            t += dt
+    if method == "adaptive":
+        # Ломаные сегментов соединяются в одну: первая вершина сегмента совпадает с последней предыдущего
+        ts, xs, ys = zip(*(bspline_segment(*points[i:i + 4], method=method, tolerance=tolerance)
+                           for i in range(len(points) - 3)))
+        ts = np.concatenate([ts[0]] + [t[1:] + i for i, t in enumerate(ts[1:], start=1)])
+        vertices = np.column_stack([np.concatenate([xs[0]] + [x[1:] for x in xs[1:]]),
+                                    np.concatenate([ys[0]] + [y[1:] for y in ys[1:]])])
+        return _draw_samples(canvas, ts, vertices, debug)
+
+    if method == "forward":
+        segments = [bspline_segment(*points[i:i + 4], dt=dt, method=method) for i in range(len(points) - 3)]
+        ts = np.concatenate([t for t, _, _ in segments])
+        samples = np.column_stack([np.concatenate([x for _, x, _ in segments]),
+                                   np.concatenate([y for _, _, y in segments])])
+    else:
+        _check_method(method)
+        # Все сегменты вычисляются одним матричным произведением (см. bspline_points)
+        ts = np.tile(parameter_values(dt), len(points) - 3)
+        samples = bspline_points(points, dt)
+    table = _draw_samples(canvas, ts, samples, debug)
     return table if debug else None
+
+
+def bspline_segment(p0, p1, p2, p3, dt=0.01, method="direct", tolerance=0.5):
+    """
+    Точки одного сегмента B-сплайна с опорными точками p0..p3 для t = 0, dt, 2dt, ... ≤ 1.
+    Возвращает три массива NumPy: значения t, x и y; method – как в hermite_samples.
+    """
+    if method in ("forward", "adaptive"):
+        if method == "forward":
+            ts, samples = forward_difference(bspline_coefficients(p0, p1, p2, p3), dt)
+        else:
+            ts, samples = _adaptive_samples(bspline_to_bezier(p0, p1, p2, p3), tolerance)
+        return ts, samples[:, 0], samples[:, 1]
+    _check_method(method)
+    samples = bspline_basis(dt) @ np.array([p0, p1, p2, p3], dtype=float)
+    return parameter_values(dt), samples[:, 0], samples[:, 1]
+
+
+@functools.lru_cache(maxsize=None)
+def bspline_basis(dt):
+    """
+    Таблица базиса T(t)·M/6 для t = 0, dt, 2dt, ... ≤ 1 – массив формы (K, 4),
+    где T(t) = [t³, t², t, 1]. Вычисляется один раз для каждого dt и затем берётся из кэша.
+    """
+    ts = parameter_values(dt)
+    powers = np.column_stack([ts ** 3, ts ** 2, ts, np.ones_like(ts)])
+    basis = powers @ np.array(BSPLINE_MATRIX, dtype=float) / 6.0
+    basis.setflags(write=False)
+    return basis
+
+
+def bspline_points(points, dt=0.01):
+    """
+    Точки всего B-сплайна – массив формы (N, 2), N = (число точек − 3) · K.
+
+    Окна из 4 подряд идущих опорных точек складываются в массив G формы (сегменты, 4, 2),
+    и все сегменты вычисляются одним умножением таблицы базиса (K, 4) на G.
+    """
+    points = np.asarray(points, dtype=float)
+    windows = points[np.arange(len(points) - 3)[:, None] + np.arange(4)]
+    return (bspline_basis(dt) @ windows).reshape(-1, 2)
+
+
+class BSplineCache:
+    """
+    B-сплайн, перерисовываемый по сегментам.
+
+    Точка равномерного кубического B-сплайна влияет только на четыре соседних сегмента,
+    поэтому кэш хранит пиксели каждого сегмента вместе с его опорными точками и при вызове
+    update(points) пересчитывает и перерисовывает лишь сегменты, у которых изменились
+    опорные точки. Перетаскивание точки сплайна из 200 точек обходится так же дёшево,
+    как и сплайна из 5 точек.
+
+    Пиксели рисуются в группу tag (raster.group), каждый сегмент – во вложенную группу
+    "<tag>_segment_<номер>". В режиме буфера кадра у сегментов нет своих слоёв: пиксели
+    старого сегмента стираются из слоя кривой, а совпавшие с ними пиксели
+    неизменившихся сегментов рисуются заново.
+    """
+
+    def __init__(self, canvas, tag, dt=0.01, method="direct", tolerance=0.5):
+        self.canvas = canvas
+        self.tag = tag
+        self.dt = dt
+        self.method = method        # Способ вычисления точек сегментов (см. bspline_segment)
+        self.tolerance = tolerance
+        self.segments = []  # Для каждого сегмента: (опорные точки, x пикселей, y пикселей)
+
+    def segment_tag(self, index):
+        return f"{self.tag}_segment_{index}"
+
+    def update(self, points):
+        """Перерисовывает изменившиеся сегменты; возвращает их число."""
+        points = [tuple(p) for p in points]
+        count = max(len(points) - 3, 0)
+        changed = [i for i in range(count)
+                   if i >= len(self.segments) or self.segments[i][0] != tuple(points[i:i + 4])]
+        stale = [i for i in changed if i < len(self.segments)] + list(range(count, len(self.segments)))
+        self._erase(stale, set(changed))
+        del self.segments[count:]
+        for i in changed:
+            _, xs, ys = bspline_segment(*points[i:i + 4], dt=self.dt, method=self.method,
+                                        tolerance=self.tolerance)
+            # Точки сегмента соединяются в 8-связную цепочку пикселей без повторов; конечная точка
+            # сегмента (t = 1, начало следующего) добавляется, чтобы соседние цепочки сомкнулись
+            end = bspline_basis(self.dt)[0] @ np.array(points[i + 1:i + 4] + [(0, 0)], dtype=float)
+            xs, ys = polyline_pixels(np.vstack([np.column_stack([xs, ys]), end]))
+            segment = (tuple(points[i:i + 4]), xs.astype(np.int64), ys.astype(np.int64))
+            if i < len(self.segments):
+                self.segments[i] = segment
+            else:
+                self.segments.append(segment)
+            self._plot(i, segment[1], segment[2])
+        return len(changed)
+
+    def clear(self):
+        """Удаляет все пиксели кривой."""
+        raster.delete_group(self.canvas, self.tag)
+        self.segments = []
+
+    def _plot(self, index, xs, ys):
+        with raster.group(self.tag), raster.group(self.segment_tag(index)):
+            if raster.get_backend() == raster.BACKEND_FRAMEBUFFER:
+                raster.put_pixels(self.canvas, xs, ys)
+            else:
+                writer = SpanWriter(self.canvas)
+                for x, y in zip(xs.tolist(), ys.tolist()):
+                    writer.add(x, y)
+                writer.flush()
+
+    def _erase(self, stale, changed):
+        if not stale:
+            return
+        if raster.get_backend() != raster.BACKEND_FRAMEBUFFER:
+            for i in stale:
+                self.canvas.delete(self.segment_tag(i))
+            return
+        xs = np.concatenate([self.segments[i][1] for i in stale])
+        ys = np.concatenate([self.segments[i][2] for i in stale])
+        with raster.group(self.tag):
+            raster.put_pixels(self.canvas, xs, ys, 0)
+        # Неизменившиеся сегменты могли проходить через стёртые пиксели
+        kept = [i for i in range(len(self.segments)) if i not in changed and i not in stale]
+        if kept:
+            erased = self._pixel_keys(xs, ys)
+            erased = erased[erased >= 0]
+            for i in kept:
+                _, kx, ky = self.segments[i]
+                keys = self._pixel_keys(kx, ky)
+                hit = (keys >= 0) & np.isin(keys, erased)
+                if hit.any():
+                    self._plot(i, kx[hit], ky[hit])
+
+    def _pixel_keys(self, xs, ys):
+        """Номера пикселей внутри области вывода (строка за строкой); у пикселей вне её -1."""
+        xmin, ymin, xmax, ymax = raster.get_viewport(self.canvas)
+        inside = (xs >= xmin) & (xs <= xmax) & (ys >= ymin) & (ys <= ymax)
+        return np.where(inside, (ys - ymin) * (xmax - xmin + 1) + (xs - xmin), -1)
+
+
+# --- Прямые разности ---
+#
+# Кубическая кривая записывается в степенном базисе P(t) = a·t³ + b·t² + c·t + d
+# (a, b, c, d – векторы (x, y)). При постоянном шаге dt третья разность постоянна,
+# поэтому после вычисления начальных разностей каждая следующая точка получается
+# тремя сложениями:
+#   P += Δ;  Δ += Δ²;  Δ² += Δ³.
+
+SAMPLE_METHODS = ("direct", "forward")
+
+
+def _check_method(method):
+    if method not in SAMPLE_METHODS + ("adaptive",):
+        raise ValueError(f"Неизвестный способ вычисления точек кривой: {method}")
+
+
+def hermite_coefficients(p1, p4, r1, r4):
+    """Коэффициенты (a, b, c, d) кривой Эрмита в степенном базисе – массив формы (4, 2)."""
+    p1, p4, r1, r4 = (np.asarray(v, dtype=float) for v in (p1, p4, r1, r4))
+    return np.array([2 * p1 - 2 * p4 + r1 + r4,
+                     -3 * p1 + 3 * p4 - 2 * r1 - r4,
+                     r1,
+                     p1])
+
+
+def bezier_coefficients(p1, p2, p3, p4):
+    """Коэффициенты (a, b, c, d) кривой Безье в степенном базисе – массив формы (4, 2)."""
+    p1, p2, p3, p4 = (np.asarray(v, dtype=float) for v in (p1, p2, p3, p4))
+    return np.array([-p1 + 3 * p2 - 3 * p3 + p4,
+                     3 * p1 - 6 * p2 + 3 * p3,
+                     -3 * p1 + 3 * p2,
+                     p1])
+
+
+def bspline_coefficients(p0, p1, p2, p3):
+    """Коэффициенты (a, b, c, d) сегмента B-сплайна: M·G / 6 – массив формы (4, 2)."""
+    return np.array(BSPLINE_MATRIX, dtype=float) @ np.array([p0, p1, p2, p3], dtype=float) / 6.0
+
+
+@functools.lru_cache(maxsize=None)
+def parameter_values(dt):
+    """
+    Значения t = 0, dt, 2dt, ... ≤ 1, накопленные сложением, как в циклах прямого вычисления.
+    Запоминаются для каждого dt; массив доступен только для чтения.
+    """
+    ts = []
+    t = 0.0
+    while t <= 1.0:
+        ts.append(t)
+        t += dt
+    ts = np.array(ts)
+    ts.setflags(write=False)
+    return ts
+
+
+def sample_count(dt):
+    """Число значений t = 0, dt, 2dt, ... ≤ 1."""
+    return len(parameter_values(dt))
+
+
+def forward_difference(coefficients, dt=0.01):
+    """
+    Точки кубической кривой с коэффициентами (a, b, c, d) методом прямых разностей.
+    Возвращает массив значений t и массив точек формы (N, 2).
+
+    Начальные разности:
+      Δ  = a·dt³ + b·dt² + c·dt
+      Δ² = 6a·dt³ + 2b·dt²
+      Δ³ = 6a·dt³
+    Последовательные сложения выполняются накопленными суммами (np.cumsum) –
+    это те же три сложения на точку, но без цикла Python.
+    """
+    a, b, c, d = np.asarray(coefficients, dtype=float)
+    count = sample_count(dt)
+    delta3 = 6 * a * dt ** 3
+    delta2 = 6 * a * dt ** 3 + 2 * b * dt ** 2
+    delta1 = a * dt ** 3 + b * dt ** 2 + c * dt
+    # Δ²_k = Δ² + k·Δ³,  Δ_k = Δ + ΣΔ²,  P_k = d + ΣΔ
+    second = np.cumsum(np.vstack([delta2, np.broadcast_to(delta3, (max(count - 3, 0), 2))]), axis=0)
+    first = np.cumsum(np.vstack([delta1, second]), axis=0)
+    points = np.cumsum(np.vstack([d, first]), axis=0)[:count]
+    return np.arange(count) * dt, points
+
+
+def _draw_samples(canvas, ts, points, debug):
+    """
+    Рисует кривую по её точкам: соседние точки соединяются отрезками Брезенхэма,
+    повторяющиеся пиксели выбрасываются (intervals.draw_polyline). Быстрые участки кривой
+    не оставляют разрывов, а медленные не рисуют один пиксель многократно.
+    При debug=True возвращает таблицу отладки: (шаг, t, 0.0, 0.0, пиксель, x, y, 0.0, пиксель)
+    для каждой вычисленной точки.
+    """
+    draw_polyline(canvas, points)
+    if not debug:
+        return None
+    pixels = np.rint(points).astype(np.int64)
+    # Здесь поля di, δ и di+1 не вычисляются – заполняем нулями
+    return DebugTable.from_arrays(CURVE_COLUMNS, step=np.arange(len(ts)), di=ts,
+                                  pixel_x=pixels[:, 0], pixel_y=pixels[:, 1],
+                                  x=points[:, 0], y=points[:, 1],
+                                  plot_x=pixels[:, 0], plot_y=pixels[:, 1])
+
+
+# --- Адаптивное разбиение (алгоритм де Кастельжо) ---
+
+def hermite_to_bezier(p1, p4, r1, r4):
+    """Опорные точки кривой Безье, совпадающей с кривой Эрмита: (p1, p1 + r1/3, p4 − r4/3, p4)."""
+    return (tuple(p1), (p1[0] + r1[0] / 3, p1[1] + r1[1] / 3),
+            (p4[0] - r4[0] / 3, p4[1] - r4[1] / 3), tuple(p4))
+
+
+def bspline_to_bezier(p0, p1, p2, p3):
+    """Опорные точки кривой Безье, совпадающей с сегментом B-сплайна."""
+    return (((p0[0] + 4 * p1[0] + p2[0]) / 6, (p0[1] + 4 * p1[1] + p2[1]) / 6),
+            ((2 * p1[0] + p2[0]) / 3, (2 * p1[1] + p2[1]) / 3),
+            ((p1[0] + 2 * p2[0]) / 3, (p1[1] + 2 * p2[1]) / 3),
+            ((p1[0] + 4 * p2[0] + p3[0]) / 6, (p1[1] + 4 * p2[1] + p3[1]) / 6))
+
+
+def _distance_to_chord(p, a, d):
+    """Расстояние от точки p до отрезка (хорды) ad."""
+    dx, dy = d[0] - a[0], d[1] - a[1]
+    length2 = dx * dx + dy * dy
+    u = 0.0 if length2 == 0 else max(0.0, min(1.0, ((p[0] - a[0]) * dx + (p[1] - a[1]) * dy) / length2))
+    return math.hypot(p[0] - a[0] - u * dx, p[1] - a[1] - u * dy)
+
+
+def bezier_flatten(p1, p2, p3, p4, tolerance=0.5, max_depth=16, max_vertices=None):
+    """
+    Адаптивное разбиение кубической кривой Безье на ломаную.
+
+    Кривая делится пополам (алгоритм де Кастельжо), пока внутренние опорные точки
+    отстоят от хорды больше чем на tolerance пикселей: кривая лежит внутри выпуклой
+    оболочки опорных точек, поэтому такая часть отличается от своей хорды не более
+    чем на tolerance. Число вершин растёт с длиной и кривизной кривой на экране,
+    а не задаётся шагом dt.
+
+    max_vertices – сколько вершин заведомо достаточно (например, ArcLengthTable.sample_bound):
+    глубина деления ограничивается так, чтобы 2^max_depth участков давали не меньше
+    max_vertices вершин, то есть вершин получается меньше 2·max_vertices, даже если
+    tolerance слишком мал для экрана.
+
+    Возвращает массив значений t вершин и массив вершин формы (N, 2).
+    """
+    if max_vertices is not None:
+        max_depth = min(max_depth, max(1, math.ceil(math.log2(max(max_vertices - 1, 1)))))
+    ts = [0.0]
+    vertices = [tuple(map(float, p1))]
+    stack = [(0.0, 1.0, tuple(map(float, p1)), tuple(map(float, p2)),
+              tuple(map(float, p3)), tuple(map(float, p4)), 0)]
+    while stack:
+        t0, t1, a, b, c, d, depth = stack.pop()
+        if depth >= max_depth or max(_distance_to_chord(b, a, d), _distance_to_chord(c, a, d)) <= tolerance:
+            ts.append(t1)
+            vertices.append(d)
+            continue
+        ab = ((a[0] + b[0]) / 2, (a[1] + b[1]) / 2)
+        bc = ((b[0] + c[0]) / 2, (b[1] + c[1]) / 2)
+        cd = ((c[0] + d[0]) / 2, (c[1] + d[1]) / 2)
+        abc = ((ab[0] + bc[0]) / 2, (ab[1] + bc[1]) / 2)
+        bcd = ((bc[0] + cd[0]) / 2, (bc[1] + cd[1]) / 2)
+        middle = ((abc[0] + bcd[0]) / 2, (abc[1] + bcd[1]) / 2)
+        tm = (t0 + t1) / 2
+        # Правая половина кладётся в стек первой, чтобы вершины шли по возрастанию t
+        stack.append((tm, t1, middle, bcd, cd, d, depth + 1))
+        stack.append((t0, tm, a, ab, abc, middle, depth + 1))
+    return np.array(ts), np.array(vertices)
+
+
+def _adaptive_samples(control, tolerance):
+    """Адаптивное разбиение кривой Безье с числом вершин, ограниченным оценкой по длине дуги."""
+    bound = arc_length_table("bezier", control).sample_bound()
+    return bezier_flatten(*control, tolerance=tolerance, max_vertices=bound)
+
+
+# --- B-сплайны произвольной степени и NURBS (алгоритм де Бура) ---
+
+def uniform_knots(count, degree):
+    """Равномерный вектор узлов 0, 1, ..., count + degree для count опорных точек."""
+    return np.arange(count + degree + 1, dtype=float)
+
+
+def clamped_knots(count, degree):
+    """
+    Зажатый вектор узлов: крайние узлы повторяются degree + 1 раз, поэтому кривая
+    начинается в первой опорной точке и заканчивается в последней. Узлы лежат в [0, 1].
+    """
+    inner = np.linspace(0.0, 1.0, count - degree + 1)
+    return np.concatenate([np.zeros(degree), inner, np.ones(degree)])
+
+
+def de_boor(points, degree, knots, ts, weights=None):
+    """
+    Точки B-сплайна (NURBS, если заданы веса) степени degree для массива параметров ts.
+
+    Входные параметры:
+      • points – опорные точки (n, 2)
+      • degree – степень кривой p (n ≥ p + 1)
+      • knots – неубывающий вектор узлов длины n + p + 1
+      • ts – массив значений параметра из [knots[p], knots[n]]
+      • weights – веса опорных точек (по умолчанию все равны 1 – обычный B-сплайн)
+
+    Алгоритм де Бура выполняется сразу для всех значений ts: для каждого t находится
+    промежуток узлов [u_k, u_k+1), берутся p + 1 опорных точек, влияющих на него,
+    и p раз заменяются соседние точки их линейной комбинацией. Рациональная кривая
+    вычисляется в однородных координатах (w·x, w·y, w) с делением на w в конце.
+    Возвращает массив точек формы (len(ts), 2).
+    """
+    points = np.asarray(points, dtype=float)
+    knots = np.asarray(knots, dtype=float)
+    ts = np.asarray(ts, dtype=float)
+    count = len(points)
+    if count < degree + 1:
+        raise ValueError(f"Для кривой степени {degree} требуется минимум {degree + 1} опорных точек.")
+    if len(knots) != count + degree + 1:
+        raise ValueError(f"Вектор узлов должен содержать {count + degree + 1} значений.")
+    weights = np.ones(count) if weights is None else np.asarray(weights, dtype=float)
+    homogeneous = np.column_stack([points * weights[:, None], weights])
+
+    # Номер промежутка узлов для каждого t; правый конец области относится к последнему промежутку
+    spans = np.clip(np.searchsorted(knots, ts, side="right") - 1, degree, count - 1)
+    d = homogeneous[spans[:, None] - degree + np.arange(degree + 1)]   # (N, p + 1, 3)
+    for r in range(1, degree + 1):
+        for j in range(degree, r - 1, -1):
+            left = knots[spans + j - degree]
+            right = knots[spans + j + 1 - r]
+            span = right - left
+            alpha = np.divide(ts - left, span, out=np.zeros_like(ts), where=span != 0)[:, None]
+            d[:, j] = (1 - alpha) * d[:, j - 1] + alpha * d[:, j]
+    return d[:, degree, :2] / d[:, degree, 2:]
+
+
+def nurbs_samples(points, degree=3, knots=None, weights=None, dt=0.01):
+    """
+    Точки кривой с шагом параметра dt на каждом ненулевом промежутке узлов.
+    Возвращает массив значений t и массив точек формы (N, 2).
+    По умолчанию используется равномерный вектор узлов (для degree=3 кривая совпадает с draw_bspline).
+    """
+    knots = uniform_knots(len(points), degree) if knots is None else np.asarray(knots, dtype=float)
+    domain = knots[degree:len(points) + 1]
+    ts = [np.array([domain[0]])]
+    for u0, u1 in zip(domain[:-1], domain[1:]):
+        if u1 > u0:
+            ts.append(u0 + (u1 - u0) * np.linspace(0.0, 1.0, max(int(round(1 / dt)), 1) + 1)[1:])
+    ts = np.concatenate(ts)
+    return ts, de_boor(points, degree, knots, ts, weights)
+
+
+def draw_nurbs(canvas, points, degree=3, knots=None, weights=None, dt=0.01, debug=False):
+    """
+    Рисует B-сплайн произвольной степени с неравномерным вектором узлов и весами (NURBS).
+
+    Входные параметры:
+      • points, degree, knots, weights – как в de_boor (knots=None – равномерный вектор узлов)
+      • dt – шаг параметра на каждом промежутке узлов
+      • debug – если True, возвращается таблица отладки (шаг, t, 0.0, 0.0, пиксель, x, y, 0.0, пиксель)
+    """
+    ts, samples = nurbs_samples(points, degree, knots, weights, dt)
+    table = _draw_samples(canvas, ts, samples, debug)
+    return table if debug else None
+
+
+# Квадратичная NURBS-окружность из четырёх дуг по 90°: опорные точки на единичном квадрате
+# (углы квадрата имеют вес √2/2), каждая вершина квадрата повторяет узел дважды
+CIRCLE_POINTS = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0))
+CIRCLE_WEIGHTS = (1, math.sqrt(2) / 2, 1, math.sqrt(2) / 2, 1, math.sqrt(2) / 2, 1, math.sqrt(2) / 2, 1)
+CIRCLE_KNOTS = (0, 0, 0, 0.25, 0.25, 0.5, 0.5, 0.75, 0.75, 1, 1, 1)
+
+
+def nurbs_ellipse(cx, cy, rx, ry):
+    """Опорные точки, веса и узлы квадратичной NURBS, точно совпадающей с эллипсом."""
+    points = [(cx + rx * x, cy + ry * y) for x, y in CIRCLE_POINTS]
+    return points, CIRCLE_WEIGHTS, CIRCLE_KNOTS
+
+
+def chord_pixels(vertices):
+    """
+    Пиксели ломаной без округления вершин: на каждом звене для каждого целого значения
+    ведущей координаты (той, по которой звено длиннее) берётся ближайший пиксель по второй.
+    Если звенья короче кривизны кривой, получается тот же пиксель в каждом столбце
+    (строке), что и у алгоритма средней точки.
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    xs, ys = [], []
+    for (x0, y0), (x1, y1) in zip(vertices[:-1].tolist(), vertices[1:].tolist()):
+        dx, dy = x1 - x0, y1 - y0
+        if abs(dx) >= abs(dy):
+            lo, hi = min(x0, x1), max(x0, x1)
+            major = np.arange(math.ceil(lo - 0.5), math.floor(hi + 0.5) + 1)
+            minor = np.rint(y0 + (major - x0) * dy / dx) if dx else np.full(len(major), round(y0))
+            xs.append(major)
+            ys.append(minor)
+        else:
+            lo, hi = min(y0, y1), max(y0, y1)
+            major = np.arange(math.ceil(lo - 0.5), math.floor(hi + 0.5) + 1)
+            xs.append(np.rint(x0 + (major - y0) * dx / dy))
+            ys.append(major)
+    if not xs:
+        return np.rint(vertices[:, 0]).astype(np.int64), np.rint(vertices[:, 1]).astype(np.int64)
+    pixels = np.unique(np.column_stack([np.concatenate(xs), np.concatenate(ys)]).astype(np.int64), axis=0)
+    return pixels[:, 0], pixels[:, 1]
+
+
+def draw_nurbs_ellipse(canvas, cx, cy, rx, ry, debug=False):
+    """
+    Рисует эллипс (при rx == ry – окружность) как рациональную квадратичную NURBS.
+
+    Кривая вычисляется в 4·(rx + ry) точках (звенья короче пикселя) и выводится функцией
+    chord_pixels, поэтому результат попиксельно сравним с lines_second_order.draw_ellipse
+    и draw_circle: расхождения возможны лишь в отдельных пикселях у диагоналей (45°).
+    Если debug=True, возвращается таблица отладки по вычисленным точкам кривой.
+    """
+    points, weights, knots = nurbs_ellipse(cx, cy, rx, ry)
+    ts = np.linspace(0.0, 1.0, max(4 * int(rx + ry), 8) + 1)
+    samples = de_boor(points, 2, knots, ts, weights)
+    xs, ys = chord_pixels(samples)
+    if raster.get_backend() == raster.BACKEND_FRAMEBUFFER:
+        raster.put_pixels(canvas, xs, ys)
+    else:
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            draw_pixel(canvas, x, y)
+    if debug:
+        table = DebugTable(CURVE_COLUMNS)
+        for step, (t, (x, y)) in enumerate(zip(ts.tolist(), samples.tolist())):
+            pixel = (int(round(x)), int(round(y)))
+            table.add(step, t, 0.0, 0.0, *pixel, x, y, 0.0, *pixel)
+        return table
+    return None
+
+
+def draw_nurbs_circle(canvas, cx, cy, r, debug=False):
+    """Рисует окружность как рациональную квадратичную NURBS (см. draw_nurbs_ellipse)."""
+    return draw_nurbs_ellipse(canvas, cx, cy, r, r, debug)
+
+
+# --- Параметризация длиной дуги ---
+
+class ArcLengthTable:
+    """
+    Таблица накопленной длины дуги кривой.
+
+    Кривая вычисляется в samples + 1 равноотстоящих значениях параметра t ∈ [t0, t1];
+    lengths[i] – длина ломаной через первые i + 1 точки. По таблице двоичным поиском
+    (O(log n) на запрос) находится параметр точки, отстоящей от начала кривой на расстояние s,
+    поэтому точки можно расставлять равномерно по длине, а не по t.
+
+    evaluate – функция, вычисляющая точки кривой (массив (N, 2)) для массива значений t.
+    """
+
+    def __init__(self, evaluate, t0=0.0, t1=1.0, samples=256):
+        self.evaluate = evaluate
+        self.ts = np.linspace(t0, t1, samples + 1)
+        points = evaluate(self.ts)
+        self.lengths = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(points, axis=0).T))])
+
+    @property
+    def length(self):
+        """Длина кривой."""
+        return float(self.lengths[-1])
+
+    def sample_bound(self):
+        """
+        Верхняя оценка числа пикселей (и вершин ломаной), нужных для вывода кривой без разрывов:
+        в 8-связной цепочке на каждый пиксель приходится не меньше единицы длины.
+        """
+        return int(math.ceil(self.length)) + 1
+
+    def parameter_at(self, s):
+        """Значение параметра t точки на расстоянии s от начала кривой (s – число или массив)."""
+        s = np.clip(np.asarray(s, dtype=float), 0.0, self.length)
+        i = np.clip(np.searchsorted(self.lengths, s, side="right") - 1, 0, len(self.ts) - 2)
+        step = self.lengths[i + 1] - self.lengths[i]
+        u = np.divide(s - self.lengths[i], step, out=np.zeros_like(s), where=step > 0)
+        return self.ts[i] + u * (self.ts[i + 1] - self.ts[i])
+
+    def point_at(self, s):
+        """Точки кривой на расстояниях s от начала: массив (N, 2) (для числа s – (1, 2))."""
+        return self.evaluate(np.atleast_1d(self.parameter_at(s)))
+
+    def sample_by_distance(self, spacing):
+        """
+        Точки кривой через каждые spacing пикселей длины (последняя – конец кривой).
+        Возвращает массив расстояний и массив точек (N, 2).
+        """
+        distances = np.append(np.arange(0.0, self.length, spacing), self.length)
+        return distances, self.point_at(distances)
+
+    def dashes(self, dash, gap, spacing=1.0):
+        """
+        Штрихи длиной dash с промежутками gap вдоль кривой: список ломаных (массивов (k, 2)),
+        точки каждой ломаной отстоят друг от друга не более чем на spacing пикселей.
+        """
+        polylines = []
+        for start in np.arange(0.0, self.length, dash + gap):
+            stop = min(start + dash, self.length)
+            polylines.append(self.point_at(np.append(np.arange(start, stop, spacing), stop)))
+        return polylines
+
+
+def _polynomial_curve(coefficients):
+    """Функция вычисления точек кубической кривой с коэффициентами (a, b, c, d) по схеме Горнера."""
+    a, b, c, d = np.asarray(coefficients, dtype=float)
+    return lambda ts: ((np.outer(ts, a) + b) * ts[:, None] + c) * ts[:, None] + d
+
+
+@functools.lru_cache(maxsize=64)
+def _arc_length_table(kind, points, samples):
+    if kind == "hermite":
+        return ArcLengthTable(_polynomial_curve(hermite_coefficients(*points)), samples=samples)
+    if kind == "bezier":
+        return ArcLengthTable(_polynomial_curve(bezier_coefficients(*points)), samples=samples)
+    if kind == "bspline":
+        if len(points) < 4:
+            raise ValueError("Для построения B-сплайна требуется минимум 4 контрольные точки.")
+        # Параметр t ∈ [0, число сегментов]: сегменту i соответствует t ∈ [i, i + 1]
+        knots = uniform_knots(len(points), 3)
+        segments = len(points) - 3
+        return ArcLengthTable(lambda ts: de_boor(points, 3, knots, ts + 3), 0.0, segments, samples * segments)
+    raise ValueError(f"Неизвестный вид кривой: {kind}")
+
+
+def arc_length_table(kind, points, samples=64):
+    """
+    Таблица длины дуги (ArcLengthTable) кривой; для одинаковых кривых берётся из кэша.
+
+      kind="hermite" – points = (p1, p4, r1, r4), параметр t ∈ [0, 1];
+      kind="bezier"  – points = (p1, p2, p3, p4), параметр t ∈ [0, 1];
+      kind="bspline" – points – опорные точки, параметр t ∈ [0, число сегментов].
+    samples – число участков таблицы на кривую (для B-сплайна – на сегмент).
+    """
+    key = tuple(tuple(float(v) for v in p) for p in points)
+    return _arc_length_table(kind, key, samples)
+
+
+def draw_dashed(canvas, table, dash=8, gap=4):
+    """Рисует кривую с таблицей длины дуги table штриховой линией (штрихи равной длины вдоль кривой)."""
+    draw_polylines(canvas, table.dashes(dash, gap))
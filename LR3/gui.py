@@ -1,5 +1,9 @@
 import tkinter as tk
 import math
+import time
+import raster
+from debug_table import HEADERS, format_header, format_row
+from debug_view import DebugTableView
 from intervals import draw_line_dda, draw_line_bresenham, draw_line_wu
 
 class GraphicEditorApp:
@@ -14,10 +18,12 @@ class GraphicEditorApp:
         self.selected_curve_type_title = "Не выбран"    # Текущая кривая (название)
         self.selected_curve_type = None                 # Кривая не выбрана
         self.curve_control_points = []
+        self.bspline_caches = {}                        # Кэш сегментов B-сплайнов: тег кривой -> BSplineCache
         self.selected_curve_form_title = "Не выбран"    # Текущая форма для построения кривой
         self.selected_curve_form = None                 # Форма кривой не выбрана
         self.debug_mode = False                         # Режим отладки отключён
         self.start_point = None
+        self.pending_preview = None                     # Отложенное обновление предварительного вида
         self.init_gui()
 
     def init_gui(self):
@@ -35,6 +41,23 @@ class GraphicEditorApp:
         file_menu.add_command(label="Выход", command=self.root.quit)
         menubar.add_cascade(label="Файл", menu=file_menu)
 
+        # Меню "Вывод" – способ вывода пикселей на канву
+        self.raster_backend = tk.StringVar(value=raster.get_backend())
+        output_menu = tk.Menu(menubar, tearoff=0)
+        output_menu.add_radiobutton(label="Элементы канвы Tk", variable=self.raster_backend,
+                                    value=raster.BACKEND_TK, command=self.select_raster_backend)
+        output_menu.add_radiobutton(label="Буфер кадра NumPy", variable=self.raster_backend,
+                                    value=raster.BACKEND_FRAMEBUFFER, command=self.select_raster_backend)
+        # Способ вычисления точек кривых Эрмита, Безье и B-сплайна
+        self.curve_method = tk.StringVar(value="direct")
+        output_menu.add_separator()
+        for label, method in (("Кривые: шаг dt", "direct"),
+                              ("Кривые: прямые разности", "forward"),
+                              ("Кривые: адаптивное разбиение", "adaptive")):
+            output_menu.add_radiobutton(label=label, variable=self.curve_method, value=method,
+                                        command=self.select_curve_method)
+        menubar.add_cascade(label="Вывод", menu=output_menu)
+
         # Меню "Помощь"
         help_menu = tk.Menu(menubar, tearoff=0)
         help_menu.add_command(label="Документация", command=self.show_help)
@@ -62,9 +85,14 @@ class GraphicEditorApp:
         self.lines_second_order_menu_button = tk.Menubutton(self.toolbar, text="Линии 2-го порядка", relief=tk.RAISED)
         self.lines_second_order = tk.Menu(self.lines_second_order_menu_button, tearoff=0)
         self.lines_second_order.add_command(label="Окружность", command=lambda: self.select_lines_second_order_with_type("circle"))
+        self.lines_second_order.add_command(label="Круг", command=lambda: self.select_lines_second_order_with_type("circle_filled"))
+        self.lines_second_order.add_command(label="Окружность (сглаживание)",
+                                            command=lambda: self.select_lines_second_order_with_type("circle_antialiased"))
         self.lines_second_order.add_command(label="Эллипс", command=lambda: self.select_lines_second_order_with_type("ellipse"))
         self.lines_second_order.add_command(label="Гипербола", command=lambda: self.select_lines_second_order_with_type("hyperbola"))
         self.lines_second_order.add_command(label="Парабола", command=lambda: self.select_lines_second_order_with_type("parabola"))
+        self.lines_second_order.add_command(label="Парабола (горизонтальная ось)",
+                                            command=lambda: self.select_lines_second_order_with_type("parabola_horizontal"))
         self.lines_second_order_menu_button.config(menu=self.lines_second_order)
         self.lines_second_order_menu_button.pack(side=tk.LEFT, padx=2, pady=2)
 
@@ -93,6 +121,11 @@ class GraphicEditorApp:
         self.status_bar = tk.Label(self.root, textvariable=self.status_var,
                                    bd=1, relief=tk.SUNKEN, anchor=tk.W)
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        # Строка статистики: число элементов канвы и время последней отрисовки
+        self.stats_var = tk.StringVar()
+        self.stats_bar = tk.Label(self.root, textvariable=self.stats_var,
+                                  bd=1, relief=tk.SUNKEN, anchor=tk.W)
+        self.stats_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
     def update_status(self, mode, is_error=False):
         self.current_mode = mode
@@ -103,6 +136,35 @@ class GraphicEditorApp:
             self.status_bar.config(fg="black")
             self.status_var.set(f"История: {self.current_mode}")
 
+    def select_raster_backend(self):
+        """Переключает способ вывода пикселей: отдельные элементы канвы или буфер кадра NumPy."""
+        raster.set_backend(self.raster_backend.get())
+        if raster.get_backend() == raster.BACKEND_FRAMEBUFFER:
+            self.update_status("Вывод: буфер кадра NumPy (одно изображение на кадр).")
+        else:
+            self.update_status("Вывод: элементы канвы Tk (элемент на каждый пиксель).")
+
+    def select_curve_method(self):
+        titles = {"direct": "точки с постоянным шагом dt",
+                  "forward": "точки с шагом dt методом прямых разностей",
+                  "adaptive": "адаптивное разбиение де Кастельжо (ломаная с отклонением до 0.5 пикселя)"}
+        self.update_status(f"Кривые: {titles[self.curve_method.get()]}.")
+        if self.curve_control_points:
+            self.update_curve()
+
+    def timed_draw(self, draw, *args, **kwargs):
+        """
+        Вызывает функцию построения и выводит число элементов канвы и время отрисовки
+        (вместе с выводом буфера кадра), чтобы сравнивать способы вывода.
+        """
+        start = time.perf_counter()
+        result = draw(*args, **kwargs)
+        raster.present(self.canvas)
+        self.canvas.update_idletasks()
+        elapsed = (time.perf_counter() - start) * 1000
+        self.stats_var.set(f"Элементов на канве: {len(self.canvas.find_all())} | Отрисовка: {elapsed:.1f} мс")
+        return result
+
     def show_help(self):
         try:
             with open("documentation.txt", "r", encoding="utf-8") as f:
@@ -215,18 +277,21 @@ class GraphicEditorApp:
         self.selected_curve_type = curve_type
         titles = {
             "circle": "Окружность",
+            "circle_filled": "Круг",
+            "circle_antialiased": "Окружность (сглаживание)",
             "ellipse": "Эллипс",
             "hyperbola": "Гипербола",
-            "parabola": "Парабола"
+            "parabola": "Парабола",
+            "parabola_horizontal": "Парабола (горизонтальная ось)"
         }
         self.selected_curve_type_title = titles.get(curve_type, "Не выбран")
         self.update_status(f"{self.selected_curve_type_title} выбран. Выберите первую точку.")
         self.start_point = None
-        if curve_type == "circle":
+        if curve_type in ("circle", "circle_filled", "circle_antialiased"):
             self.canvas.bind("<Motion>", self.on_circle_motion)
         elif curve_type == "ellipse":
             self.canvas.bind("<Motion>", self.on_ellipse_motion)
-        elif curve_type == "parabola":
+        elif curve_type in ("parabola", "parabola_horizontal"):
             self.canvas.bind("<Motion>", self.on_parabola_motion)
         elif curve_type == "hyperbola":
             self.canvas.bind("<Motion>", self.on_hyperbola_motion)
@@ -248,8 +313,9 @@ class GraphicEditorApp:
         self.selected_curve_form_title = titles.get(curve_type, "Не выбран")
         self.update_status(f"{self.selected_curve_form_title} выбран. Теперь размещайте опорные точки кликом.")
         self.start_point = None
-        # Добавляем новую запись: (список точек, список отрисованных объектов, форма)
-        self.curve_control_points.append(([], [], self.selected_curve_form))
+        # Добавляем новую запись: (список точек, тег группы отрисованных пикселей, форма)
+        tag = f"curve_{len(self.curve_control_points)}"
+        self.curve_control_points.append(([], tag, self.selected_curve_form))
         self.canvas.unbind("<Motion>")
         self.canvas.unbind("<Button-1>")
         self.canvas.bind("<Button-1>", self.handle_curve_click)
@@ -290,7 +356,7 @@ class GraphicEditorApp:
                 self.canvas.delete("preview_line")
                 x0, y0 = self.start_point
                 x1, y1 = event.x, event.y
-                table = self.selected_algorithm(self.canvas, x0, y0, x1, y1, debug=True)
+                table = self.timed_draw(self.selected_algorithm, self.canvas, x0, y0, x1, y1, debug=True)
                 self.show_debug_table(table)
                 self.update_status(f"Отладка ({self.selected_algorithm_title}): линия от ({x0}, {y0}) до ({x1}, {y1}) построена.")
                 self.start_point = None
@@ -304,16 +370,53 @@ class GraphicEditorApp:
                 self.canvas.delete("preview_line")
                 x0, y0 = self.start_point
                 x1, y1 = event.x, event.y
-                self.selected_algorithm(self.canvas, x0, y0, x1, y1)
+                self.timed_draw(self.selected_algorithm, self.canvas, x0, y0, x1, y1)
                 self.update_status(f"Линия: построен отрезок: ({x0}, {y0}) -> ({x1}, {y1}).")
                 self.start_point = None
 
+    # Предварительный вид фигур при движении мыши
+    def schedule_preview(self, update, event):
+        """
+        Откладывает обновление предварительного вида до простоя цикла событий (after_idle):
+        из серии событий <Motion>, пришедших между кадрами, обрабатывается только последнее,
+        поэтому предварительный вид перерисовывается не чаще одного раза за кадр.
+        """
+        scheduled = self.pending_preview is not None
+        self.pending_preview = (update, event.x, event.y)
+        if not scheduled:
+            self.root.after_idle(self.flush_preview)
+
+    def flush_preview(self):
+        update, x, y = self.pending_preview
+        self.pending_preview = None
+        update(x, y)
+
+    def set_preview(self, tag, kind, *paths):
+        """
+        Показывает предварительный вид с тегом tag: по элементу kind ("line" или "oval") на каждый
+        список координат из paths. Уже показанные элементы перемещаются через canvas.coords,
+        новые создаются только при первом показе (или если изменилось число элементов).
+        """
+        items = self.canvas.find_withtag(tag)
+        if len(items) != len(paths):
+            self.canvas.delete(tag)
+            for coords in paths:
+                if kind == "oval":
+                    self.canvas.create_oval(*coords, outline="gray", dash=(2, 2), tags=tag)
+                else:
+                    self.canvas.create_line(*coords, fill="gray", dash=(2, 2), tags=tag)
+            return
+        for item, coords in zip(items, paths):
+            self.canvas.coords(item, *coords)
+
     def on_line_motion(self, event):
+        self.schedule_preview(self.update_line_preview, event)
+
+    def update_line_preview(self, x, y):
         if self.start_point is None:
             return
-        self.canvas.delete("preview_line")
         x0, y0 = self.start_point
-        self.canvas.create_line(x0, y0, event.x, event.y, fill="gray", dash=(2, 2), tags="preview_line")
+        self.set_preview("preview_line", "line", (x0, y0, x, y))
 
     def handle_lines_second_order_click(self, event):
         if self.start_point is None:
@@ -328,25 +431,28 @@ class GraphicEditorApp:
 
             from lines_second_order import draw_circle, draw_ellipse, draw_parabola, draw_hyperbola
 
-            if self.selected_curve_type == "circle":
-                # Вычисляем радиус и рисуем окружность
+            if self.selected_curve_type in ("circle", "circle_filled", "circle_antialiased"):
+                # Вычисляем радиус и рисуем окружность (круг, сглаженную окружность)
                 r = int(math.sqrt((x1 - x0) ** 2 + (y1 - y0) ** 2))
-                table = draw_circle(self.canvas, x0, y0, r, debug=self.debug_mode)
-                self.update_status(f"Окружность построена. Центр: ({x0}, {y0}), радиус: {r}.")
+                table = self.timed_draw(draw_circle, self.canvas, x0, y0, r, debug=self.debug_mode,
+                                        filled=self.selected_curve_type == "circle_filled",
+                                        antialiased=self.selected_curve_type == "circle_antialiased")
+                self.update_status(f"{self.selected_curve_type_title}: построение завершено. Центр: ({x0}, {y0}), радиус: {r}.")
             elif self.selected_curve_type == "ellipse":
                 # Вычисляем полуоси и рисуем эллипс
                 rx = abs(x1 - x0)
                 ry = abs(y1 - y0)
-                table = draw_ellipse(self.canvas, x0, y0, rx, ry, debug=self.debug_mode)
+                table = self.timed_draw(draw_ellipse, self.canvas, x0, y0, rx, ry, debug=self.debug_mode)
                 self.update_status(f"Эллипс построен. Центр: ({x0}, {y0}), полуоси: rx={rx}, ry={ry}.")
-            elif self.selected_curve_type == "parabola":
+            elif self.selected_curve_type in ("parabola", "parabola_horizontal"):
                 # Передаём вершину и вторую точку
-                table = draw_parabola(self.canvas, x0, y0, x1, y1, debug=self.debug_mode)
+                axis = "horizontal" if self.selected_curve_type == "parabola_horizontal" else "vertical"
+                table = self.timed_draw(draw_parabola, self.canvas, x0, y0, x1, y1, debug=self.debug_mode, axis=axis)
                 self.update_status(f"Парабола построена. Вершина: ({x0}, {y0}), вторая точка: ({x1}, {y1}).")
             elif self.selected_curve_type == "hyperbola":
                 # Определяем направление и рисуем гиперболу
                 direction = "horizontal" if abs(x1 - x0) >= abs(y1 - y0) else "vertical"
-                table = draw_hyperbola(self.canvas, x0, y0, x1, y1, direction=direction, debug=self.debug_mode)
+                table = self.timed_draw(draw_hyperbola, self.canvas, x0, y0, x1, y1, direction=direction, debug=self.debug_mode)
                 self.update_status(
                     f"Гипербола построена. Центр: ({x0}, {y0}), полуоси: a={abs(x1 - x0)}, b={abs(y1 - y0)}."
                 )
@@ -364,50 +470,72 @@ class GraphicEditorApp:
 
     # Предварительные обработчики движения для кривых
     def on_circle_motion(self, event):
+        self.schedule_preview(self.update_circle_preview, event)
+
+    def update_circle_preview(self, x, y):
         if self.start_point is None:
             return
-        self.canvas.delete("preview_circle")
         x0, y0 = self.start_point
-        r = ((event.x - x0) ** 2 + (event.y - y0) ** 2) ** 0.5
-        self.canvas.create_oval(x0 - r, y0 - r, x0 + r, y0 + r,
-                                outline="gray", dash=(2, 2), tags="preview_circle")
+        r = ((x - x0) ** 2 + (y - y0) ** 2) ** 0.5
+        self.set_preview(f"preview_{self.selected_curve_type}", "oval", (x0 - r, y0 - r, x0 + r, y0 + r))
 
     def on_ellipse_motion(self, event):
+        self.schedule_preview(self.update_ellipse_preview, event)
+
+    def update_ellipse_preview(self, x, y):
         if self.start_point is None:
             return
-        self.canvas.delete("preview_ellipse")
         x0, y0 = self.start_point
-        rx = abs(event.x - x0)
-        ry = abs(event.y - y0)
-        self.canvas.create_oval(x0 - rx, y0 - ry, x0 + rx, y0 + ry,
-                                outline="gray", dash=(2, 2), tags="preview_ellipse")
+        rx = abs(x - x0)
+        ry = abs(y - y0)
+        self.set_preview("preview_ellipse", "oval", (x0 - rx, y0 - ry, x0 + rx, y0 + ry))
 
     def on_parabola_motion(self, event):
+        self.schedule_preview(self.update_parabola_preview, event)
+
+    def update_parabola_preview(self, x, y):
         if self.start_point is None:
             return
-        self.canvas.delete("preview_parabola")
+        tag = f"preview_{self.selected_curve_type}"
         x0, y0 = self.start_point
-        if event.x == x0:
-            return
-        a = (event.y - y0) / ((event.x - x0) ** 2)
-        width = int(self.canvas['width'])
         coords = []
-        for x in range(width):
-            y = a * ((x - x0) ** 2) + y0
-            coords.extend([x, y])
-        self.canvas.create_line(coords, fill="gray", dash=(2, 2), tags="preview_parabola")
+        if self.selected_curve_type == "parabola_horizontal":
+            # Ось параболы горизонтальна: x = a * (y - y0)^2 + x0
+            if y == y0:
+                self.canvas.delete(tag)
+                return
+            a = (x - x0) / ((y - y0) ** 2)
+            height, width = int(self.canvas['height']), int(self.canvas['width'])
+            # Дальше |y - y0| > sqrt(ширина / |a|) ветви уходят за край канвы – эти точки не нужны
+            half = int(math.sqrt(width / abs(a))) + 2 if a else height
+            for py in range(max(0, y0 - half), min(height, y0 + half + 1)):
+                coords.extend([a * ((py - y0) ** 2) + x0, py])
+        else:
+            if x == x0:
+                self.canvas.delete(tag)
+                return
+            a = (y - y0) / ((x - x0) ** 2)
+            height, width = int(self.canvas['height']), int(self.canvas['width'])
+            half = int(math.sqrt(height / abs(a))) + 2 if a else width
+            for px in range(max(0, x0 - half), min(width, x0 + half + 1)):
+                coords.extend([px, a * ((px - x0) ** 2) + y0])
+        if len(coords) < 4:
+            self.canvas.delete(tag)
+            return
+        self.set_preview(tag, "line", coords)
 
     def on_hyperbola_motion(self, event):
+        self.schedule_preview(self.update_hyperbola_preview, event)
+
+    def update_hyperbola_preview(self, x2, y2):
         """
         Отображение предварительного вида гиперболы с использованием центра и текущей позиции мыши.
-        Центр гиперболы — это self.start_point. Текущая позиция мыши определяет направление и размеры полуосей.
+        Центр гиперболы — это self.start_point. Текущая позиция мыши (x2, y2) определяет направление и размеры полуосей.
         """
         if self.start_point is None:
             return
-        self.canvas.delete("preview_hyperbola")
 
         xc, yc = self.start_point  # Центр гиперболы
-        x2, y2 = event.x, event.y  # Текущая позиция мыши (определяет размеры и направление)
 
         # Вычисляем направление гиперболы
         dx = abs(x2 - xc)
@@ -426,24 +554,23 @@ class GraphicEditorApp:
 
         while t <= T:
             if direction == "horizontal":
-                # Гипербола вдоль оси X
+                # Гипербола вдоль оси X: правая и левая ветви
                 x_right = xc + a * math.cosh(t)
                 y_right = yc + b * math.sinh(t)
                 x_left = xc - a * math.cosh(t)
                 y_left = yc + b * math.sinh(t)
             else:
-                # Гипербола вдоль оси Y
+                # Гипербола вдоль оси Y: нижняя и верхняя ветви
                 x_right = xc + b * math.sinh(t)
                 y_right = yc + a * math.cosh(t)
-                x_left = xc - b * math.sinh(t)
-                y_left = yc + a * math.cosh(t)
+                x_left = xc + b * math.sinh(t)
+                y_left = yc - a * math.cosh(t)
 
             coords_right.extend([x_right, y_right])
             coords_left.extend([x_left, y_left])
             t += dt
 
-        self.canvas.create_line(coords_right, fill="gray", dash=(2, 2), tags="preview_hyperbola")
-        self.canvas.create_line(coords_left, fill="gray", dash=(2, 2), tags="preview_hyperbola")
+        self.set_preview("preview_hyperbola", "line", coords_right, coords_left)
 
     def handle_curve_click(self, event):
         if self.current_event != "Кривая":
@@ -467,50 +594,40 @@ class GraphicEditorApp:
         self.update_curve()
 
     def update_curve(self):
-        import intervals
-
         # Получаем текущую кривую (последнюю тройку)
         current_curve = self.curve_control_points[-1]
-        # Удаляем отрисованные объекты, используя второй элемент тройки (current_curve[1])
-        for obj_id in current_curve[1]:
-            self.canvas.delete(obj_id)
-        # Очищаем список отрисованных объектов для текущей кривой
-        current_curve[1].clear()
-
-        old_draw_pixel = intervals.draw_pixel
-
-        # Здесь tracked_draw_pixel сразу добавляет id объектов во второй элемент тройки,
-        # а не в отдельный список self.current_curve_ids.
-        def tracked_draw_pixel(canvas, x, y, intensity=1, size=1):
-            x = int(round(x))
-            y = int(round(y))
-            intensity = max(0, min(1, intensity))
-            shade = int(255 * (1 - intensity))
-            color = f"#{shade:02x}{shade:02x}{shade:02x}"
-            obj_id = canvas.create_rectangle(x, y, x + size, y + size, outline=color, fill=color)
-            current_curve[1].append(obj_id)
-            self.curve_control_points[-1][1].append(obj_id)
-            return obj_id
-
-        intervals.draw_pixel = tracked_draw_pixel
-
+        # Все пиксели кривой рисуются в группу с тегом current_curve[1] (элементы канвы с общим тегом
+        # или отдельный слой буфера кадра), поэтому старая кривая удаляется одной операцией
+        tag = current_curve[1]
         # Извлекаем координаты точек (первый элемент тройки)
         points = [pt for _, pt in current_curve[0]]
+        if current_curve[2] == "b-spline":
+            # B-сплайн перерисовывается по сегментам: при перемещении точки – только 4 соседних
+            from curves import BSplineCache
+            cache = self.bspline_caches.get(tag)
+            if cache is None:
+                cache = self.bspline_caches[tag] = BSplineCache(self.canvas, tag, dt=0.01)
+            if cache.method != self.curve_method.get():
+                cache.clear()
+                cache.method = self.curve_method.get()
+            self.timed_draw(cache.update, points)
+            self.update_status(f"{self.selected_curve_form_title}: кривая обновлена.")
+            return
+        raster.delete_group(self.canvas, tag)
+
         # Отрисовываем кривую согласно выбранной форме
-        if current_curve[2] == "еmmitt form" and len(points) == 4:
-            from curves import draw_hermite
-            p1, p4 = points[0], points[1]
-            r1 = (points[2][0] - p1[0], points[2][1] - p1[1])
-            r4 = (points[3][0] - p4[0], points[3][1] - p4[1])
-            draw_hermite(self.canvas, p1, p4, r1, r4, dt=0.01)
-        elif current_curve[2] == "bezier form" and len(points) == 4:
-            from curves import draw_bezier
-            draw_bezier(self.canvas, *points, dt=0.01)
-        elif current_curve[2] == "b-spline" and len(points) >= 4:
-            from curves import draw_bspline
-            draw_bspline(self.canvas, points, dt=0.01)
-
-        intervals.draw_pixel = old_draw_pixel
+        with raster.group(tag):
+            if current_curve[2] == "еmmitt form" and len(points) == 4:
+                from curves import draw_hermite
+                p1, p4 = points[0], points[1]
+                r1 = (points[2][0] - p1[0], points[2][1] - p1[1])
+                r4 = (points[3][0] - p4[0], points[3][1] - p4[1])
+                self.timed_draw(draw_hermite, self.canvas, p1, p4, r1, r4, dt=0.01,
+                                method=self.curve_method.get())
+            elif current_curve[2] == "bezier form" and len(points) == 4:
+                from curves import draw_bezier
+                self.timed_draw(draw_bezier, self.canvas, *points, dt=0.01, method=self.curve_method.get())
+
         self.update_status(f"{self.selected_curve_form_title}: кривая обновлена.")
 
     import math
@@ -557,56 +674,28 @@ class GraphicEditorApp:
              Итерация, x, y, e, e′, Отобр. координаты.
         Если запись содержит 9 элементов (для кривых), выводятся поля:
              Шаг | di | δ | δ* | Пиксель | x | y | di+1 | Plot (x, y)
+        Таблица выводится виртуализированно (DebugTableView): создаётся текст только видимых строк;
+        можно перейти к шагу по номеру и найти строку по координатам пикселя.
         """
-        import tkinter as tk
         window = tk.Toplevel(self.root)
         window.title(f"Отладочная таблица")
         window.geometry("1000x400")
 
-        text = tk.Text(window, font=("Courier", 10))
-        text.pack(fill=tk.BOTH, expand=True)
-
-        if not table:
-            text.insert(tk.END, "Нет данных для отображения")
+        if not table or len(table[0]) not in HEADERS:
+            text = tk.Text(window, font=("Courier", 10))
+            text.pack(fill=tk.BOTH, expand=True)
+            text.insert(tk.END, "Нет данных для отображения" if not table else "Неподдерживаемый формат таблицы\n")
             return
 
-        cols = len(table[0])
-        if cols == 4:
-            header = f"{'Итерация':>9} | {'x':>10} | {'y':>10} | {'Отобр. координаты':>20}\n"
-            separator = "-" * 60 + "\n"
-            text.insert(tk.END, header)
-            text.insert(tk.END, separator)
-            for row in table:
-                i, x, y, disp = row
-                text.insert(tk.END, f"{i:9d} | {x:10.2f} | {y:10.2f} | ({disp[0]:3d}, {disp[1]:3d})\n")
-        elif cols == 6:
-            header = f"{'Итерация':>9} | {'x':>10} | {'y':>10} | {'e':>10} | {'e\'':>10} | {'Отобр. координаты':>20}\n"
-            separator = "-" * 90 + "\n"
-            text.insert(tk.END, header)
-            text.insert(tk.END, separator)
-            for row in table:
-                i, x, y, e, e_prime, disp = row
-                text.insert(tk.END,
-                            f"{i:9d} | {x:10.2f} | {y:10.2f} | {e:10.2f} | {e_prime:10.2f} | ({disp[0]:3d}, {disp[1]:3d})\n")
-        elif cols == 9:
-            header = f"{'Шаг':>5} | {'di':>8} | {'δ':>8} | {'δ*':>8} | {'Пиксель':>10} | {'x':>10} | {'y':>10} | {'di+1':>8} | {'Plot (x,y)':>15}\n"
-            separator = "-" * 110 + "\n"
-            text.insert(tk.END, header)
-            text.insert(tk.END, separator)
-            for row in table:
-                # Каждая запись должна включать 9 элементов:
-                # (Шаг, di, δ, δ*, Пиксель, x, y, di+1, Plot (x,y))
-                step, di, delta, delta_star, pixel, x_val, y_val, di_next, plot = row
-                text.insert(tk.END,
-                            f"{step:5d} | {di:8.2f} | {delta:8.2f} | {delta_star:8.2f} | ({pixel[0]:3d}, {pixel[1]:3d}) | {x_val:10.2f} | {y_val:10.2f} | {di_next:8.2f} | ({plot[0]:3d}, {plot[1]:3d})\n")
-        else:
-            text.insert(tk.END, "Неподдерживаемый формат таблицы\n")
-
-        text.config(state=tk.DISABLED)
+        view = DebugTableView(window, table, header=format_header(len(table[0])),
+                              format_row=lambda index, row: format_row(row).rstrip("\n"))
+        view.pack(fill=tk.BOTH, expand=True)
 
     def clear_canvas(self):
         self.canvas.delete("all")
+        raster.clear(self.canvas)
         self.curve_control_points = []
+        self.bspline_caches = {}
         self.select_cursor_mode()
         if self.debug_mode:
             self.draw_grid()
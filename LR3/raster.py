@@ -0,0 +1,296 @@
+"""
+Растровый буфер кадра для вывода пикселей.
+
+По умолчанию каждый пиксель, нарисованный draw_pixel, становится отдельным элементом
+канвы (canvas.create_rectangle). В режиме буфера кадра пиксели записываются в массив
+NumPy (uint8), который выводится на канву одним изображением PhotoImage за кадр.
+
+Пиксели можно объединять в группу (raster.group): в режиме элементов канвы все они получают
+общий тег, а в режиме буфера кадра пишутся в отдельный слой со своим изображением. Группа
+удаляется целиком одной операцией delete_group – например, при перерисовке кривой.
+Группы можно вкладывать: элементы канвы получают теги всех открытых групп, а пиксели
+в режиме буфера кадра попадают в слой внешней группы.
+"""
+import base64
+import contextlib
+import weakref
+
+import numpy as np
+
+from headless import encode_png
+
+BACKEND_TK = "tk"                     # Каждый пиксель – отдельный элемент канвы
+BACKEND_FRAMEBUFFER = "framebuffer"   # Пиксели пишутся в буфер NumPy
+
+_backend = BACKEND_TK
+
+# Буферы кадра, привязанные к канвам: canvas -> Framebuffer
+_framebuffers = weakref.WeakKeyDictionary()
+# Слои групп пикселей: canvas -> {тег группы: Framebuffer}
+_layers = weakref.WeakKeyDictionary()
+# Открытые группы, в которые попадают рисуемые пиксели (от внешней к внутренней)
+_groups = []
+
+
+def set_backend(backend):
+    """Выбирает способ вывода пикселей: BACKEND_TK или BACKEND_FRAMEBUFFER."""
+    global _backend
+    if backend not in (BACKEND_TK, BACKEND_FRAMEBUFFER):
+        raise ValueError(f"Неизвестный способ вывода: {backend}")
+    _backend = backend
+
+
+def get_backend():
+    return _backend
+
+
+@contextlib.contextmanager
+def group(tag):
+    """
+    Объединяет пиксели, нарисованные внутри блока with, в группу с тегом tag:
+        with raster.group("curve_1"):
+            draw_bspline(canvas, points)
+    """
+    _groups.append(tag)
+    try:
+        yield tag
+    finally:
+        _groups.pop()
+
+
+def get_group_tags():
+    """Теги для элементов канвы, создаваемых в открытых группах (пустой кортеж вне групп)."""
+    return tuple(_groups)
+
+
+def delete_group(canvas, tag):
+    """Удаляет все пиксели группы: элементы канвы с тегом tag и слой буфера кадра."""
+    canvas.delete(tag)
+    layer = _layers.get(canvas, {}).get(tag)
+    if layer is not None:
+        layer.clear()
+        layer.image_id = None   # Изображение слоя удалено вместе с тегом
+        layer.image = None
+        layer.dirty = False
+
+
+def get_viewport(canvas):
+    """Видимая область канвы в пикселях: (xmin, ymin, xmax, ymax) включительно."""
+    return 0, 0, int(canvas["width"]) - 1, int(canvas["height"]) - 1
+
+
+class Framebuffer:
+    """
+    Буфер кадра размером с канву.
+
+    pixels хранит «количество краски» в каждом пикселе: 0 – пиксель пуст (прозрачен),
+    255 – чёрный. Это соответствует параметру intensity функции draw_pixel.
+    """
+
+    def __init__(self, width, height, tag=None):
+        self.width = width
+        self.height = height
+        self.tag = tag          # Тег группы, если буфер – слой группы
+        self.pixels = np.zeros((height, width), dtype=np.uint8)
+        self.image = None       # Текущий PhotoImage (ссылка нужна, иначе его удалит сборщик мусора)
+        self.image_id = None    # Элемент канвы, на котором показан буфер
+        self.scheduled = False  # Запланирован ли вывод на канву
+        self.dirty = False      # Изменялся ли буфер после последнего вывода
+        self.bbox = None        # Границы изменённой области (x0, y0, x1, y1) включительно
+        # Буфер покрытия (float32, 0..1) для сглаженных примитивов; создаётся при первом обращении
+        self.coverage = None
+
+    def _touch(self, x0, y0, x1, y1):
+        if self.bbox is None:
+            self.bbox = (x0, y0, x1, y1)
+        else:
+            bx0, by0, bx1, by1 = self.bbox
+            self.bbox = (min(bx0, x0), min(by0, y0), max(bx1, x1), max(by1, y1))
+        self.dirty = True
+
+    def fill_rect(self, x0, y0, x1, y1, ink=255):
+        """Закрашивает прямоугольник [x0, x1) x [y0, y1), обрезая его по границам буфера."""
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.width), min(y1, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        self.pixels[y0:y1, x0:x1] = ink
+        self._touch(x0, y0, x1 - 1, y1 - 1)
+
+    def put_pixel(self, x, y, ink=255):
+        if 0 <= x < self.width and 0 <= y < self.height:
+            self.pixels[y, x] = ink
+            self._touch(x, y, x, y)
+
+    def put_pixels(self, xs, ys, ink=255):
+        """Записывает набор пикселей за одну операцию; ink – число или массив той же длины."""
+        xs = np.asarray(xs, dtype=np.intp)
+        ys = np.asarray(ys, dtype=np.intp)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        if not inside.any():
+            return
+        xs, ys = xs[inside], ys[inside]
+        if np.ndim(ink):
+            ink = np.asarray(ink)[inside]
+        self.pixels[ys, xs] = ink
+        self._touch(int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max()))
+
+    def composite(self, xs, ys, alpha, mode="max"):
+        """
+        Накапливает покрытие alpha (0..1) пикселей (xs, ys) в буфере coverage.
+          mode="max"  – покрытие пикселя равно максимуму покрытий (пересечения не светлеют);
+          mode="over" – покрытия складываются как полупрозрачные слои: a + c * (1 - a).
+        Повторяющиеся в одном вызове пиксели обрабатываются корректно.
+        """
+        if mode not in ("max", "over"):
+            raise ValueError(f"Неизвестный режим наложения: {mode}")
+        if self.coverage is None:
+            self.coverage = np.zeros((self.height, self.width), dtype=np.float32)
+        xs = np.asarray(xs, dtype=np.intp)
+        ys = np.asarray(ys, dtype=np.intp)
+        alpha = np.clip(np.broadcast_to(np.asarray(alpha, dtype=np.float32), xs.shape), 0, 1)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        if not inside.any():
+            return
+        xs, ys, alpha = xs[inside], ys[inside], alpha[inside]
+        if mode == "max":
+            np.maximum.at(self.coverage, (ys, xs), alpha)
+        else:
+            keys, inverse = np.unique(ys * self.width + xs, return_inverse=True)
+            transparency = np.ones(len(keys), dtype=np.float32)
+            np.multiply.at(transparency, inverse, 1 - alpha)
+            flat = self.coverage.reshape(-1)
+            flat[keys] = 1 - (1 - flat[keys]) * transparency
+        self._touch(int(xs.min()), int(ys.min()), int(xs.max()), int(ys.max()))
+
+    def clear(self):
+        self.pixels.fill(0)
+        if self.coverage is not None:
+            self.coverage.fill(0)
+        self.bbox = None
+        self.dirty = True
+
+    def to_rgba(self):
+        """
+        Возвращает изменённую область в виде RGBA-массива: чёрная краска с альфой pixels.
+        Накопленное покрытие coverage накладывается поверх один раз – при выводе кадра.
+        """
+        x0, y0, x1, y1 = self.bbox
+        rgba = np.zeros((y1 - y0 + 1, x1 - x0 + 1, 4), dtype=np.uint8)
+        ink = self.pixels[y0:y1 + 1, x0:x1 + 1]
+        if self.coverage is None:
+            rgba[..., 3] = ink
+        else:
+            coverage = self.coverage[y0:y1 + 1, x0:x1 + 1]
+            alpha = 1 - (1 - ink / 255.0) * (1 - coverage)
+            rgba[..., 3] = np.rint(alpha * 255)
+        return rgba
+
+    def blit(self, canvas):
+        """Выводит буфер на канву одним изображением."""
+        self.scheduled = False
+        if self.image_id is not None and not canvas.type(self.image_id):
+            # Элемент был удалён с канвы (например, canvas.delete("all"))
+            self.image_id = None
+            self.dirty = True
+        if not self.dirty:
+            return
+        self.dirty = False
+        if self.bbox is None:
+            if self.image_id is not None:
+                canvas.delete(self.image_id)
+                self.image_id = None
+            self.image = None
+            return
+        if getattr(canvas, "headless", False):
+            # Канва без окна (headless.HeadlessCanvas) принимает массив RGBA напрямую
+            self.image = self.to_rgba()
+        else:
+            # Tk нужен только для вывода на настоящую канву: headless-режим работает без него
+            import tkinter as tk
+            data = base64.b64encode(encode_png(self.to_rgba()))
+            self.image = tk.PhotoImage(master=canvas, data=data, format="png")
+        x0, y0 = self.bbox[0], self.bbox[1]
+        if self.image_id is None:
+            self.image_id = canvas.create_image(x0, y0, anchor="nw", image=self.image,
+                                                tags=(self.tag,) if self.tag is not None else ())
+        else:
+            canvas.itemconfigure(self.image_id, image=self.image)
+            canvas.coords(self.image_id, x0, y0)
+
+
+def get_framebuffer(canvas):
+    """
+    Возвращает буфер кадра канвы (или слой текущей группы), создавая его при первом обращении.
+    """
+    if _groups:
+        layers = _layers.setdefault(canvas, {})
+        fb = layers.get(_groups[0])
+        if fb is None:
+            fb = Framebuffer(int(canvas["width"]), int(canvas["height"]), _groups[0])
+            layers[_groups[0]] = fb
+        return fb
+    fb = _framebuffers.get(canvas)
+    if fb is None:
+        fb = Framebuffer(int(canvas["width"]), int(canvas["height"]))
+        _framebuffers[canvas] = fb
+    return fb
+
+
+def _canvas_buffers(canvas):
+    """Все буферы канвы: основной и слои групп."""
+    buffers = list(_layers.get(canvas, {}).values())
+    fb = _framebuffers.get(canvas)
+    if fb is not None:
+        buffers.insert(0, fb)
+    return buffers
+
+
+def schedule_present(canvas):
+    """Планирует вывод буфера на канву: не чаще одного раза за цикл обработки событий."""
+    fb = get_framebuffer(canvas)
+    if not fb.scheduled:
+        fb.scheduled = True
+        canvas.after_idle(present, canvas)
+
+
+def present(canvas):
+    """Немедленно выводит буферы кадра канвы (если они есть)."""
+    for fb in _canvas_buffers(canvas):
+        fb.blit(canvas)
+
+
+def put_pixel(canvas, x, y, intensity=1, size=1):
+    """Записывает пиксель (квадрат size x size) в буфер кадра канвы."""
+    fb = get_framebuffer(canvas)
+    fb.fill_rect(x, y, x + size, y + size, int(round(255 * intensity)))
+    schedule_present(canvas)
+
+
+def put_span(canvas, x0, y0, x1, y1, intensity=1):
+    """Записывает ряд пикселей от (x0, y0) до (x1, y1) включительно одним срезом массива."""
+    fb = get_framebuffer(canvas)
+    fb.fill_rect(x0, y0, x1 + 1, y1 + 1, int(round(255 * intensity)))
+    schedule_present(canvas)
+
+
+def put_pixels(canvas, xs, ys, intensity=1):
+    """Записывает массив пикселей в буфер кадра канвы."""
+    fb = get_framebuffer(canvas)
+    ink = np.rint(np.clip(intensity, 0, 1) * 255).astype(np.uint8)
+    fb.put_pixels(xs, ys, ink)
+    schedule_present(canvas)
+
+
+def composite(canvas, xs, ys, alpha, mode="max"):
+    """Накапливает покрытие пикселей в буфере кадра канвы (см. Framebuffer.composite)."""
+    fb = get_framebuffer(canvas)
+    fb.composite(xs, ys, alpha, mode)
+    schedule_present(canvas)
+
+
+def clear(canvas):
+    """Очищает буферы кадра канвы (вместе со слоями групп) и убирает их изображения."""
+    for fb in _canvas_buffers(canvas):
+        fb.clear()
+        fb.blit(canvas)
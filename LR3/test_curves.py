@@ -0,0 +1,254 @@
+import numpy as np
+import pytest
+
+import headless
+import raster
+import curves
+import lines_second_order
+from curves import BSplineCache
+
+WIDTH, HEIGHT = 200, 150
+BACKENDS = (raster.BACKEND_TK, raster.BACKEND_FRAMEBUFFER)
+
+# Сплайн, часть которого выходит за левый и правый края канвы
+POINTS = [(-80, 20), (-30, 120), (40, 30), (100, 140), (170, 10), (260, 90), (330, 40), (120, 75)]
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    previous = raster.get_backend()
+    raster.set_backend(request.param)
+    yield request.param
+    raster.set_backend(previous)
+
+
+def render(canvas):
+    raster.present(canvas)
+    return canvas.render()
+
+
+@pytest.mark.parametrize("moved", range(len(POINTS)))
+def test_bspline_cache_matches_full_redraw(backend, moved):
+    """После перемещения точки изображение совпадает с заново нарисованным сплайном."""
+    canvas = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    cache = BSplineCache(canvas, "curve")
+    cache.update(POINTS)
+    points = list(POINTS)
+    points[moved] = (points[moved][0] + 37, points[moved][1] - 23)
+    cache.update(points)
+
+    fresh = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    BSplineCache(fresh, "curve").update(points)
+    np.testing.assert_array_equal(render(canvas), render(fresh))
+
+
+def test_bspline_cache_spans():
+    """Элементами канвы пиксели сегментов выводятся рядами, а не по одному."""
+    raster.set_backend(raster.BACKEND_TK)
+    canvas = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    cache = BSplineCache(canvas, "curve")
+    cache.update([(10, 75), (60, 74), (120, 76), (190, 75)])
+    pixels = len(cache.segments[0][1])
+    assert len(canvas.find_withtag("curve")) < pixels // 4
+
+
+HERMITE = ((10, 10), (190, 140), (300, -100), (-50, 400))
+BEZIER = ((10, 140), (60, -30), (150, 190), (190, 20))
+STEPS = (0.1, 0.05, 0.01, 0.003, 0.001, 1 / 3)
+
+
+@pytest.mark.parametrize("dt", STEPS)
+def test_forward_difference_matches_direct(dt):
+    """Прямые разности дают те же точки, что и прямое вычисление (с точностью до 1e-9)."""
+    for samples, args in ((curves.hermite_samples, HERMITE), (curves.bezier_samples, BEZIER)):
+        ts, direct = samples(*args, dt=dt)
+        forward_ts, forward = samples(*args, dt=dt, method="forward")
+        np.testing.assert_allclose(forward_ts, ts, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(forward, direct, rtol=0, atol=1e-9)
+    ts, xs, ys = curves.bspline_segment(*POINTS[:4], dt=dt)
+    forward_ts, forward_xs, forward_ys = curves.bspline_segment(*POINTS[:4], dt=dt, method="forward")
+    np.testing.assert_allclose(forward_ts, ts, rtol=0, atol=1e-9)
+    np.testing.assert_allclose(np.column_stack([forward_xs, forward_ys]), np.column_stack([xs, ys]), rtol=0, atol=1e-9)
+
+
+def chord_deviation(ts, vertices, evaluate):
+    """Наибольшее отклонение кривой от ломаной: точки кривой сравниваются с хордой своего участка по t."""
+    t = np.linspace(0, 1, 20001)
+    points = evaluate(t)
+    k = np.clip(np.searchsorted(ts, t, side="right") - 1, 0, len(ts) - 2)
+    a, d = vertices[k], vertices[k + 1]
+    chord = d - a
+    length2 = np.maximum((chord ** 2).sum(axis=1), 1e-300)
+    u = np.clip(((points - a) * chord).sum(axis=1) / length2, 0, 1)
+    return np.hypot(*(points - a - u[:, None] * chord).T).max()
+
+
+def bezier_at(p1, p2, p3, p4):
+    p1, p2, p3, p4 = (np.asarray(p, dtype=float) for p in (p1, p2, p3, p4))
+    return lambda t: ((1 - t) ** 3)[:, None] * p1 + (3 * t * (1 - t) ** 2)[:, None] * p2 + \
+        (3 * t ** 2 * (1 - t))[:, None] * p3 + (t ** 3)[:, None] * p4
+
+
+@pytest.mark.parametrize("control", [BEZIER, curves.hermite_to_bezier(*HERMITE), ((0, 0), (200, 0), (0, 150), (200, 150)),
+                                     ((100, 75), (100, 75), (100, 75), (100, 76))])
+def test_adaptive_flattening_tolerance(control):
+    """Ломаная отклоняется от кривой не больше допуска, а с уменьшением допуска вершин становится больше."""
+    counts = []
+    for tolerance in (2.0, 0.5, 0.1, 0.01):
+        ts, vertices = curves.bezier_flatten(*control, tolerance=tolerance)
+        assert ts[0] == 0 and ts[-1] == 1 and (np.diff(ts) > 0).all()
+        np.testing.assert_array_equal(vertices[[0, -1]], np.array(control, dtype=float)[[0, -1]])
+        assert chord_deviation(ts, vertices, bezier_at(*control)) <= tolerance
+        counts.append(len(ts))
+    assert counts == sorted(counts)
+
+
+@pytest.mark.parametrize("dt", (0.1, 0.01, 0.003))
+def test_de_boor_matches_cubic_basis(dt):
+    """Кубический B-сплайн с равномерными узлами по де Буру совпадает с кэшированной таблицей базиса."""
+    segments = len(POINTS) - 3
+    knots = curves.uniform_knots(len(POINTS), 3)
+    ts = (knots[3] + np.arange(segments)[:, None] + curves.parameter_values(dt)).ravel()
+    expected = curves.bspline_points(POINTS, dt)
+    np.testing.assert_allclose(curves.de_boor(POINTS, 3, knots, ts), expected, rtol=0, atol=1e-9)
+    # Одинаковые веса не меняют кривую
+    weights = np.full(len(POINTS), 2.5)
+    np.testing.assert_allclose(curves.de_boor(POINTS, 3, knots, ts, weights), expected, rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("cx, cy, rx, ry", [(100, 75, 50, 50), (0.5, -3, 1, 1), (100, 75, 90, 30)])
+def test_nurbs_ellipse_is_exact(cx, cy, rx, ry):
+    """Рациональная квадратичная NURBS лежит на эллипсе (окружности) с точностью округления."""
+    points, weights, knots = curves.nurbs_ellipse(cx, cy, rx, ry)
+    samples = curves.de_boor(points, 2, knots, np.linspace(0, 1, 4001), weights)
+    radius = np.hypot((samples[:, 0] - cx) / rx, (samples[:, 1] - cy) / ry)
+    assert np.abs(radius - 1).max() < 1e-12
+
+
+@pytest.mark.parametrize("r", (5, 20, 37, 70))
+def test_nurbs_circle_matches_draw_circle(backend, r):
+    """Пиксели NURBS-окружности совпадают с окружностью Брезенхэма и отстоят от неё не больше чем на 0,5."""
+    canvas = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    curves.draw_nurbs_circle(canvas, 100, 75, r)
+    expected = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    lines_second_order.draw_circle(expected, 100, 75, r)
+    image = render(canvas)
+    np.testing.assert_array_equal(image, render(expected))
+    ys, xs = np.nonzero((image < 128).all(axis=2))
+    assert np.abs(np.hypot(xs - 100, ys - 75) - r).max() <= 0.5
+
+
+def test_nurbs_circle_off_screen(backend):
+    canvas = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    curves.draw_nurbs_circle(canvas, 800, 800, 50)
+    curves.draw_nurbs_circle(canvas, -300, 75, 100)
+    assert (render(canvas) == 255).all()
+
+
+def drawn(canvas):
+    ys, xs = np.nonzero((render(canvas) < 128).all(axis=2))
+    return set(zip(xs.tolist(), ys.tolist()))
+
+
+def is_connected(pixels):
+    """Пиксели образуют одну 8-связную область."""
+    pixels = set(pixels)
+    stack = [next(iter(pixels))]
+    seen = set(stack)
+    while stack:
+        x, y = stack.pop()
+        for neighbour in ((x + dx, y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)):
+            if neighbour in pixels and neighbour not in seen:
+                seen.add(neighbour)
+                stack.append(neighbour)
+    return len(seen) == len(pixels)
+
+
+@pytest.mark.parametrize("method", ("direct", "forward", "adaptive"))
+@pytest.mark.parametrize("dt", (0.01, 0.2))
+def test_sampled_curves_are_connected(backend, method, dt):
+    """Кривые по точкам выводятся связной ломаной даже при крупном шаге dt."""
+    # Кривые целиком внутри канвы
+    for draw in (lambda c: curves.draw_bezier(c, *BEZIER, dt=dt, method=method),
+                 lambda c: curves.draw_hermite(c, (10, 20), (190, 130), (300, -40), (-50, 300), dt=dt, method=method),
+                 lambda c: curves.draw_bspline(c, [(20, 20), (60, 130), (120, 30), (180, 120), (100, 75)],
+                                               dt=dt, method=method)):
+        canvas = headless.HeadlessCanvas(WIDTH, HEIGHT)
+        draw(canvas)
+        assert is_connected(drawn(canvas))
+
+
+@pytest.mark.parametrize("draw", [
+    lambda c: curves.draw_bezier(c, (-5000, -5000), (-4000, -6000), (-2000, -4000), (-1000, -5000)),
+    lambda c: curves.draw_hermite(c, (300, 10), (400, 140), (0, 500), (0, -500)),
+    lambda c: curves.draw_bspline(c, [(-900, 10), (-800, 90), (-700, 20), (-600, 120), (-500, 60)]),
+    lambda c: curves.draw_bspline(c, [(-900, 10), (-800, 90), (-700, 20), (-600, 120)], method="adaptive"),
+])
+def test_sampled_curves_off_screen(backend, draw):
+    """Кривые целиком за пределами канвы ничего не рисуют (и не падают на пустых данных)."""
+    canvas = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    draw(canvas)
+    assert (render(canvas) == 255).all()
+
+
+def test_bspline_with_off_screen_tail(backend):
+    """Видимая часть B-сплайна не зависит от того, уходит ли его хвост за канву."""
+    points = [(20, 20), (60, 130), (120, 30), (180, 120)]
+    canvas = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    curves.draw_bspline(canvas, points)
+    visible = drawn(canvas)
+    tailed = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    curves.draw_bspline(tailed, points + [(900, 900), (1500, -700)])
+    assert visible and visible <= drawn(tailed)
+
+
+ARC_CURVES = [("bezier", BEZIER), ("hermite", HERMITE), ("bspline", POINTS)]
+
+
+def exact_lengths(table, ts):
+    """Длина дуги от начала кривой до значений ts по мелкой таблице (100000 участков)."""
+    fine = curves.ArcLengthTable(table.evaluate, table.ts[0], table.ts[-1], 100000)
+    return np.interp(ts, fine.ts, fine.lengths), fine.length
+
+
+@pytest.mark.parametrize("kind, points", ARC_CURVES)
+def test_parameter_at(kind, points):
+    """Параметр растёт с расстоянием, а длина дуги до найденной точки равна s с точностью 0,1 пикселя."""
+    table = curves.arc_length_table(kind, points)
+    s = np.linspace(0, table.length, 700)
+    ts = table.parameter_at(s)
+    assert ts[0] == table.ts[0] and ts[-1] == table.ts[-1] and (np.diff(ts) > 0).all()
+    lengths, length = exact_lengths(table, ts)
+    assert abs(table.length - length) < 0.1
+    assert np.abs(lengths - s).max() < 0.1
+    # Расстояния за пределами кривой прижимаются к её концам
+    assert table.parameter_at(-5) == table.ts[0] and table.parameter_at(table.length + 5) == table.ts[-1]
+
+
+@pytest.mark.parametrize("kind, points", ARC_CURVES)
+@pytest.mark.parametrize("spacing", (1, 5, 20))
+def test_sample_by_distance_spacing(kind, points, spacing):
+    """Соседние точки отстоят друг от друга на spacing пикселей длины дуги; последняя – конец кривой."""
+    table = curves.arc_length_table(kind, points)
+    distances, samples = table.sample_by_distance(spacing)
+    np.testing.assert_allclose(np.diff(distances[:-1]), spacing)
+    assert 0 < distances[-1] - distances[-2] <= spacing
+    np.testing.assert_allclose(samples[-1], table.evaluate(table.ts[-1:])[0])
+    lengths, _ = exact_lengths(table, table.parameter_at(distances))
+    assert np.abs(lengths - distances).max() < 0.1
+    # Хорда не длиннее дуги (на крутых поворотах – короче)
+    assert (np.hypot(*np.diff(samples, axis=0).T) < 1.05 * spacing).all()
+
+
+def test_adaptive_vertices_bounded_by_arc_length():
+    """При слишком малом допуске число вершин ограничено оценкой sample_bound, а при обычном – не меняется."""
+    bound = curves.arc_length_table("bezier", BEZIER).sample_bound()
+    ts, _ = curves.bezier_samples(*BEZIER, method="adaptive", tolerance=1e-6)
+    assert len(ts) < 2 * bound < len(curves.bezier_flatten(*BEZIER, tolerance=1e-6)[0])
+    np.testing.assert_array_equal(curves.bezier_samples(*BEZIER, method="adaptive")[1], curves.bezier_flatten(*BEZIER)[1])
+
+
+def test_dashed_off_screen(backend):
+    canvas = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    curves.draw_dashed(canvas, curves.arc_length_table("bezier", [(-500, -5), (-400, -60), (-200, -40), (-100, -50)]))
+    assert (render(canvas) == 255).all()
@@ -0,0 +1,51 @@
+import os
+import struct
+import subprocess
+import sys
+import zlib
+
+import numpy as np
+import pytest
+
+import headless
+import raster
+
+
+def decode_png(data):
+    """Разбирает PNG без фильтров строк, записанный encode_png."""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, chunks = 8, {}
+    while pos < len(data):
+        length, = struct.unpack(">I", data[pos:pos + 4])
+        chunks[data[pos + 4:pos + 8]] = data[pos + 8:pos + 8 + length]
+        pos += length + 12
+    width, height, _, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    channels = 4 if color_type == 6 else 3
+    raw = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, -1)
+    assert (raw[:, 0] == 0).all()
+    return raw[:, 1:].reshape(height, width, channels)
+
+
+@pytest.mark.parametrize("channels", (3, 4))
+def test_encode_png_round_trip(channels):
+    image = np.random.default_rng(0).integers(0, 256, (7, 11, channels), dtype=np.uint8)
+    np.testing.assert_array_equal(decode_png(headless.encode_png(image)), image)
+
+
+def test_raster_uses_headless_encoder():
+    """Буфер кадра кодирует изображения тем же кодировщиком PNG, что и HeadlessCanvas."""
+    assert raster.encode_png is headless.encode_png
+
+
+def test_framebuffer_without_tkinter():
+    """Буфер кадра рисует на HeadlessCanvas и там, где tkinter не установлен."""
+    script = (
+        "import sys; sys.modules['tkinter'] = None\n"
+        "import headless, intervals, raster\n"
+        "raster.set_backend(raster.BACKEND_FRAMEBUFFER)\n"
+        "canvas = headless.HeadlessCanvas(20, 20)\n"
+        "intervals.draw_line_bresenham(canvas, 1, 1, 15, 9)\n"
+        "raster.present(canvas)\n"
+        "assert canvas.render().min() == 0\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
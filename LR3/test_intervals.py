@@ -0,0 +1,157 @@
+import numpy as np
+import pytest
+
+import headless
+import raster
+from intervals import draw_line_bresenham, draw_line_dda, draw_line_wu, draw_lines, draw_polylines, polyline_pixels, rasterize_lines
+
+WIDTH, HEIGHT = 200, 150
+VIEWPORT = (0, 0, WIDTH - 1, HEIGHT - 1)
+ALGORITHMS = ("dda", "bresenham", "wu")
+BACKENDS = (raster.BACKEND_TK, raster.BACKEND_FRAMEBUFFER)
+
+# Отрезки целиком за пределами канвы (в том числе вырожденные в точку)
+OFF_SCREEN = [
+    (300, 200, 400, 300),
+    (-50, -40, -10, -5),
+    (-100, 50, -20, 60),
+    (250, -30, 250, -30),
+    (-7.2, 20, -7.2, 20),
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def canvas(request):
+    previous = raster.get_backend()
+    raster.set_backend(request.param)
+    yield headless.HeadlessCanvas(WIDTH, HEIGHT)
+    raster.set_backend(previous)
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_rasterize_lines_all_clipped(algorithm):
+    """Пакет, в котором после отсечения не осталось ни одного пикселя."""
+    xs, ys, intensity, offsets, tables = rasterize_lines(OFF_SCREEN, algorithm, debug=True, viewport=VIEWPORT)
+    assert len(xs) == len(ys) == len(intensity) == 0
+    assert offsets.tolist() == [0] * (len(OFF_SCREEN) + 1)
+    assert [len(table) for table in tables] == [0] * len(OFF_SCREEN)
+
+
+def test_bresenham_error_column_with_clipped_lines():
+    """Ошибка e′ последнего шага отрезка не берётся у соседних (в том числе пустых) отрезков."""
+    endpoints = [OFF_SCREEN[0], (10, 10, 30, 17), OFF_SCREEN[1], (40, 5, 44, 30), OFF_SCREEN[2]]
+    *_, tables = rasterize_lines(endpoints, "bresenham", debug=True, viewport=VIEWPORT)
+    for k in (1, 3):
+        rows = tables[k].array
+        assert rows["e_prime"][-1] == rows["e"][-1]
+        assert rows["e_prime"][:-1].tolist() == rows["e"][1:].tolist()
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_draw_lines_off_screen(canvas, algorithm):
+    draw_lines(canvas, OFF_SCREEN, algorithm)
+    raster.present(canvas)
+    assert (canvas.render() == 255).all()
+
+
+def test_polylines_off_screen(canvas):
+    xs, ys = polyline_pixels([(300, 200), (400, 300), (500, 200)], VIEWPORT)
+    assert len(xs) == len(ys) == 0
+    draw_polylines(canvas, [[(300, 200), (400, 300)], [(-10, -10), (-50, 20)]])
+    raster.present(canvas)
+    assert (canvas.render() == 255).all()
+
+
+def random_lines(count, low, high, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(low, high, (count, 4))
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_clipping_keeps_on_screen_lines(algorithm):
+    """Для отрезков внутри канвы отсечение не меняет ни одного пикселя."""
+    endpoints = random_lines(500, 2, HEIGHT - 3)
+    full = rasterize_lines(endpoints, algorithm)
+    clipped = rasterize_lines(endpoints, algorithm, viewport=VIEWPORT)
+    for a, b in zip(full, clipped):
+        np.testing.assert_array_equal(a, b)
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_clipping_keeps_visible_pixels(algorithm):
+    """Для отрезков, выходящих за канву, отсечение не теряет видимых пикселей."""
+    endpoints = random_lines(300, -100, WIDTH + 100, seed=1)
+
+    def visible(result):
+        xs, ys, intensity = result[:3]
+        inside = (xs >= 0) & (xs < WIDTH) & (ys >= 0) & (ys < HEIGHT) & (intensity > 0)
+        return set(zip(xs[inside].tolist(), ys[inside].tolist()))
+
+    assert visible(rasterize_lines(endpoints, algorithm, viewport=VIEWPORT)) == visible(rasterize_lines(endpoints, algorithm))
+
+
+def test_draw_line_wu_columns():
+    """draw_line_wu проходит столбцы от round(x0) до round(x1) включительно, как без отсечения."""
+    canvas = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    for x0, y0, x1, y1 in random_lines(300, 2, HEIGHT - 3, seed=2):
+        table = draw_line_wu(canvas, x0, y0, x1, y1, debug=True)
+        if abs(y1 - y0) > abs(x1 - x0):
+            x0, x1 = y0, y1
+        start, end = (int(np.floor(v + 0.5)) for v in sorted((x0, x1)))
+        assert table.array["x"].tolist() == list(range(start, end + 1))
+        assert table.array["step"].tolist() == list(range(end - start + 1))
+
+
+def test_draw_line_wu_last_column(canvas):
+    """Конечный столбец рисуется и элементами канвы, и в буфере кадра."""
+    draw_line_wu(canvas, 10, 10, 60, 30)
+    raster.present(canvas)
+    image = canvas.render()
+    assert (image[30, 60] < 255).any() and (image[10, 10] < 255).any()
+
+
+@pytest.mark.parametrize("algorithm", ALGORITHMS)
+def test_point_segments(algorithm):
+    """Вырожденный отрезок виден, только если его точка внутри канвы."""
+    endpoints = [(20, 30, 20, 30), (-30, 30, -30, 30), (20, 300, 20, 300)]
+    xs, ys, intensity, offsets = rasterize_lines(endpoints, algorithm, viewport=VIEWPORT)
+    assert offsets[1] > 0 and offsets[2] == offsets[3] == offsets[1]
+
+
+def dda_reference(x0, y0, x1, y1):
+    """ЦДА без отсечения: координаты накапливаются сложением приращений от (x0, y0)."""
+    steps = int(max(abs(x1 - x0), abs(y1 - y0)))
+    if steps == 0:
+        return []
+    x_inc, y_inc = (x1 - x0) / steps, (y1 - y0) / steps
+    x, y = x0, y0
+    rows = []
+    for i in range(steps + 1):
+        rows.append((i, x, y, int(round(x)), int(round(y))))
+        x += x_inc
+        y += y_inc
+    return rows
+
+
+def test_draw_line_dda_matches_unclipped():
+    """Для отрезков внутри канвы draw_line_dda повторяет накопление координат без отсечения."""
+    canvas = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    for x0, y0, x1, y1 in random_lines(300, 2, HEIGHT - 3, seed=3):
+        table = draw_line_dda(canvas, x0, y0, x1, y1, debug=True)
+        assert [tuple(row) for row in table.array.tolist()] == dda_reference(x0, y0, x1, y1)
+
+
+@pytest.mark.parametrize("algorithm, draw_line", [("dda", draw_line_dda), ("bresenham", draw_line_bresenham),
+                                                 ("wu", draw_line_wu)])
+@pytest.mark.parametrize("low, high", [(2, HEIGHT - 3), (-150, WIDTH + 150)])
+def test_rasterize_lines_matches_scalar(algorithm, draw_line, low, high):
+    """Таблицы итераций пакетной растеризации совпадают с таблицами draw_line_* (с отсечением и без)."""
+    canvas = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    endpoints = random_lines(400, low, high, seed=4)
+    endpoints[::2] = np.round(endpoints[::2])
+    *_, tables = rasterize_lines(endpoints, algorithm, debug=True, viewport=VIEWPORT)
+    for (x0, y0, x1, y1), table in zip(endpoints, tables):
+        expected = draw_line(canvas, x0, y0, x1, y1, debug=True)
+        if algorithm == "dda" and int(max(abs(x1 - x0), abs(y1 - y0))) == 0:
+            continue  # Точку draw_line_dda рисует без таблицы
+        assert table.array.tolist() == expected.array.tolist()
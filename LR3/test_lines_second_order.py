@@ -0,0 +1,509 @@
+import numpy as np
+import pytest
+
+import headless
+import lines_second_order as conics
+import raster
+
+WIDTH, HEIGHT = 200, 150
+BACKENDS = (raster.BACKEND_TK, raster.BACKEND_FRAMEBUFFER)
+
+
+@pytest.fixture(params=BACKENDS)
+def canvas(request):
+    previous = raster.get_backend()
+    raster.set_backend(request.param)
+    yield headless.HeadlessCanvas(WIDTH, HEIGHT)
+    raster.set_backend(previous)
+
+
+def drawn_pixels(canvas):
+    raster.present(canvas)
+    ys, xs = np.nonzero((canvas.render() < 128).all(axis=2))
+    return set(zip(xs.tolist(), ys.tolist()))
+
+
+def on_canvas(pixels):
+    return {(x, y) for x, y in pixels if 0 <= x < WIDTH and 0 <= y < HEIGHT}
+
+
+def filled_rows(outline):
+    """Пиксели каждой строки контура от крайнего левого до крайнего правого."""
+    rows = {}
+    for x, y in outline:
+        low, high = rows.get(y, (x, x))
+        rows[y] = (min(low, x), max(high, x))
+    return {(x, y) for y, (low, high) in rows.items() for x in range(low, high + 1)}
+
+
+def circle_reference(cx, cy, R):
+    """Пиксели окружности по исходному алгоритму Брезенхэма (пошаговый цикл по октанту)."""
+    pixels = set()
+    x, y, d = 0, R, 3 - 2 * R
+    while x <= y:
+        for u, v in ((x, y), (y, x)):
+            pixels.update({(cx + u, cy + v), (cx - u, cy + v), (cx + u, cy - v), (cx - u, cy - v)})
+        if d < 0:
+            d += 4 * x + 6
+        else:
+            d += 4 * (x - y) + 10
+            y -= 1
+        x += 1
+    return pixels
+
+
+# Целиком на канве, у края и частично за её пределами
+CIRCLES = [(100, 75, 0), (100, 75, 1), (100, 75, 40), (60, 70, 69), (5, 5, 30), (190, 140, 100), (100, -20, 50)]
+
+
+@pytest.mark.parametrize("cx, cy, R", CIRCLES)
+def test_circle_matches_baseline(canvas, cx, cy, R):
+    conics.draw_circle(canvas, cx, cy, R)
+    assert drawn_pixels(canvas) == on_canvas(circle_reference(cx, cy, R))
+
+
+@pytest.mark.parametrize("cx, cy, R", CIRCLES)
+def test_filled_circle_rows(canvas, cx, cy, R):
+    """Круг заполняет каждую строку окружности от крайнего левого до крайнего правого пикселя."""
+    conics.draw_circle(canvas, cx, cy, R, filled=True)
+    assert drawn_pixels(canvas) == on_canvas(filled_rows(circle_reference(cx, cy, R)))
+
+
+@pytest.mark.parametrize("R", (0, 1, 5, 40, 70))
+def test_circle_pixel_stats(canvas, R):
+    """Из 8 отражений каждого шага октанта повторы (точки на осях и диагоналях) отбрасываются и учитываются."""
+    reference = circle_reference(100, 75, R)
+    steps = len(conics.draw_circle(headless.HeadlessCanvas(WIDTH, HEIGHT), 100, 75, R, debug=True))
+    conics.reset_pixel_stats()
+    conics.draw_circle(canvas, 100, 75, R)
+    stats = conics.get_pixel_stats()
+    assert stats == {"pixels": len(reference), "duplicates": 8 * steps - len(reference)}
+    assert len(drawn_pixels(canvas)) == stats["pixels"]
+    # Счётчики накапливаются до следующего reset_pixel_stats()
+    conics.draw_circle(canvas, 100, 75, R, filled=True)
+    assert conics.get_pixel_stats()["pixels"] == stats["pixels"] + len(filled_rows(reference))
+    conics.reset_pixel_stats()
+    assert conics.get_pixel_stats() == {"pixels": 0, "duplicates": 0}
+
+
+def test_pixel_stats_count_visible_pixels(canvas):
+    """Для фигур у края канвы считаются только выведенные (видимые) пиксели."""
+    for draw in (lambda c: conics.draw_circle(c, 5, 5, 30), lambda c: conics.draw_ellipse(c, 190, 140, 60, 25),
+                 lambda c: conics.draw_parabola(c, 100, 10, 110, 10)):
+        figure = headless.HeadlessCanvas(WIDTH, HEIGHT)
+        conics.reset_pixel_stats()
+        draw(figure)
+        assert conics.get_pixel_stats()["pixels"] == len(drawn_pixels(figure)) > 0
+
+
+@pytest.mark.parametrize("draw", [
+    lambda c: conics.draw_circle(c, -500, -500, 100),
+    lambda c: conics.draw_circle(c, 600, 300, 100, filled=True),
+    lambda c: conics.draw_circle(c, -300, 80, 100, antialiased=True),
+], ids=["outline", "filled", "antialiased"])
+def test_circle_off_screen(canvas, draw):
+    """Окружность целиком за пределами канвы ничего не рисует."""
+    draw(canvas)
+    assert drawn_pixels(canvas) == set()
+
+
+def ellipse_reference(cx, cy, rx, ry):
+    """Пиксели эллипса по исходному алгоритму средней точки (вещественные решения)."""
+    pixels = set()
+
+    def plot(x, y):
+        pixels.update({(cx + x, cy + y), (cx - x, cy + y), (cx + x, cy - y), (cx - x, cy - y)})
+
+    rx2, ry2 = rx * rx, ry * ry
+    x, y = 0, ry
+    p = ry2 - rx2 * ry + 0.25 * rx2
+    while 2 * ry2 * x < 2 * rx2 * y:
+        plot(x, y)
+        if p < 0:
+            p += 2 * ry2 * (x + 1) + ry2
+        else:
+            p += 2 * ry2 * (x + 1) - 2 * rx2 * (y - 1) + ry2
+            y -= 1
+        x += 1
+    p = ry2 * (x + 0.5) ** 2 + rx2 * (y - 1) ** 2 - rx2 * ry2
+    while y >= 0:
+        plot(x, y)
+        if p > 0:
+            p += -2 * rx2 * (y - 1) + rx2
+        else:
+            p += 2 * ry2 * (x + 1) - 2 * rx2 * (y - 1) + rx2
+            x += 1
+        y -= 1
+    return pixels
+
+
+ELLIPSES = [(100, 75, 1, 1), (100, 75, 60, 20), (100, 75, 15, 70), (0, 75, 80, 30), (195, 10, 40, 90), (100, 75, 150, 120)]
+
+
+@pytest.mark.parametrize("cx, cy, rx, ry", ELLIPSES)
+def test_ellipse_matches_baseline(canvas, cx, cy, rx, ry):
+    conics.draw_ellipse(canvas, cx, cy, rx, ry)
+    assert drawn_pixels(canvas) == on_canvas(ellipse_reference(cx, cy, rx, ry))
+
+
+@pytest.mark.parametrize("cx, cy, rx, ry", ELLIPSES)
+def test_filled_ellipse_rows(canvas, cx, cy, rx, ry):
+    """Заполненный эллипс покрывает каждую строку контура от края до края."""
+    conics.draw_ellipse(canvas, cx, cy, rx, ry, filled=True)
+    assert drawn_pixels(canvas) == on_canvas(filled_rows(ellipse_reference(cx, cy, rx, ry)))
+
+
+@pytest.mark.parametrize("filled", (False, True))
+def test_ellipse_off_screen(canvas, filled):
+    conics.draw_ellipse(canvas, 500, 500, 100, 50, filled=filled)
+    conics.draw_ellipse(canvas, -400, 60, 100, 50, filled=filled)
+    assert drawn_pixels(canvas) == set()
+
+
+# --- Проверки кривых на канве: связность и расстояние до аналитической кривой ---
+
+NEIGHBOURS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy]
+
+
+def components(pixels):
+    """Число 8-связных компонент множества пикселей."""
+    left, count = set(pixels), 0
+    while left:
+        count += 1
+        stack = [left.pop()]
+        while stack:
+            x, y = stack.pop()
+            for dx, dy in NEIGHBOURS:
+                if (x + dx, y + dy) in left:
+                    left.remove((x + dx, y + dy))
+                    stack.append((x + dx, y + dy))
+    return count
+
+
+OFFSETS = [(0, 0)] + NEIGHBOURS
+
+
+def curve_distances(pixels, samples):
+    """
+    Расстояние от каждого пикселя до ближайшей точки кривой samples (точки идут с шагом
+    в сотые доли пикселя); точки дальше полутора пикселей не учитываются (расстояние – inf).
+    """
+    best = np.full((HEIGHT, WIDTH), np.inf)
+    base = np.rint(samples).astype(np.intp)
+    for dx, dy in OFFSETS:
+        qx, qy = base[:, 0] + dx, base[:, 1] + dy
+        ok = (qx >= 0) & (qx < WIDTH) & (qy >= 0) & (qy < HEIGHT)
+        d = np.hypot(samples[ok, 0] - qx[ok], samples[ok, 1] - qy[ok])
+        np.minimum.at(best, (qy[ok], qx[ok]), d)
+    xs, ys = np.array(sorted(pixels)).T
+    return best[ys, xs]
+
+
+def coverage_distances(pixels, samples):
+    """Для каждой точки кривой внутри канвы – расстояние до ближайшего из соседних пикселей (или inf)."""
+    image = np.zeros((HEIGHT + 2, WIDTH + 2), dtype=bool)
+    xs, ys = np.array(sorted(pixels)).T
+    image[ys + 1, xs + 1] = True
+    inside = (samples[:, 0] >= 0) & (samples[:, 0] <= WIDTH - 1) & (samples[:, 1] >= 0) & (samples[:, 1] <= HEIGHT - 1)
+    samples = samples[inside]
+    base = np.rint(samples).astype(np.intp)
+    best = np.full(len(samples), np.inf)
+    for dx, dy in OFFSETS:
+        qx, qy = base[:, 0] + dx, base[:, 1] + dy
+        d = np.hypot(samples[:, 0] - qx, samples[:, 1] - qy)
+        best = np.where(image[qy + 1, qx + 1], np.minimum(best, d), best)
+    return best
+
+
+def assert_follows(pixels, samples, tolerance=0.6):
+    """
+    Пиксели лежат не дальше tolerance от кривой, а у каждой точки кривой внутри канвы
+    есть пиксель ближе 0.85: между соседними по диагонали пикселями точка кривой бывает
+    удалена от обоих на ~0.79, а пропущенный пиксель даёт расстояние не меньше 1.
+    """
+    samples = np.asarray(samples, dtype=float)
+    assert pixels
+    assert curve_distances(pixels, samples).max() <= tolerance
+    assert coverage_distances(pixels, samples).max() < 0.85
+
+
+def sample_curve(x_of_y=None, y_of_x=None, step=0.01):
+    """
+    Точки кривой над канвой (с запасом в 2 пикселя): y_of_x(x) и x_of_y(y) возвращают списки
+    ветвей (NaN – нет точки). Перебор по обеим осям даёт шаг не больше step·√2 при любом наклоне.
+    Обе оси перебираются по большему размеру канвы, чтобы кривую можно было строить
+    и в транспонированных координатах.
+    """
+    points = []
+    size = max(WIDTH, HEIGHT)
+    if y_of_x is not None:
+        x = np.arange(-2, size + 2, step)
+        points += [np.column_stack([x, y]) for y in y_of_x(x)]
+    if x_of_y is not None:
+        y = np.arange(-2, size + 2, step)
+        points += [np.column_stack([x, y]) for x in x_of_y(y)]
+    points = np.concatenate(points)
+    return points[~np.isnan(points).any(axis=1)]
+
+
+def hyperbola_samples(xc, yc, a, b, horizontal):
+    """Точки гиперболы u²/a² − v²/b² = 1 (u – вдоль оси x при horizontal)."""
+    def v_of_u(u):
+        with np.errstate(invalid="ignore"):
+            v = b * np.sqrt(u * u / (a * a) - 1)
+        return [v, -v]
+
+    def u_of_v(v):
+        u = a * np.sqrt(1 + v * v / (b * b))
+        return [u, -u]
+
+    if horizontal:
+        return sample_curve(x_of_y=lambda y: [xc + u for u in u_of_v(y - yc)],
+                            y_of_x=lambda x: [yc + v for v in v_of_u(x - xc)])
+    return sample_curve(x_of_y=lambda y: [xc + v for v in v_of_u(y - yc)],
+                        y_of_x=lambda x: [yc + u for u in u_of_v(x - xc)])
+
+
+# (центр, вторая точка, направление, число видимых ветвей)
+HYPERBOLAS = [(100, 75, 130, 95, "horizontal", 2), (100, 75, 130, 95, "vertical", 2),
+              (100, 75, 105, 135, "horizontal", 2), (100, 75, 160, 78, "horizontal", 2),
+              (100, 75, 103, 76, "vertical", 2), (20, 130, 50, 100, "horizontal", 1)]
+
+
+@pytest.mark.parametrize("xc, yc, x2, y2, direction, branches", HYPERBOLAS)
+def test_hyperbola_on_screen(canvas, xc, yc, x2, y2, direction, branches):
+    """Каждая видимая ветвь гиперболы – одна 8-связная цепочка, не дальше 0.6 пикселя от кривой."""
+    conics.draw_hyperbola(canvas, xc, yc, x2, y2, direction)
+    pixels = drawn_pixels(canvas)
+    assert components(pixels) == branches
+    assert_follows(pixels, hyperbola_samples(xc, yc, abs(x2 - xc), abs(y2 - yc), direction == "horizontal"))
+
+
+def test_hyperbola_off_screen(canvas):
+    conics.draw_hyperbola(canvas, 700, 700, 750, 780, "horizontal")
+    conics.draw_hyperbola(canvas, -300, 75, -250, 60, "vertical")
+    assert drawn_pixels(canvas) == set()
+
+
+def parabola_samples(xc, yc, ex, ey, axis):
+    """Точки параболы с вершиной (xc, yc), проходящей через (ex, ey)."""
+    if axis == "horizontal":
+        flipped = parabola_samples(yc, xc, ey, ex, "vertical")
+        return flipped[:, ::-1]
+    a = (ey - yc) / (ex - xc) ** 2
+
+    def x_of_y(y):
+        with np.errstate(invalid="ignore"):
+            u = np.sqrt((y - yc) / a)
+        return [xc + u, xc - u]
+
+    return sample_curve(x_of_y=x_of_y, y_of_x=lambda x: [yc + a * (x - xc) ** 2])
+
+
+PARABOLAS = [(100, 20, 140, 60, "vertical"), (100, 140, 103, 10, "vertical"), (100, 75, 190, 70, "vertical"),
+             (20, 75, 60, 115, "horizontal"), (180, 75, 170, 140, "horizontal"), (-10, 30, 40, 31, "horizontal")]
+
+
+@pytest.mark.parametrize("xc, yc, ex, ey, axis", PARABOLAS)
+def test_parabola_on_screen(canvas, xc, yc, ex, ey, axis):
+    """Парабола – одна 8-связная цепочка, не дальше 0.6 пикселя от кривой, без пропусков."""
+    conics.draw_parabola(canvas, xc, yc, ex, ey, axis=axis)
+    pixels = drawn_pixels(canvas)
+    assert components(pixels) == 1
+    assert_follows(pixels, parabola_samples(xc, yc, ex, ey, axis))
+
+
+def test_parabola_off_screen(canvas):
+    conics.draw_parabola(canvas, -400, -400, -350, -300)
+    conics.draw_parabola(canvas, 100, -10, 140, -60)
+    conics.draw_parabola(canvas, 250, 75, 300, 90, axis="horizontal")
+    assert drawn_pixels(canvas) == set()
+
+
+def polar_angles(xs, ys, cx, cy):
+    """Углы точек относительно центра в градусах, против часовой стрелки на экране (ось y вниз)."""
+    return np.degrees(np.arctan2(-(np.asarray(ys) - cy), np.asarray(xs) - cx)) % 360
+
+
+def in_angle(pixels, cx, cy, start, end):
+    """Пиксели, лежащие в угле от start до end (против часовой стрелки)."""
+    xs, ys = np.array(sorted(pixels)).reshape(-1, 2).T
+    extent = (end - start) % 360 or 360
+    keep = (polar_angles(xs, ys, cx, cy) - start) % 360 <= extent
+    return set(zip(xs[keep].tolist(), ys[keep].tolist()))
+
+
+def pixel_mask(pixels):
+    mask = np.zeros((HEIGHT, WIDTH), dtype=bool)
+    xs, ys = np.array(sorted(pixels)).reshape(-1, 2).T
+    mask[ys, xs] = True
+    return mask
+
+
+def flood_fill(boundary, seed):
+    """Пиксели, достижимые из seed по 4 соседям без пересечения boundary (None – если дошли до края канвы)."""
+    region, stack = {seed}, [seed]
+    while stack:
+        x, y = stack.pop()
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (nx, ny) in region or (nx, ny) in boundary:
+                continue
+            if not (0 <= nx < WIDTH and 0 <= ny < HEIGHT):
+                return None
+            region.add((nx, ny))
+            stack.append((nx, ny))
+    return region
+
+
+# (центр, полуоси, начальный и конечный углы): дуги окружностей и эллипсов, через 0°, почти полные
+ARCS = [(100, 75, 50, 50, 0, 90), (100, 75, 60, 60, 30, 300), (100, 75, 40, 40, 350, 20),
+        (100, 75, 90, 50, 100, 260), (100, 75, 30, 65, 200, 340), (100, 75, 70, 25, -45, 45),
+        (100, 75, 45, 45, 10, 11)]
+
+
+@pytest.mark.parametrize("cx, cy, rx, ry, start, end", ARCS)
+def test_arc_covers_angles(canvas, cx, cy, rx, ry, start, end):
+    """Дуга – ровно те пиксели окружности (эллипса), что лежат в её угле, одной 8-связной цепочкой."""
+    conics.draw_arc(canvas, cx, cy, rx, ry, start, end)
+    outline = circle_reference(cx, cy, rx) if rx == ry else ellipse_reference(cx, cy, rx, ry)
+    pixels = drawn_pixels(canvas)
+    assert pixels == in_angle(outline, cx, cy, start, end)
+    assert components(pixels) == 1
+
+
+def test_full_arc_is_outline(canvas):
+    conics.draw_arc(canvas, 100, 75, 60, 40, 30, 390)
+    assert drawn_pixels(canvas) == ellipse_reference(100, 75, 60, 40)
+
+
+@pytest.mark.parametrize("cx, cy, rx, ry, start, end", ARCS[:-1])
+def test_sector_closed(canvas, cx, cy, rx, ry, start, end):
+    """
+    Сектор – замкнутый контур: заливка изнутри не выходит к краю канвы и совпадает
+    с аналитическим сектором (с точностью до пикселя у границы).
+    """
+    conics.draw_sector(canvas, cx, cy, rx, ry, start, end)
+    boundary = drawn_pixels(canvas)
+    assert components(boundary) == 1
+    extent = (end - start) % 360
+    middle = np.radians(start + extent / 2)
+    seed = (round(cx + 0.6 * rx * np.cos(middle)), round(cy - 0.6 * ry * np.sin(middle)))
+    region = flood_fill(boundary, seed)
+    assert region is not None
+
+    ys, xs = np.mgrid[0:HEIGHT, 0:WIDTH]
+    radial = np.hypot((xs - cx) / rx, (ys - cy) / ry)
+    angle = (polar_angles(xs, ys, cx, cy) - start) % 360
+    # Угловой запас в пиксель на расстоянии r от центра
+    margin = np.degrees(1.5 / np.maximum(np.hypot(xs - cx, ys - cy), 1))
+    deep = (radial < 1 - 1.5 / min(rx, ry)) & (angle >= margin) & (angle <= extent - margin)
+    near = (radial < 1 + 1.5 / min(rx, ry)) & (((angle + margin) % 360 <= extent + 2 * margin) | (radial * min(rx, ry) < 2))
+    filled = pixel_mask(region)
+    assert not (deep & ~filled & ~pixel_mask(boundary)).any()
+    assert not (filled & ~near).any()
+
+
+def test_arc_off_screen(canvas):
+    conics.draw_arc(canvas, -500, -500, 100, 60, 10, 250)
+    conics.draw_sector(canvas, -500, -500, 100, 100, 0, 90)
+    conics.draw_arc(canvas, 100, 75, 2000, 2000, 0, 360)
+    assert drawn_pixels(canvas) == set()
+
+
+def rotated_samples(cx, cy, u, v, angle):
+    """Точки (u, v) в осях, повёрнутых на angle градусов (против часовой стрелки на экране) вокруг (cx, cy)."""
+    c, s = np.cos(np.radians(angle)), np.sin(np.radians(angle))
+    return np.column_stack([cx + u * c + v * s, cy - u * s + v * c])
+
+
+def conic_ellipse_samples(cx, cy, rx, ry, angle):
+    t = np.linspace(0, 2 * np.pi, int(2 * np.pi * max(rx, ry) / 0.005))
+    return rotated_samples(cx, cy, rx * np.cos(t), ry * np.sin(t), angle)
+
+
+def conic_hyperbola_samples(cx, cy, a, b, angle):
+    # Параметр до выхода ветвей за канву с запасом
+    t = np.arange(-np.arccosh(3 * max(WIDTH, HEIGHT) / a), np.arccosh(3 * max(WIDTH, HEIGHT) / a), 1e-4)
+    u, v = a * np.cosh(t), b * np.sinh(t)
+    return np.concatenate([rotated_samples(cx, cy, u, v, angle), rotated_samples(cx, cy, -u, v, angle)])
+
+
+# Тонкие повёрнутые эллипсы: малая полуось 1–3 пикселя
+THIN_ELLIPSES = [(100, 75, 60, ry, angle) for ry in (1, 2, 3) for angle in (0, 20, 45, 70, 90, 133)]
+THIN_ELLIPSES += [(150, 100, 100, 2, 20), (150, 100, 100, 1, 20), (100.3, 74.6, 60, 1.5, 49)]
+
+
+@pytest.mark.parametrize("cx, cy, rx, ry, angle", THIN_ELLIPSES)
+def test_conic_thin_ellipse(canvas, cx, cy, rx, ry, angle):
+    """Тонкий эллипс – замкнутая 8-связная цепочка без разрывов у вершин и вдали от кривой."""
+    conics.draw_conic(canvas, *conics.conic_ellipse(cx, cy, rx, ry, angle))
+    pixels = drawn_pixels(canvas)
+    assert_follows(pixels, conic_ellipse_samples(cx, cy, rx, ry, angle))
+    assert components(pixels) == 1
+
+
+@pytest.mark.parametrize("cx, cy, rx, ry, angle", [(100, 75, 60, 20, 0), (100, 75, 60, 40, 30), (90, 80, 150, 30, 110)])
+def test_conic_ellipse(canvas, cx, cy, rx, ry, angle):
+    conics.draw_conic(canvas, *conics.conic_ellipse(cx, cy, rx, ry, angle))
+    assert_follows(drawn_pixels(canvas), conic_ellipse_samples(cx, cy, rx, ry, angle))
+
+
+def test_conic_matches_axis_ellipse(canvas):
+    """Для осевого эллипса пиксели совпадают с draw_ellipse."""
+    conics.draw_conic(canvas, *conics.conic_ellipse(100, 75, 60, 40))
+    expected = headless.HeadlessCanvas(WIDTH, HEIGHT)
+    conics.draw_ellipse(expected, 100, 75, 60, 40)
+    raster.present(expected)
+    assert drawn_pixels(canvas) == drawn_pixels(expected)
+
+
+@pytest.mark.parametrize("angle", (0, 30, 90, 145))
+def test_conic_hyperbola(canvas, angle):
+    conics.draw_conic(canvas, *conics.conic_hyperbola(100, 75, 30, 20, angle))
+    pixels = drawn_pixels(canvas)
+    assert_follows(pixels, conic_hyperbola_samples(100, 75, 30, 20, angle))
+    assert components(pixels) == 2
+
+
+def test_conic_parabola(canvas):
+    """Парабола y = 20 + (x − 100)²/50 в общем виде."""
+    def x_of_y(y):
+        with np.errstate(invalid="ignore"):
+            u = np.sqrt(50 * (y - 20))
+        return [100 + u, 100 - u]
+
+    conics.draw_conic(canvas, 1, 0, 0, -200, -50, 11000)
+    pixels = drawn_pixels(canvas)
+    assert_follows(pixels, sample_curve(x_of_y=x_of_y, y_of_x=lambda x: [20 + (x - 100) ** 2 / 50]))
+    assert components(pixels) == 1
+
+
+def test_conic_debug_table(canvas):
+    """Строки таблицы отладки – выведенные пиксели, точки пересечения лежат на кривой."""
+    coefficients = conics.conic_ellipse(100, 75, 60, 2, 20)
+    table = conics.draw_conic(canvas, *coefficients, debug=True)
+    rows = table.array
+    assert set(zip(rows["pixel_x"].tolist(), rows["pixel_y"].tolist())) == drawn_pixels(canvas)
+    A, B, C, D, E, F = coefficients
+    x, y = rows["x"], rows["y"]
+    gradient = np.hypot(2 * A * x + B * y + D, B * x + 2 * C * y + E)
+    assert (np.abs(A * x * x + B * x * y + C * y * y + D * x + E * y + F) / gradient < 1e-6).all()
+    assert (np.abs(rows["delta"]) <= 0.5).all()
+
+
+@pytest.mark.parametrize("coefficients", [
+    (1, 0, 1, -200, -150, 100 ** 2 + 75 ** 2),  # точка (100, 75)
+    (1, 0, -1, -200, 150, 100 ** 2 - 75 ** 2),  # пара пересекающихся прямых
+    (1, 0, 0, -200, 0, 100 ** 2 - 1),           # пара параллельных прямых
+    (0, 0, 0, 1, 1, -100),                      # прямая
+])
+def test_conic_degenerate(coefficients):
+    with pytest.raises(ValueError):
+        conics.draw_conic(headless.HeadlessCanvas(WIDTH, HEIGHT), *coefficients)
+
+
+def test_conic_off_screen(canvas):
+    conics.draw_conic(canvas, *conics.conic_ellipse(-300, -300, 50, 20, 30))
+    conics.draw_conic(canvas, *conics.conic_ellipse(100, 75, 1000, 800, 10))
+    conics.draw_conic(canvas, *conics.conic_hyperbola(100, -400, 50, 20))
+    assert drawn_pixels(canvas) == set()
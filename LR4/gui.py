@@ -8,6 +8,7 @@ from transformation import (
     create_perspective_projection_matrix
 )
 from file_manager import read_object
+from objects_3d import draw_object
 
 class MainWindow(tk.Tk):
     def __init__(self):
@@ -597,38 +598,14 @@ class MainWindow(tk.Tk):
         накопленную матрицу преобразований (self.transform_matrix), выполняет
         простую (перспективную или ортографическую) проекцию и отрисовывает 3D‑объект на Canvas.
         """
-        import numpy as np
         if self.active_object is None:
             return
 
         # Очищаем предыдущую отрисовку
         self.canvas.delete("object")
-
-        # Центр канвы и параметр перспективы
-        cx = self.canvas.winfo_width() / 2
-        cy = self.canvas.winfo_height() / 2
-        d = self.persp_distance
-
-        transformed_vertices = []
-        for vertex in self.active_object["vertices"]:
-            v = np.array([vertex[0], vertex[1], vertex[2], 1])
-            vt = self.transform_matrix @ v
-            transformed_vertices.append(vt)
-
-        for face in self.active_object["faces"]:
-            points = []
-            for idx in face:
-                vt = transformed_vertices[idx]
-                x, y, z, _ = vt
-                # Если режим перспективный, применяем d/(d+z). Если режим ортографический – масштаб не меняется.
-                if self.use_perspective:
-                    factor = d / (d + z) if (d + z) != 0 else 1
-                else:
-                    factor = 1
-                X = x * factor + cx
-                Y = -y * factor + cy  # инвертируем Y для корректного отображения
-                points.extend([X, Y])
-            self.canvas.create_polygon(points, outline=self.brush_color, fill="", width=2, tags="object")
+        # В ортографическом режиме масштаб не меняется
+        distance = self.persp_distance if self.use_perspective else None
+        draw_object(self.canvas, self.active_object, self.transform_matrix, distance, self.brush_color)
 
     def apply_translation(self, dx_str, dy_str, dz_str):
         """Обрабатывает ввод для перемещения по осям x, y, z.
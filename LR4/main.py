@@ -1,6 +1,36 @@
-from gui import MainWindow
+import argparse
+
+
+def render_headless(filename, output, size=(800, 600), rotation=(0, 0, 0), perspective=None):
+    """
+    Строит 3D-объект из файла без окна Tk (на headless.HeadlessCanvas)
+    и сохраняет изображение в PNG или PPM (по расширению output).
+    """
+    from file_manager import read_object
+    from headless import HeadlessCanvas
+    from objects_3d import draw_object
+    from transformation import create_rotation_matrix
+
+    canvas = HeadlessCanvas(*size, bg="gray")
+    draw_object(canvas, read_object(filename), create_rotation_matrix(*rotation), perspective)
+    canvas.save(output)
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Элементарный 3D-редактор")
+    parser.add_argument("--headless", nargs=2, metavar=("FILE", "OUTPUT"),
+                        help="построить объект из файла без окна и сохранить изображение (PNG/PPM)")
+    parser.add_argument("--size", nargs=2, type=int, default=(800, 600), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--rotate", nargs=3, type=float, default=(0, 0, 0), metavar=("RX", "RY", "RZ"),
+                        help="углы поворота вокруг осей (градусы)")
+    parser.add_argument("--perspective", type=float, metavar="D",
+                        help="перспективная проекция с расстоянием до экрана D")
+    args = parser.parse_args()
+    if args.headless:
+        render_headless(*args.headless, args.size, args.rotate, args.perspective)
+        return
+
+    from gui import MainWindow
     app = MainWindow()
     app.mainloop()
 
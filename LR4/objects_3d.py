@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 def create_cube(side=1.0):
     """
     Создает куб со стороной side, центрированный в начале координат.
@@ -134,3 +136,33 @@ def create_cylinder(radius=1.0, height=2.0, segments=20):
             top_indices[i]
         ))
     return vertices, faces
+
+
+def project_vertices(vertices, matrix, cx, cy, perspective_distance=None):
+    """
+    Применяет к вершинам (x, y, z) матрицу преобразований 4x4 и проецирует их на экран
+    с центром (cx, cy): ортографически или, если задано расстояние до экрана d
+    (perspective_distance), с масштабом d/(d+z). Ось Y экрана направлена вниз.
+    Возвращает список точек (X, Y).
+    """
+    points = []
+    for vertex in vertices:
+        x, y, z, _ = matrix @ np.array([vertex[0], vertex[1], vertex[2], 1])
+        factor = 1
+        if perspective_distance is not None and perspective_distance + z != 0:
+            factor = perspective_distance / (perspective_distance + z)
+        points.append((x * factor + cx, -y * factor + cy))  # инвертируем Y для корректного отображения
+    return points
+
+
+def draw_object(canvas, obj, matrix, perspective_distance=None, color="black", tags="object"):
+    """
+    Рисует 3D-объект {"vertices": ..., "faces": ...} на канве (tk.Canvas или headless.HeadlessCanvas):
+    грани выводятся контурами многоугольников, центр проекции – центр канвы.
+    """
+    cx = canvas.winfo_width() / 2
+    cy = canvas.winfo_height() / 2
+    points = project_vertices(obj["vertices"], matrix, cx, cy, perspective_distance)
+    for face in obj["faces"]:
+        coords = [c for idx in face for c in points[idx]]
+        canvas.create_polygon(coords, outline=color, fill="", width=2, tags=tags)
@@ -1,7 +1,51 @@
 #!/usr/bin/env python3
-from gui import MainApplication
+import argparse
+
+
+def parse_point(text):
+    """Вершина полигона в виде "x,y"."""
+    x, y = text.split(",")
+    return float(x), float(y)
+
+
+def render_headless(points, output, size=(800, 600), normals=False, hull=None):
+    """
+    Строит замкнутый полигон по вершинам (при необходимости – нормали и выпуклую оболочку
+    методом "graham" или "jarvis") без окна Tk и сохраняет изображение в PNG или PPM.
+    """
+    from headless import HeadlessCanvas
+    from polygon import Polygon, convex_hull_graham, convex_hull_jarvis, draw_hull, draw_normals, draw_polygon
+
+    polygon = Polygon()
+    for x, y in points:
+        polygon.add_vertex(x, y)
+    polygon.close_polygon()
+    canvas = HeadlessCanvas(*size)
+    draw_polygon(canvas, polygon)
+    if normals:
+        draw_normals(canvas, polygon)
+    if hull is not None:
+        methods = {"graham": convex_hull_graham, "jarvis": convex_hull_jarvis}
+        draw_hull(canvas, methods[hull](polygon.vertices))
+    canvas.save(output)
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Построение полигонов")
+    parser.add_argument("--headless", metavar="OUTPUT",
+                        help="построить полигон без окна и сохранить изображение (PNG/PPM)")
+    parser.add_argument("points", nargs="*", type=parse_point, metavar="X,Y", help="вершины полигона")
+    parser.add_argument("--size", nargs=2, type=int, default=(800, 600), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--normals", action="store_true", help="показать нормали к сторонам")
+    parser.add_argument("--hull", choices=("graham", "jarvis"), help="построить выпуклую оболочку")
+    args = parser.parse_args()
+    if args.headless:
+        if len(args.points) < 3:
+            parser.error("для полигона требуется минимум 3 вершины")
+        render_headless(args.points, args.headless, args.size, args.normals, args.hull)
+        return
+
+    from gui import MainApplication
     app = MainApplication()
     app.mainloop()
 
@@ -1,7 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-from polygon import Polygon, convex_hull_graham, convex_hull_jarvis, debug_steps, add_debug
+from polygon import (Polygon, convex_hull_graham, convex_hull_jarvis, debug_steps, add_debug,
+                     draw_vertex, draw_edge, draw_normals, draw_hull)
 import fill_polygon  # импортируем модуль с реализацией алгоритмов заливки
+from debug_view import DebugTableView
 
 class MainApplication(tk.Tk):
     def __init__(self):
@@ -134,11 +136,9 @@ class MainApplication(tk.Tk):
 
             x, y = event.x, event.y
             self.current_polygon.add_vertex(x, y)
-            r = 3
-            self.canvas.create_oval(x - r, y - r, x + r, y + r, fill="black")
+            draw_vertex(self.canvas, x, y)
             if len(self.current_polygon.vertices) > 1:
-                x_prev, y_prev = self.current_polygon.vertices[-2]
-                self.canvas.create_line(x_prev, y_prev, x, y, fill="blue", width=2)
+                draw_edge(self.canvas, self.current_polygon.vertices[-2], (x, y))
             self.status_var.set(f"Добавлена вершина: ({x}, {y})")
         elif self.mode.get() == "cursor":
             self.status_var.set("Режим курсора: Пока не реализовано перемещение.")
@@ -147,9 +147,7 @@ class MainApplication(tk.Tk):
         if self.mode.get() == "draw_polygon" and self.current_polygon is not None:
             verts = self.current_polygon.vertices
             if len(verts) > 2:
-                x_first, y_first = verts[0]
-                x_last, y_last = verts[-1]
-                self.canvas.create_line(x_last, y_last, x_first, y_first, fill="blue", width=2)
+                draw_edge(self.canvas, verts[-1], verts[0])
                 self.current_polygon.close_polygon()
                 self.status_var.set("Полигон завершён.")
             else:
@@ -159,14 +157,7 @@ class MainApplication(tk.Tk):
         if self.current_polygon is None or not self.current_polygon.closed:
             messagebox.showwarning("Показ нормалей", "Полигон не построен или не замкнут!")
             return
-        for i, ((x1, y1), (x2, y2)) in enumerate(zip(self.current_polygon.vertices,
-                                                     self.current_polygon.vertices[1:] + [
-                                                         self.current_polygon.vertices[0]])):
-            mx = (x1 + x2) / 2
-            my = (y1 + y2) / 2
-            nx, ny = self.current_polygon.normals[i]
-            multiplier = 20
-            self.canvas.create_line(mx, my, mx + nx * multiplier, my + ny * multiplier, fill="red", dash=(4, 2))
+        draw_normals(self.canvas, self.current_polygon)
         self.status_var.set("Нормали к сторонам полигона отображены.")
 
     def build_convex_hull(self):
@@ -182,10 +173,7 @@ class MainApplication(tk.Tk):
         else:
             hull = []
         if hull:
-            for i in range(len(hull)):
-                x1, y1 = hull[i]
-                x2, y2 = hull[(i + 1) % len(hull)]
-                self.canvas.create_line(x1, y1, x2, y2, fill="green", width=3)
+            draw_hull(self.canvas, hull)
             self.status_var.set(f"Выпуклая оболочка построена методом {method}.")
         else:
             self.status_var.set("Ошибка построения оболочки.")
@@ -260,32 +248,27 @@ class MainApplication(tk.Tk):
         Предполагается, что глобальный список debug_steps (из модуля polygon и/или fill_polygon)
         содержит строки, оформленные в виде:
         "Шаг N: Закрашен пиксель (x, y); Стек: [ ... ]"
+        Таблица виртуализирована (DebugTableView): текст создаётся только для видимых строк,
+        поэтому окно открывается одинаково быстро при любом числе шагов.
         """
         self.debug_window = tk.Toplevel(self)
         self.debug_window.title("Отладка - Таблица закрашивания полигонов")
         self.debug_window.geometry("800x600")
 
-        text = tk.Text(self.debug_window, wrap="none")
-        text.pack(expand=True, fill="both")
-
         # Формируем заголовок таблицы
         header = "Шаг\tЗакрашиваемый пиксель\tСтек затравочных пикселей\n"
         header += "-" * 80 + "\n"
-        text.insert("end", header)
 
-        # Выводим отладочные сообщения
-        for i, msg in enumerate(debug_steps, start=1):
-            # Можно форматировать строку, если debug_steps уже содержат информацию
-            text.insert("end", f"{i}\t{msg}\n")
+        view = DebugTableView(self.debug_window, debug_steps, header=header,
+                              format_row=lambda index, msg: f"{index + 1}\t{msg}",
+                              find_step=lambda step: step - 1 if 1 <= step <= len(debug_steps) else None)
 
-        btn_update = tk.Button(self.debug_window, text="Обновить", command=lambda: self.update_debug_window(text))
+        btn_update = tk.Button(self.debug_window, text="Обновить", command=lambda: self.update_debug_window(view))
         btn_update.pack(side="bottom", pady=5)
+        view.pack(expand=True, fill="both")
 
-    def update_debug_window(self, text_widget):
-        text_widget.delete("1.0", "end")
-        text_widget.insert("end", "Пошаговое решение:\n---------------------\n")
-        for i, msg in enumerate(debug_steps, start=1):
-            text_widget.insert("end", f"{i:3d}: {msg}\n")
+    def update_debug_window(self, view):
+        view.refresh(debug_steps)
 
 
 if __name__ == "__main__":
@@ -1,7 +1,57 @@
 #!/usr/bin/env python3
-from gui import MainApplication
+import argparse
+
+FILL_METHODS = ("scanline", "active_edge", "boundary", "line_flood")
+
+
+def parse_point(text):
+    """Вершина полигона в виде "x,y"."""
+    x, y = text.split(",")
+    return float(x), float(y)
+
+
+def render_headless(points, output, size=(800, 600), fill=None, color="orange"):
+    """
+    Строит замкнутый полигон по вершинам и при необходимости заливает его (fill – один из
+    FILL_METHODS; затравка – центроид вершин, как в окне) без окна Tk, затем сохраняет
+    изображение в PNG или PPM.
+    """
+    import fill_polygon
+    from headless import HeadlessCanvas
+    from polygon import Polygon, draw_polygon
+
+    polygon = Polygon()
+    for x, y in points:
+        polygon.add_vertex(x, y)
+    polygon.close_polygon()
+    canvas = HeadlessCanvas(*size)
+    if fill in ("scanline", "active_edge"):
+        getattr(fill_polygon, f"fill_polygon_{fill}")(canvas, polygon, fill_color=color)
+    elif fill is not None:
+        seed = (int(sum(x for x, _ in points) / len(points)), int(sum(y for _, y in points) / len(points)))
+        if not fill_polygon.point_in_polygon(seed[0], seed[1], polygon.vertices):
+            raise ValueError("Затравочная точка (центроид вершин) находится вне полигона.")
+        getattr(fill_polygon, f"fill_polygon_{fill}")(canvas, polygon, seed, fill_color=color, boundary_color="black")
+    draw_polygon(canvas, polygon)
+    canvas.save(output)
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Построение и заливка полигонов")
+    parser.add_argument("--headless", metavar="OUTPUT",
+                        help="построить полигон без окна и сохранить изображение (PNG/PPM)")
+    parser.add_argument("points", nargs="*", type=parse_point, metavar="X,Y", help="вершины полигона")
+    parser.add_argument("--size", nargs=2, type=int, default=(800, 600), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--fill", choices=FILL_METHODS, help="алгоритм заливки")
+    parser.add_argument("--color", default="orange", help="цвет заливки")
+    args = parser.parse_args()
+    if args.headless:
+        if len(args.points) < 3:
+            parser.error("для полигона требуется минимум 3 вершины")
+        render_headless(args.points, args.headless, args.size, args.fill, args.color)
+        return
+
+    from gui import MainApplication
     app = MainApplication()
     app.mainloop()
 
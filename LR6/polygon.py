@@ -132,3 +132,40 @@ def convex_hull_jarvis(points):
             break
     add_debug("Построение выпуклой оболочки (Джарвиса) завершено")
     return hull
+
+
+# --- Отрисовка на канве (tk.Canvas или headless.HeadlessCanvas) ---
+
+def draw_vertex(canvas, x, y, r=3):
+    canvas.create_oval(x - r, y - r, x + r, y + r, fill="black")
+
+
+def draw_edge(canvas, p1, p2):
+    canvas.create_line(p1[0], p1[1], p2[0], p2[1], fill="blue", width=2)
+
+
+def draw_polygon(canvas, polygon):
+    """Вершины и стороны полигона (замыкающая сторона – если полигон замкнут)."""
+    verts = polygon.vertices
+    for x, y in verts:
+        draw_vertex(canvas, x, y)
+    for p1, p2 in zip(verts, verts[1:]):
+        draw_edge(canvas, p1, p2)
+    if polygon.closed:
+        draw_edge(canvas, verts[-1], verts[0])
+
+
+def draw_normals(canvas, polygon, multiplier=20):
+    """Нормали к сторонам замкнутого полигона, отложенные от середин сторон."""
+    verts = polygon.vertices
+    for (x1, y1), (x2, y2), (nx, ny) in zip(verts, verts[1:] + verts[:1], polygon.normals):
+        mx = (x1 + x2) / 2
+        my = (y1 + y2) / 2
+        canvas.create_line(mx, my, mx + nx * multiplier, my + ny * multiplier, fill="red", dash=(4, 2))
+
+
+def draw_hull(canvas, hull):
+    for i in range(len(hull)):
+        x1, y1 = hull[i]
+        x2, y2 = hull[(i + 1) % len(hull)]
+        canvas.create_line(x1, y1, x2, y2, fill="green", width=3)
@@ -1,8 +1,8 @@
 # gui.py
 import tkinter as tk
 from tkinter import messagebox
-from triangulation import delaunay_triangulation
-from voronoi import compute_voronoi_edges
+from triangulation import delaunay_triangulation, draw_point, draw_triangulation
+from voronoi import compute_voronoi_edges, draw_voronoi
 
 CANVAS_WIDTH = 800
 CANVAS_HEIGHT = 600
@@ -59,8 +59,7 @@ class App(tk.Tk):
         if self.mode == "add":
             x, y = event.x, event.y
             self.points.append((x, y))
-            r = 3
-            self.canvas.create_oval(x - r, y - r, x + r, y + r, fill="black", outline="black")
+            draw_point(self.canvas, x, y)
 
     def do_triangulation(self):
         """
@@ -74,14 +73,7 @@ class App(tk.Tk):
 
     def draw_triangulation(self):
         self.canvas.delete("triangulation")
-        for tri in self.triangles:
-            pts = tri.vertices
-            self.canvas.create_line(pts[0][0], pts[0][1], pts[1][0], pts[1][1],
-                                    fill="blue", tags="triangulation")
-            self.canvas.create_line(pts[1][0], pts[1][1], pts[2][0], pts[2][1],
-                                    fill="blue", tags="triangulation")
-            self.canvas.create_line(pts[2][0], pts[2][1], pts[0][0], pts[0][1],
-                                    fill="blue", tags="triangulation")
+        draw_triangulation(self.canvas, self.triangles)
 
     def do_voronoi(self):
         """
@@ -95,10 +87,7 @@ class App(tk.Tk):
 
     def draw_voronoi(self):
         self.canvas.delete("voronoi")
-        for edge in self.voronoi_edges:
-            p1, p2 = edge
-            self.canvas.create_line(p1[0], p1[1], p2[0], p2[1],
-                                    fill="red", dash=(4, 2), tags="voronoi")
+        draw_voronoi(self.canvas, self.voronoi_edges)
 
     def clear_all(self):
         """
@@ -1,5 +1,50 @@
-from gui import App
+import argparse
 
-if __name__ == "__main__":
+
+def parse_point(text):
+    """Точка в виде "x,y"."""
+    x, y = text.split(",")
+    return float(x), float(y)
+
+
+def render_headless(points, output, size=(800, 600), voronoi=False):
+    """
+    Строит триангуляцию Делоне (и при необходимости диаграмму Вороного) для набора точек
+    без окна Tk и сохраняет изображение в PNG или PPM.
+    """
+    from headless import HeadlessCanvas
+    from triangulation import delaunay_triangulation, draw_point, draw_triangulation
+    from voronoi import compute_voronoi_edges, draw_voronoi
+
+    canvas = HeadlessCanvas(*size)
+    triangles = delaunay_triangulation(points)
+    draw_triangulation(canvas, triangles)
+    if voronoi:
+        # Ограничивающий прямоугольник – размеры холста, как в окне
+        draw_voronoi(canvas, compute_voronoi_edges(triangles, (0, 0, *size)))
+    for x, y in points:
+        draw_point(canvas, x, y)
+    canvas.save(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Триангуляция и диаграмма Вороного")
+    parser.add_argument("--headless", metavar="OUTPUT",
+                        help="построить триангуляцию без окна и сохранить изображение (PNG/PPM)")
+    parser.add_argument("points", nargs="*", type=parse_point, metavar="X,Y", help="исходные точки")
+    parser.add_argument("--size", nargs=2, type=int, default=(800, 600), metavar=("WIDTH", "HEIGHT"))
+    parser.add_argument("--voronoi", action="store_true", help="построить диаграмму Вороного")
+    args = parser.parse_args()
+    if args.headless:
+        if len(args.points) < 3:
+            parser.error("для триангуляции требуется минимум 3 точки")
+        render_headless(args.points, args.headless, args.size, args.voronoi)
+        return
+
+    from gui import App
     app = App()
     app.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -79,3 +79,17 @@ def delaunay_triangulation(points):
         final_triangles.append(triangle)
 
     return final_triangles
+
+
+def draw_point(canvas, x, y, r=3):
+    """Исходная точка на канве (tk.Canvas или headless.HeadlessCanvas)."""
+    canvas.create_oval(x - r, y - r, x + r, y + r, fill="black", outline="black")
+
+
+def draw_triangulation(canvas, triangles):
+    """Стороны треугольников (тег "triangulation")."""
+    for tri in triangles:
+        pts = tri.vertices
+        for i in range(3):
+            p1, p2 = pts[i], pts[(i + 1) % 3]
+            canvas.create_line(p1[0], p1[1], p2[0], p2[1], fill="blue", tags="triangulation")
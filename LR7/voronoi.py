@@ -140,3 +140,9 @@ def compute_voronoi_edges(triangles, bbox):
                 far_point = intersect_ray_box(tri.circumcenter, normal, bbox)
                 voronoi_edges.append((tri.circumcenter, far_point))
     return voronoi_edges
+
+
+def draw_voronoi(canvas, edges):
+    """Рёбра диаграммы Вороного пунктиром (тег "voronoi")."""
+    for p1, p2 in edges:
+        canvas.create_line(p1[0], p1[1], p2[0], p2[1], fill="red", dash=(4, 2), tags="voronoi")